@@ -0,0 +1,296 @@
+"""여러 세션 동시 접속 부하 테스트 (AppTest로 페이지 조작을 재생하고 rerun 지연 시간 측정)
+
+    python -m benchmarks.load --sessions 1 4 8 --rounds 2
+    python -m benchmarks.load --sessions 16 --pages app.py 1_감귤 2_병해충 5_NEWS --output load.json
+
+세션마다 app.py와 pages/의 모든 페이지를 차례로 방문하며 연도·월 선택, 작물 변경, 뉴스 검색·더 보기 같은 조작을
+재생합니다. 세션은 같은 프로세스의 스레드로 동시에 실행되므로 실제 서버처럼 캐시·연결 풀·공유 등록소를 함께 씁니다.
+뉴스 검색은 로컬 대체 API(NAVER_NEWS_API_URL)로 보내고 뉴스 캐시는 임시 경로에 둡니다.
+(지원사업 안내 페이지는 실제 사이트를 수집하므로 네트워크가 없으면 오류 결과가 캐시된 상태로 측정됩니다.)
+
+세션 수별로 페이지마다 rerun 지연 시간 p50/p95/p99, 처리량(rerun/s), 페이지 실행 직후 프로세스 RSS를 출력하고,
+p95가 --p95-budget 이하로 유지된 최대 세션 수를 알려줍니다.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+APP = 'app.py'
+QUANTILES = (0.5, 0.95, 0.99)
+SECRETS = {'NAVER_CLIENT_ID': 'load-test', 'NAVER_CLIENT_SECRET': 'load-test'}
+
+
+def rss_mb():
+    """현재 프로세스 RSS (MB, /proc이 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+# --- 로컬 대체 뉴스 API ---
+class NewsStubHandler(BaseHTTPRequestHandler):
+    """네이버 뉴스 검색 API와 같은 형식의 응답 (검색어·start마다 display개 기사)"""
+    latency = 0.0
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        query = params.get('query', [''])[0]
+        start = int(params.get('start', ['1'])[0])
+        display = int(params.get('display', ['10'])[0])
+        time.sleep(self.latency)
+        items = [{'title': f"<b>{query}</b> 소식 {start + i}", 'description': f"{query} 관련 기사 요약 {start + i}",
+                  'pubDate': "Mon, 02 Jun 2025 09:00:00 +0900", 'originallink': f"https://example.com/{start + i}",
+                  'link': f"https://n.news.naver.com/{start + i}"} for i in range(display)]
+        body = json.dumps({'items': items}, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_news_stub(latency=0.0):
+    """백그라운드 스레드로 대체 API 서버 시작 → (서버, 검색 URL)"""
+    handler = type('NewsStub', (NewsStubHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/search/news.json"
+
+
+# --- 페이지별 조작 시나리오 ---
+def _find(elements, label):
+    return next(e for e in elements if label in e.label)
+
+
+def _select(label):
+    """label을 포함한 selectbox에서 세션 번호에 따라 다른 항목 선택"""
+    def step(at, n):
+        box = _find(at.selectbox, label)
+        box.select_index(n % len(box.options))
+    return step
+
+
+def _click(label):
+    def step(at, n):
+        _find(at.button, label).click()
+    return step
+
+
+def _search(at, n):
+    at.text_input(key='main_query_text_input').input(f"감귤 부하 {n}")
+    _find(at.button, "뉴스 검색").click()
+
+
+def _keyword(at, n):
+    buttons = [b for b in at.button if b.key and b.key.startswith('rec_btn_')]
+    buttons[n % max(len(buttons), 1)].click()
+
+
+# 페이지 파일명 접두어 → [(조작 이름, 조작 함수)] (없는 페이지는 새로고침만)
+INTERACTIONS = {
+    'app.py': [("월 선택", _select("확인할 월"))],
+    '1_감귤 재배 적합지 추천': [("연도 선택", _select("확인할 연도")), ("월 선택", _select("분석할 월"))],
+    '2_병해충 발생 알림': [("작물 변경", _select("작물 선택")), ("월 선택", _select("월 선택")),
+                    ("작물 변경", lambda at, n: _select("작물 선택")(at, n + 1))],
+    '3_월별 감귤 생육 체크리스트': [("월 선택", _select("월을 선택"))],
+    '5_NEWS': [("추천 키워드", _keyword), ("검색", _search), ("더 보기", _click("뉴스 더 보기"))],
+}
+DEFAULT_STEPS = [("새로고침", None)]
+
+
+def page_steps(page):
+    name = os.path.splitext(os.path.basename(page))[0]
+    return INTERACTIONS.get(name, DEFAULT_STEPS)
+
+
+def list_pages(patterns=None):
+    """app.py + pages/*.py (patterns가 있으면 파일명에 그 중 하나가 들어간 페이지만)"""
+    pages = [APP] + sorted(glob.glob(os.path.join('pages', '*.py')))
+    if patterns:
+        pages = [p for p in pages if any(pattern in p for pattern in patterns)]
+    return pages
+
+
+# --- 세션 실행 ---
+@contextmanager
+def shared_runtime(secrets=SECRETS):
+    """여러 스레드의 AppTest가 함께 쓰는 프로세스 공용 런타임·secrets
+
+    AppTest.run은 실행마다 전역 Runtime 인스턴스·st.secrets·설정을 바꿨다가 끝날 때 되돌리므로, 세션을 동시에 돌리면
+    먼저 끝난 세션이 다른 세션이 쓰는 런타임을 지웁니다. 실제 서버처럼 런타임·스크립트 캐시·페이지 설정을 하나씩 두고
+    AppTest가 바꾸는 자리는 하위 클래스로 돌려 전역 값에 닿지 않게 합니다 (secrets는 세션마다 주지 않고 여기서 한 번 설정).
+    """
+    import streamlit as st
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.pages_manager import PagesManager
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.secrets import Secrets
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    shared_secrets = Secrets()
+    shared_secrets._secrets = dict(secrets)
+
+    script_cache = ScriptCache()  # 서버처럼 컴파일한 페이지 코드를 세션들이 공유
+
+    saved = (app_test.Runtime, app_test.ScriptCache, local_script_runner.ScriptCache, app_test.PagesManager,
+             Runtime._instance, st.secrets, PagesManager.uses_pages_directory, config.get_option('global.appTest'))
+    app_test.Runtime = type('SessionRuntime', (Runtime,), {})
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    app_test.PagesManager = type('SessionPagesManager', (PagesManager,), {})  # 실행마다 하는 초기화가 다른 세션에 닿지 않게
+    PagesManager.uses_pages_directory = os.path.isdir(os.path.join(os.path.dirname(os.path.abspath(APP)), 'pages'))
+    Runtime._instance = runtime
+    st.secrets = shared_secrets
+    config.set_option('global.appTest', True)
+    try:
+        yield
+    finally:
+        (app_test.Runtime, app_test.ScriptCache, local_script_runner.ScriptCache, app_test.PagesManager,
+         Runtime._instance, st.secrets, PagesManager.uses_pages_directory) = saved[:7]
+        config.set_option('global.appTest', saved[7])
+
+
+def _rerun(at, records, n, page, action):
+    start = time.perf_counter()
+    try:
+        at.run()
+        error = at.exception[0].value if at.exception else None
+    except Exception as e:  # 시간 초과 등 — 기록하고 다음 조작으로
+        error = f"{type(e).__name__}: {e}"
+    records.append({'session': n, 'page': page, 'action': action,
+                    'seconds': time.perf_counter() - start, 'error': error, 'rss_mb': rss_mb()})
+
+
+def run_session(n, pages, rounds, timeout, records):
+    """한 세션: 페이지를 (세션마다 다른 위치부터) 차례로 방문하며 조작 재생"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.abspath(APP), default_timeout=timeout)
+    offset = n % len(pages)
+    for r in range(rounds):
+        for page in pages[offset:] + pages[:offset]:
+            at.switch_page(page)
+            _rerun(at, records, n, page, "진입")
+            for action, step in page_steps(page):
+                if step is not None:
+                    try:
+                        step(at, n + r)
+                    except (StopIteration, KeyError, IndexError):
+                        continue  # 이번 화면에 해당 위젯이 없음 (예: 더 볼 뉴스 없음)
+                _rerun(at, records, n, page, action)
+
+
+def run_level(sessions, pages, rounds, timeout):
+    """sessions개 세션 동시 실행 (shared_runtime 안에서) → (기록 목록, 경과 시간)"""
+    records = []
+    threads = [threading.Thread(target=run_session, args=(n, pages, rounds, timeout, records), daemon=True)
+               for n in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records, time.perf_counter() - start
+
+
+def summarize(records, wall, pages):
+    """페이지별·전체 rerun 지연 시간 분위수(ms), 오류 수와 첫 오류, RSS(MB)"""
+    df = pd.DataFrame(records)
+    rows = {}
+    for page, group in [(p, df[df['page'] == p]) for p in pages] + [('전체', df)]:
+        if group.empty:
+            continue
+        ms = group['seconds'].to_numpy() * 1000
+        rss = group['rss_mb'].dropna()
+        errors = group['error'].dropna()
+        rows[page] = {'reruns': len(group), 'errors': len(errors),
+                      'first_error': None if errors.empty else str(errors.iloc[0]),
+                      **{f"p{int(q * 100)}_ms": round(float(np.quantile(ms, q)), 1) for q in QUANTILES},
+                      'rss_mb': None if rss.empty else round(float(rss.max()), 1)}
+    return {'wall_seconds': round(wall, 3), 'throughput': round(len(df) / wall, 2), 'pages': rows}
+
+
+def print_level(sessions, summary):
+    print(f"\n세션 {sessions}개: {summary['wall_seconds']:.1f}s, {summary['throughput']:.2f} rerun/s")
+    print(f"  {'페이지':<32} {'rerun':>6} {'오류':>4} {'p50':>9} {'p95':>9} {'p99':>9} {'RSS':>9}")
+    for page, row in summary['pages'].items():
+        rss = '' if row['rss_mb'] is None else f"{row['rss_mb']:.0f}MB"
+        print(f"  {os.path.basename(page):<32} {row['reruns']:>6} {row['errors']:>4} {row['p50_ms']:>7.0f}ms "
+              f"{row['p95_ms']:>7.0f}ms {row['p99_ms']:>7.0f}ms {rss:>9}", flush=True)
+        if row['first_error'] and page != '전체':
+            print(f"    오류 예: {row['first_error'][:120]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AppTest 다중 세션 부하 테스트")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 8], help="동시 세션 수 (여러 개면 차례로)")
+    parser.add_argument('--rounds', type=int, default=1, help="세션마다 전체 페이지를 도는 횟수")
+    parser.add_argument('--pages', nargs='*', help="파일명에 이 문자열이 들어간 페이지만 (기본: 전체)")
+    parser.add_argument('--timeout', type=float, default=120, help="rerun 한 번의 제한 시간(초)")
+    parser.add_argument('--api-latency', type=float, default=0.05, help="대체 뉴스 API 응답 지연(초)")
+    parser.add_argument('--p95-budget', type=float, default=1000, help="허용 p95 rerun 지연(ms)")
+    parser.add_argument('--no-warmup', action='store_true', help="측정 전 캐시 예열 세션을 돌리지 않음")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    pages = list_pages(args.pages)
+    if not pages:
+        parser.error(f"일치하는 페이지가 없습니다: {args.pages}")
+    server, url = start_news_stub(args.api_latency)
+    cache_dir = tempfile.mkdtemp(prefix='load_news_')
+    os.environ['NAVER_NEWS_API_URL'] = url
+    os.environ['NEWS_CACHE_PATH'] = os.path.join(cache_dir, 'news_cache.sqlite')
+    # AppTest 실행 중 Streamlit 경고 로그(ScriptRunContext 없음, 사용 중단 안내) 숨김
+    logging.disable(logging.WARNING)
+
+    report = {'config': vars(args), 'pages': pages, 'levels': {}}
+    try:
+        with shared_runtime():
+            if not args.no_warmup:
+                print("예열 세션 실행 중...", flush=True)
+                run_level(1, pages, 1, args.timeout)
+            for sessions in args.sessions:
+                summary = summarize(*run_level(sessions, pages, args.rounds, args.timeout), pages)
+                report['levels'][sessions] = summary
+                print_level(sessions, summary)
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    within = [s for s, summary in report['levels'].items() if summary['pages']['전체']['p95_ms'] <= args.p95_budget]
+    report['max_sessions_within_budget'] = max(within, default=None)
+    print(f"\np95 ≤ {args.p95_budget:.0f}ms 를 유지한 최대 동시 세션 수: {report['max_sessions_within_budget']}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
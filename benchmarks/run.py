@@ -0,0 +1,272 @@
+"""합성 데이터 규모별 단계 벤치마크
+
+    python -m benchmarks.run --stations 4 --years 30 --freq month
+    python -m benchmarks.run --stations 500 --freq day --save-baseline
+    python -m benchmarks.run --stations 500 --freq day          # 저장된 기준과 비교
+
+단계별 실행 시간과 최대 메모리(tracemalloc)를 출력하고, 같은 규모의 기준 결과보다
+허용 비율 이상 느려지거나 메모리가 늘면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_asos, generate_pest_csvs, write_asos_db, write_region_xlsx
+from modules import columnar
+from modules.alert_rules import ALERT_RULES, evaluate_rules, rule_columns
+from modules.climatology import Climatology, ensure_climatology
+from modules.downsample import line_figure
+from modules.ingest import get_data_version, ingest_asos
+from modules.map_layer import render_map_html
+from modules.pest_index import PesticideIndex
+from modules.pest_risk import ensure_pest_risk, risk_lookup
+from modules.pest_store import ingest_pest_csvs, monthly_trend, pesticides_for, source_signature, top_pests
+from modules.preprocess import preprocess_weather
+from modules.rollup import ensure_rollups, query_rollup
+from modules.suitability import (ANALYSIS_COLUMNS, DEFAULT_CRITERIA, SOURCE_COLUMNS, CriteriaScorer, score_cube,
+                                 slice_cube)
+from modules.weather_query import ensure_indexes, query_weather
+
+BASELINE_PATH = os.path.join('benchmarks', 'baseline.json')
+
+
+def measure(results, name, fn, *args, memory=True):
+    """fn 실행 시간(초)과 최대 메모리(MB)를 results[name]에 기록하고 결과 반환"""
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        value = fn(*args)
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2**20 if memory else None
+        if memory:
+            tracemalloc.stop()
+    results[name] = {'seconds': round(seconds, 4), 'peak_mb': None if peak is None else round(peak, 2)}
+    print(f"  {name:<24} {seconds:9.3f}s" + ("" if peak is None else f" {peak:10.1f}MB"), flush=True)
+    return value
+
+
+def chart_aggregation(conn, column):
+    """render_chart와 같은 경로: 월 롤업 한 컬럼 조회 → (연, 월) 지점 평균"""
+    df = query_rollup(conn, 'month', columns=[column])
+    monthly = df.groupby(['연도', '월'], as_index=False)[column].mean()
+    monthly['월'] = pd.to_datetime(dict(year=monthly['연도'], month=monthly['월'], day=1))
+    return monthly
+
+
+def series_figure(conn, column):
+    """원본 해상도 전 지점 시계열 → 다운샘플링 선 그래프 JSON (브라우저 전송량)"""
+    df = query_weather(conn, columns=[column])
+    df['일시'] = pd.to_datetime(df['일시'])
+    return line_figure(df, '일시', column, color='지점명').to_json()
+
+
+def suitability_pipeline(conn, regions):
+    """1번 페이지 경로: 월 롤업 → 적합도 큐브 → 최근 월 단면 → 지도 HTML"""
+    df = query_rollup(conn, 'month', columns=SOURCE_COLUMNS)
+    df = df.rename(columns=dict(zip(SOURCE_COLUMNS, ANALYSIS_COLUMNS)))
+    cube = score_cube(df, regions)
+    year, month = int(df['연도'].max()), int(df.loc[df['연도'] == df['연도'].max(), '월'].max())
+    latest = slice_cube(cube, year, month).merge(regions, on=['읍면동', '지점명'], how='left')
+    return render_map_html(latest, ANALYSIS_COLUMNS)
+
+
+def criteria_rescore(conn, regions):
+    """기준 조정 경로: 큐브 위 점수기 생성 후 기준 하나를 바꿔 다시 매기고 최근 월 단면 조회 → 다시 매긴 시간(초)"""
+    df = query_rollup(conn, 'month', columns=SOURCE_COLUMNS)
+    cube = score_cube(df.rename(columns=dict(zip(SOURCE_COLUMNS, ANALYSIS_COLUMNS))), regions)
+    scorer = CriteriaScorer(cube)
+    start = time.perf_counter()
+    scorer.update('default', dict(DEFAULT_CRITERIA, 기온=(14, 25)))
+    scorer.slice(int(df['연도'].max()), int(df.loc[df['연도'] == df['연도'].max(), '월'].max()))
+    return time.perf_counter() - start
+
+
+def pest_queries(conn, crops):
+    for crop in crops:
+        for month in range(1, 13):
+            top = top_pests(conn, crop, month)
+            pesticides_for(conn, crop, tuple(top['병해충명']), month)
+        monthly_trend(conn, crop)
+
+
+def risk_lookups(conn, crops, stations):
+    for crop in crops:
+        for station in stations:
+            for month in range(1, 13):
+                risk_lookup(conn, crop, station, month)
+
+
+def pesticide_lookups(index, names):
+    """약제마다 역색인 조회 + 앞 두 글자 자동완성"""
+    for name in names:
+        index.pesticide(name)
+        index.suggest(name[:2])
+
+
+def run(args):
+    work = tempfile.mkdtemp(prefix='bench_')
+    db_path = os.path.join(work, 'asos_weather.db')
+    results = {}
+    memory = not args.no_memory
+    print(f"stations={args.stations} years={args.years} freq={args.freq} ({work})")
+    try:
+        rows = measure(results, 'generate_db', write_asos_db, db_path, args.stations, args.years, args.freq,
+                       args.end_year, args.seed, memory=memory)
+        print(f"  → {rows:,}행")
+
+        sample_stations = min(args.stations, args.preprocess_stations)
+        raw = generate_asos(sample_stations, args.years, args.freq, args.end_year, args.seed).astype({'일시': str})
+        measure(results, 'preprocess_weather', preprocess_weather, raw, memory=memory)
+        del raw
+
+        coords_path, citrus_path = write_region_xlsx(os.path.join(work, 'xlsx'), args.regions, args.seed)
+        coords = measure(results, 'read_xlsx', lambda: (pd.read_excel(coords_path), pd.read_excel(citrus_path))[0],
+                         memory=memory)
+        conn = sqlite3.connect(db_path)
+        try:
+            station_names = [r[0] for r in conn.execute("SELECT DISTINCT 지점명 FROM asos_weather")]
+            regions = coords.rename(columns={'행정구역(읍면동)': '읍면동'})
+            regions['지점명'] = [station_names[i % len(station_names)] for i in range(len(regions))]
+
+            measure(results, 'ensure_indexes', ensure_indexes, conn, memory=memory)
+            measure(results, 'build_rollups', ensure_rollups, conn, memory=memory)
+            measure(results, 'build_climatology', ensure_climatology, conn, memory=memory)
+            measure(results, 'query_weather_range', query_weather, conn, station_names[:1],
+                    str(args.end_year - 1), str(args.end_year), SOURCE_COLUMNS, memory=memory)
+            measure(results, 'chart_aggregation', chart_aggregation, conn, '평균기온(°C)', memory=memory)
+            payload = measure(results, 'series_figure', series_figure, conn, '평균기온(°C)', memory=memory)
+            results['series_figure']['payload_mb'] = round(len(payload) / 2**20, 3)
+            measure(results, 'suitability_pipeline', suitability_pipeline, conn, regions, memory=memory)
+            rescore = measure(results, 'criteria_rescore', criteria_rescore, conn, regions, memory=memory)
+            results['criteria_rescore']['update_ms'] = round(rescore * 1000, 2)
+            clim = measure(results, 'load_climatology', Climatology.from_db, conn, memory=memory)
+            measure(results, 'climate_normals', clim.normals, memory=memory)
+
+            latest = query_weather(conn, start=str(args.end_year), end=str(args.end_year))
+            latest = latest[latest['일시'] == latest['일시'].max()]
+            measure(results, 'score_anomalies', clim.score, latest, memory=memory)
+            history = query_weather(conn, columns=rule_columns(ALERT_RULES))
+            measure(results, 'backfill_alerts', evaluate_rules, history, memory=memory)
+            del history
+            new = latest.copy()
+            new['일시'] = f"{args.end_year + 1}-01" + new['일시'].str[7:]
+            measure(results, 'ingest_increment', ingest_asos, conn, new, memory=memory)
+
+            if columnar.pa is not None:
+                measure(results, 'build_columnar', columnar.build_store, db_path, memory=memory)
+                store = columnar.ColumnarStore.open(db_path)
+                measure(results, 'columnar_read', store.query_weather, station_names[:1],
+                        str(args.end_year - 1), str(args.end_year), SOURCE_COLUMNS, memory=memory)
+
+            pest_dir = os.path.join(work, 'pest')
+            generate_pest_csvs(pest_dir, args.pest_rows, seed=args.seed)
+            measure(results, 'pest_ingest', ingest_pest_csvs, conn, pest_dir, memory=memory)
+            measure(results, 'pest_risk_build', ensure_pest_risk, conn, source_signature(pest_dir), get_data_version(conn),
+                    memory=memory)
+            measure(results, 'pest_risk_lookup', risk_lookups, conn, ['하우스감귤', '노지감귤', '만감류'],
+                    station_names, memory=memory)
+            index = measure(results, 'pesticide_index', PesticideIndex.from_conn, conn, memory=memory)
+            measure(results, 'pesticide_lookup', pesticide_lookups, index, index.pesticide_names(), memory=memory)
+            measure(results, 'pest_queries', pest_queries, conn, ['하우스감귤', '노지감귤', '만감류'], memory=memory)
+        finally:
+            conn.close()
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+def config_key(args):
+    return f"{args.stations}x{args.years}y-{args.freq}"
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    """기준 대비 비율 출력 → 회귀 단계 목록"""
+    regressions = []
+    print(f"\n{'stage':<24} {'time':>10} {'base':>10} {'ratio':>7} {'peak':>10} {'base':>10}")
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<24} {cur['seconds']:10.3f} {'-':>10}")
+            continue
+        ratio = cur['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+        slow = ratio > 1 + tolerance and cur['seconds'] - base['seconds'] > min_seconds
+        heavy = (cur['peak_mb'] is not None and base.get('peak_mb')
+                 and cur['peak_mb'] > base['peak_mb'] * (1 + tolerance) and cur['peak_mb'] - base['peak_mb'] > 1)
+        mark = ' ← 회귀' if slow or heavy else ''
+        print(f"{name:<24} {cur['seconds']:10.3f} {base['seconds']:10.3f} {ratio:7.2f} "
+              f"{cur['peak_mb'] or 0:10.1f} {base.get('peak_mb') or 0:10.1f}{mark}")
+        if mark:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 ASOS 데이터 벤치마크")
+    parser.add_argument('--stations', type=int, default=4)
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--freq', choices=['month', 'day', 'hour'], default='month')
+    parser.add_argument('--end-year', type=int, default=2024)
+    parser.add_argument('--regions', type=int, default=35, help="읍면동 수")
+    parser.add_argument('--pest-rows', type=int, default=1000)
+    parser.add_argument('--preprocess-stations', type=int, default=50,
+                        help="preprocess_weather 단계에 메모리로 올릴 최대 관측소 수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help="반복 횟수 (단계별 최소 시간 사용)")
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc 없이 시간만 측정")
+    parser.add_argument('--keep', action='store_true', help="임시 DB/CSV를 지우지 않음")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준으로 저장")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="허용 증가 비율")
+    parser.add_argument('--min-seconds', type=float, default=0.05, help="이보다 작은 시간 차이는 무시")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    # 반복 실행 시 단계별 최소 시간 / 최대 메모리 사용 (잡음 완화)
+    results = {}
+    for _ in range(args.repeat):
+        for name, cur in run(args).items():
+            best = results.setdefault(name, cur)
+            best['seconds'] = min(best['seconds'], cur['seconds'])
+            if cur['peak_mb'] is not None:
+                best['peak_mb'] = max(best['peak_mb'], cur['peak_mb'])
+    report = {'config': vars(args) | {'key': config_key(args)}, 'python': platform.python_version(),
+              'pandas': pd.__version__, 'stages': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines[config_key(args)] = results
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 저장: {args.baseline} [{config_key(args)}]")
+        return 0
+
+    if config_key(args) not in baselines:
+        print(f"\n{config_key(args)} 기준 결과가 없습니다. --save-baseline 으로 저장하세요.")
+        return 0
+    regressions = compare(results, baselines[config_key(args)], args.tolerance, args.min_seconds)
+    if regressions:
+        print(f"\n회귀 단계: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
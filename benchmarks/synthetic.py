@@ -0,0 +1,225 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+# data/asos_weather.db 의 asos_weather 테이블과 같은 컬럼 구성 (이름, SQLite 타입)
+ASOS_SCHEMA = [
+    ('지점', 'INTEGER'), ('지점명', 'TEXT'), ('일시', 'TEXT'),
+    ('평균기온(°C)', 'REAL'), ('평균최고기온(°C)', 'REAL'), ('평균최저기온(°C)', 'REAL'),
+    ('최고기온(°C)', 'REAL'), ('최저기온(°C)', 'REAL'),
+    ('최고기온 나타난날(yyyymmdd)', 'INTEGER'), ('최저기온 나타난날(yyyymmdd)', 'INTEGER'),
+    ('평균현지기압(hPa)', 'REAL'), ('평균해면기압(hPa)', 'REAL'), ('최고해면기압(hPa)', 'REAL'), ('최저해면기압(hPa)', 'REAL'),
+    ('최고해면기압 나타난날(yyyymmdd)', 'INTEGER'), ('최저해면기압 나타난날(yyyymmdd)', 'INTEGER'),
+    ('평균수증기압(hPa)', 'REAL'), ('최고수증기압(hPa)', 'REAL'), ('최저수증기압(hPa)', 'REAL'),
+    ('최고수증기압 나타난날(yyyymmdd)', 'INTEGER'), ('최저수증기압 나타난날(yyyymmdd)', 'INTEGER'),
+    ('평균이슬점온도(°C)', 'REAL'), ('평균상대습도(%)', 'INTEGER'), ('최소상대습도(%)', 'INTEGER'),
+    ('최소상대습도 나타난날(yyyymmdd)', 'INTEGER'),
+    ('월합강수량(00~24h만)(mm)', 'REAL'), ('일최다강수량(mm)', 'REAL'), ('1시간최다강수량(mm)', 'REAL'),
+    ('10분최다강수량(mm)', 'REAL'), ('일최다강수량 나타난날(yyyymmdd)', 'INTEGER'),
+    ('1시간최다강수량 나타난날(yyyymmdd)', 'REAL'), ('10분최다강수량 나타난날(yyyymmdd)', 'REAL'),
+    ('소형총증발량(mm)', 'REAL'), ('소형일최대증발량(mm)', 'REAL'), ('대형총증발량(mm)', 'REAL'), ('대형일최대증발량(mm)', 'REAL'),
+    ('소형일최대증발량 나타난날(yyyymmdd)', 'REAL'), ('대형일최대증발량 나타난날(yyyymmdd)', 'REAL'),
+    ('평균풍속(m/s)', 'REAL'), ('최대풍속(m/s)', 'REAL'), ('최대순간풍속(m/s)', 'REAL'),
+    ('최대풍속 풍향(16방위)', 'INTEGER'), ('최대순간풍속 풍향(16방위)', 'INTEGER'),
+    ('최대풍속 나타난날(yyyymmdd)', 'INTEGER'), ('최대순간풍속 나타난날(yyyymmdd)', 'INTEGER'),
+    ('최다풍향(16방위)', 'INTEGER'), ('평균운량(1/10)', 'REAL'), ('평균중하층운량(1/10)', 'REAL'),
+    ('합계 일조시간(hr)', 'REAL'), ('일조율(%)', 'REAL'), ('합계 일사량(MJ/m2)', 'REAL'),
+    ('최심적설(cm)', 'REAL'), ('최심신적설(cm)', 'REAL'), ('3시간신적설합(cm)', 'REAL'),
+    ('최심적설 나타난날(yyyymmdd)', 'REAL'), ('최심신적설 나타난날(yyyymmdd)', 'REAL'),
+    ('평균 최저초상온도(°C)', 'REAL'), ('최저초상온도(°C)', 'REAL'), ('최저초상온도 나타난날(yyyymmdd)', 'INTEGER'),
+    ('평균지면온도(°C)', 'REAL'), ('0.05m평균지중온도(°C)', 'REAL'), ('0.1m평균지중온도(°C)', 'REAL'),
+    ('0.2m평균지중온도(°C)', 'REAL'), ('0.3m평균지중온도(°C)', 'REAL'), ('0.5m평균지중온도(°C)', 'REAL'),
+    ('1.0m평균지중온도(°C)', 'REAL'), ('1.5m평균지중온도(°C)', 'REAL'), ('3.0m평균지중온도(°C)', 'REAL'),
+    ('5.0m평균지중온도(°C)', 'REAL'),
+]
+ASOS_COLUMNS = [name for name, _ in ASOS_SCHEMA]
+
+# 실제 DB의 관측소 (그 이후는 '관측소0005' 형태로 생성)
+BASE_STATIONS = [(170, '완도'), (184, '제주'), (189, '서귀포'), (262, '고흥')]
+
+# 주기별 '일시' 형식과 월 대비 누적량 비율 (강수량/일조시간 등 합계 컬럼에 적용)
+FREQS = {
+    'month': ('MS', '%Y-%m', 1.0),
+    'day': ('D', '%Y-%m-%d', 1 / 30.4),
+    'hour': ('h', '%Y-%m-%d %H:%M', 1 / 730.0),
+}
+
+PEST_CROPS = ['하우스감귤', '노지감귤', '만감류', '감귤', '키위', '양파', '마늘', '양배추', '브로콜리', '당근', '감자', '메밀']
+PEST_NAMES = ['잿빛곰팡이병', '검은점무늬병', '궤양병', '귤응애', '깍지벌레', '총채벌레', '진딧물', '노균병',
+              '탄저병', '흑색썩음균핵병', '담배거세미나방', '무름병', '더뎅이병', '역병']
+PESTICIDES = ['살림꾼(액수)', '유닉스(입수)', '카브리오(유)', '후론사이드(수)', '벨쿠트(수)', '확시란(수)', '코니도(수)']
+CITRUS_PROD_COLUMNS = ['노지온주(극조생)', '노지온주(조생)', '노지온주(보통)', '하우스감귤(조기출하)',
+                       '비가림(월동)감귤', '만감류(시설)', '만감류(노지)']
+
+
+def stations(n):
+    """관측소 (지점번호, 지점명) n개"""
+    extra = [(1000 + i, f"관측소{i:04d}") for i in range(len(BASE_STATIONS) + 1, n + 1)]
+    return (BASE_STATIONS + extra)[:n]
+
+
+def _dates(years, freq, end_year):
+    alias, fmt, _ = FREQS[freq]
+    index = pd.date_range(f"{end_year - years + 1}-01-01", f"{end_year}-12-31 23:00", freq=alias)
+    return index, index.strftime(fmt)
+
+
+def _column_values(col, base, season, n, scale, day_codes, rng):
+    """컬럼명 키워드로 값 분포를 정해 한 컬럼을 생성"""
+    noise = rng.standard_normal(n)
+    if '나타난날' in col:
+        return day_codes
+    if '풍향' in col:
+        return rng.integers(1, 17, n) * 20
+    if '지중온도' in col or '지면온도' in col or '초상온도' in col or '기온' in col or '이슬점' in col:
+        offset = 5.0 if ('최고' in col) else -5.0 if ('최저' in col) else 0.0
+        depth_damp = 0.5 if '지중' in col else 1.0
+        return np.round(base + season * depth_damp + offset + noise * 1.5, 1)
+    if '기압' in col:
+        return np.round((1005.0 if '현지' in col else 1013.0) - season * 0.5 + noise * 3, 1)
+    if '수증기압' in col:
+        return np.round(14 + season + noise, 1)
+    if '습도' in col:
+        return np.clip(np.round(70 + season + noise * 8 - (20 if '최소' in col else 0)), 5, 100)
+    if '강수량' in col or '증발량' in col:
+        total = rng.gamma(0.8, 120 if '강수' in col else 80, n)
+        return np.round(total * (scale if ('월합' in col or '총' in col) else min(1.0, scale * 5)), 1)
+    if '풍속' in col:
+        factor = 3.0 if '순간' in col else 2.0 if '최대' in col else 1.0
+        return np.round(np.abs(3 + noise) * factor, 1)
+    if '운량' in col:
+        return np.round(np.clip(5 + noise * 2, 0, 10), 1)
+    if '일조시간' in col:
+        return np.round(np.clip(180 + season * 5 + noise * 30, 0, None) * scale, 1)
+    if '일조율' in col:
+        return np.round(np.clip(50 + noise * 10, 0, 100), 1)
+    if '일사량' in col:
+        return np.round(np.clip(400 + season * 20 + noise * 50, 0, None) * scale, 2)
+    if '적설' in col:
+        return np.where((season < -5) & (rng.random(n) < 0.1), np.round(rng.gamma(1, 3, n), 1), np.nan)
+    return np.round(noise, 2)
+
+
+def generate_asos(n_stations=4, years=30, freq='month', end_year=2024, seed=0):
+    """asos_weather와 같은 컬럼/타입의 합성 관측 DataFrame (지점×기간)"""
+    return pd.concat(list(iter_asos(n_stations, years, freq, end_year, seed)), ignore_index=True)
+
+
+def iter_asos(n_stations=4, years=30, freq='month', end_year=2024, seed=0, chunk_stations=None):
+    """합성 관측을 관측소 묶음 단위 DataFrame으로 생성 (대용량 시 메모리 제한용)"""
+    index, labels = _dates(years, freq, end_year)
+    scale = FREQS[freq][2]
+    day_of_year = index.dayofyear.to_numpy()
+    hours = index.hour.to_numpy()
+    season = -10 * np.cos(2 * np.pi * (day_of_year - 15) / 365.25)
+    if freq == 'hour':
+        season = season - 3 * np.cos(2 * np.pi * (hours - 3) / 24)
+    day_codes = (index.year * 10000 + index.month * 100 + np.minimum(index.day, 28)).to_numpy()
+    all_stations = stations(n_stations)
+    chunk_stations = chunk_stations or len(all_stations)
+
+    for start in range(0, len(all_stations), chunk_stations):
+        group = all_stations[start:start + chunk_stations]
+        rng = np.random.default_rng([seed, start])
+        n = len(group) * len(index)
+        base = np.repeat(rng.normal(15, 2, len(group)), len(index))
+        data = {
+            '지점': np.repeat([code for code, _ in group], len(index)),
+            '지점명': np.repeat([name for _, name in group], len(index)),
+            '일시': np.tile(labels, len(group)),
+        }
+        tiled_season, tiled_codes = np.tile(season, len(group)), np.tile(day_codes, len(group))
+        for col, kind in ASOS_SCHEMA[3:]:
+            values = _column_values(col, base, tiled_season, n, scale, tiled_codes, rng)
+            data[col] = values.astype('int64') if kind == 'INTEGER' and not np.isnan(values).any() else values
+        yield pd.DataFrame(data, columns=ASOS_COLUMNS)
+
+
+def create_asos_table(conn):
+    cols = ',\n  '.join(f'"{name}" {kind}' for name, kind in ASOS_SCHEMA)
+    conn.execute(f'CREATE TABLE IF NOT EXISTS "asos_weather" (\n  {cols}\n)')
+
+
+def write_asos_db(path, n_stations=4, years=30, freq='month', end_year=2024, seed=0, chunk_stations=10):
+    """합성 관측을 SQLite DB 파일로 저장 (관측소 묶음별로 나눠 적재) → 행 수"""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    rows = 0
+    try:
+        create_asos_table(conn)
+        placeholders = ', '.join('?' * len(ASOS_COLUMNS))
+        for chunk in iter_asos(n_stations, years, freq, end_year, seed, chunk_stations):
+            with conn:
+                conn.executemany(f"INSERT INTO asos_weather VALUES ({placeholders})",
+                                 chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None))
+            rows += len(chunk)
+    finally:
+        conn.close()
+    return rows
+
+
+def generate_pest_csvs(out_dir, rows=1000, start_year=2019, end_year=2024, seed=0):
+    """병해충 CSV 세 개를 원본과 같은 두 가지 스키마로 생성 → 파일 경로 목록"""
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    dates = pd.to_datetime(rng.integers(pd.Timestamp(f"{start_year}-01-01").value // 10**9,
+                                        pd.Timestamp(f"{end_year}-12-31").value // 10**9, rows), unit='s')
+    crops = rng.choice(PEST_CROPS, rows)
+    # 일부는 '하우스감귤. 만감류'처럼 복수 작물 표기
+    multi = rng.random(rows) < 0.1
+    crops = np.where(multi, crops + '. ' + rng.choice(PEST_CROPS, rows), crops)
+    pests = rng.choice(PEST_NAMES, rows)
+    drugs = ['·'.join(rng.choice(PESTICIDES, 3, replace=False)) for _ in range(rows)]
+    base_date = dates.strftime('%Y-%m-%d')
+
+    paths = []
+    part = rows // 3
+    first = pd.DataFrame({'구분': '감귤', '중점방제대상': crops[:part], '병해충': pests[:part],
+                          '방제약': drugs[:part], '데이터기준일자': base_date[:part]})
+    paths.append(os.path.join(out_dir, 'pest_disease_info_1.csv'))
+    first.to_csv(paths[-1], index=False, encoding='utf-8-sig')
+    for i, (lo, hi) in enumerate(((part, 2 * part), (2 * part, rows)), start=2):
+        df = pd.DataFrame({
+            '연도': dates[lo:hi].year, '호수': [f"제{k}호" for k in range(1, hi - lo + 1)],
+            '발표일': base_date[lo:hi], '분류': '감귤', '농작물명': crops[lo:hi], '병해충유형': pests[lo:hi],
+            '방제약': [d + ' 등' for d in drugs[lo:hi]], '데이터기준일자': base_date[lo:hi],
+        })
+        paths.append(os.path.join(out_dir, f'pest_disease_info_{i}.csv'))
+        df.to_csv(paths[-1], index=False, encoding='utf-8-sig')
+    return paths
+
+
+def generate_regions(n_regions=35, seed=0):
+    """coords.xlsx 형태의 읍면동 좌표 (행정구역(읍면동), 위도, 경도)"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '행정구역(읍면동)': [f"읍면동{i:04d}" for i in range(1, n_regions + 1)],
+        '위도': np.round(rng.uniform(33.2, 33.55, n_regions), 4),
+        '경도': np.round(rng.uniform(126.15, 126.95, n_regions), 4),
+    })
+
+
+def generate_citrus(regions, start_year=2012, end_year=2023, seed=0):
+    """5.xlsx 형태의 읍면동별 감귤 농가수/면적/생산량"""
+    rng = np.random.default_rng(seed)
+    names = regions['행정구역(읍면동)'].tolist()
+    keys = pd.MultiIndex.from_product([range(start_year, end_year + 1), names, ['농가수', '면적', '생산량']],
+                                      names=['연도', '읍면동', '구분']).to_frame(index=False)
+    scale = keys['구분'].map({'농가수': 100, '면적': 100, '생산량': 3000}).to_numpy()
+    for col in CITRUS_PROD_COLUMNS:
+        keys[col] = np.round(rng.gamma(1.0, 1.0, len(keys)) * scale, 1)
+    keys['데이터기준일'] = pd.Timestamp('2024-05-13')
+    return keys
+
+
+def write_region_xlsx(out_dir, n_regions=35, seed=0):
+    """coords.xlsx / 5.xlsx 형태의 합성 엑셀 파일 생성 → (좌표 경로, 감귤 경로)"""
+    os.makedirs(out_dir, exist_ok=True)
+    regions = generate_regions(n_regions, seed)
+    coords_path, citrus_path = os.path.join(out_dir, 'coords.xlsx'), os.path.join(out_dir, '5.xlsx')
+    regions.to_excel(coords_path, index=False)
+    generate_citrus(regions, seed=seed).to_excel(citrus_path, index=False)
+    return coords_path, citrus_path
@@ -0,0 +1,165 @@
+"""선언형 기상 경보 규칙: 항목·비교·임계값·지속 기간·대상 지점
+
+규칙은 딕셔너리로 적고, 전체 지점×전체 기간 관측에 대해 한 번에 NumPy 마스크로 평가합니다.
+지속 기간은 같은 지점의 연속된 관측 기간(월자료는 월, 일자료는 일) 수로, 관측이 빠진 기간이 있으면
+연속이 끊깁니다. 날짜별 반복이 없으므로 전체 이력 재평가(backfill)도 수 초 안에 끝나 임계값을
+과거 사례에 맞춰 조정하거나 경보 이력을 바로 보여줄 수 있습니다.
+
+    {'name': 'heat', 'label': "🔥 폭염", '항목': '평균최고기온(°C)', 'op': '>=', 'threshold': 30,
+     'duration': 3, 'stations': ['제주', '서귀포']}   # 3기간 연속 30 이상 (stations 생략 시 전체)
+"""
+import json
+import operator
+
+import numpy as np
+import pandas as pd
+
+from modules.metrics import trace
+from modules.schema import widen
+
+OPERATORS = {'>=': operator.ge, '>': operator.gt, '<=': operator.le, '<': operator.lt, '==': operator.eq}
+
+# 기본 경보 규칙 (월자료 기준 임계값)
+ALERT_RULES = [
+    {'name': 'heat', 'label': "🔥 폭염", '항목': '평균최고기온(°C)', 'op': '>=', 'threshold': 30.0, 'duration': 1},
+    {'name': 'cold', 'label': "🥶 한파", '항목': '최저기온(°C)', 'op': '<=', 'threshold': -5.0, 'duration': 1},
+    {'name': 'drought', 'label': "🏜️ 가뭄", '항목': '월합강수량(00~24h만)(mm)', 'op': '<', 'threshold': 20.0,
+     'duration': 2},
+    {'name': 'gust', 'label': "🌪️ 강풍", '항목': '최대순간풍속(m/s)', 'op': '>=', 'threshold': 25.0, 'duration': 1},
+]
+
+EVENT_COLUMNS = ['규칙', 'label', '지점명', '일시', '항목', '값', '연속', '시작일시']
+EPISODE_COLUMNS = ['규칙', 'label', '지점명', '항목', '시작일시', '경보일시', '종료일시', '지속', '극값']
+
+
+def validate_rules(rules):
+    """규칙 목록 검사 (잘못된 비교 연산자·지속 기간, 중복 이름이면 ValueError) → 기본값을 채운 규칙 목록"""
+    out, names = [], set()
+    for rule in rules:
+        missing = [k for k in ('name', '항목', 'op', 'threshold') if k not in rule]
+        if missing:
+            raise ValueError(f"경보 규칙에 {missing} 항목이 없습니다: {rule}")
+        if rule['op'] not in OPERATORS:
+            raise ValueError(f"지원하지 않는 비교 연산자입니다: {rule['op']} (가능: {list(OPERATORS)})")
+        if int(rule.get('duration', 1)) < 1:
+            raise ValueError(f"지속 기간은 1 이상이어야 합니다: {rule['name']}")
+        if rule['name'] in names:
+            raise ValueError(f"경보 규칙 이름이 중복됩니다: {rule['name']}")
+        names.add(rule['name'])
+        out.append(dict(rule, label=rule.get('label', rule['name']), duration=int(rule.get('duration', 1)),
+                        stations=rule.get('stations')))
+    return out
+
+
+def load_rules(path):
+    """JSON 파일(규칙 딕셔너리 목록) → 검사한 규칙 목록"""
+    with open(path, encoding='utf-8') as f:
+        return validate_rules(json.load(f))
+
+
+def rule_columns(rules):
+    """규칙이 참조하는 관측 컬럼 (순서 유지, 중복 제거)"""
+    return list(dict.fromkeys(rule['항목'] for rule in rules))
+
+
+def period_unit(dates):
+    """관측 기간 단위: 모두 1일 0시면 'month', 0시면 'day', 그 밖에는 'hour'"""
+    dates = pd.to_datetime(pd.Series(dates))
+    if (dates.dt.normalize() == dates).all():
+        return 'month' if (dates.dt.day == 1).all() else 'day'
+    return 'hour'
+
+
+def period_ordinal(dates):
+    """일시 → 연속 여부 판단용 정수 (period_unit 단위)"""
+    dates = pd.to_datetime(pd.Series(dates).reset_index(drop=True))
+    unit = period_unit(dates)
+    if unit == 'month':
+        return (dates.dt.year * 12 + dates.dt.month).to_numpy(dtype=np.int64)
+    return dates.to_numpy(dtype='datetime64[D]' if unit == 'day' else 'datetime64[h]').astype(np.int64)
+
+
+def _column_values(series):
+    """비교용 실수 배열 — float32/float64 열은 원래 정밀도 그대로 (나머지는 float64)"""
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind == 'f':
+        return series.to_numpy()
+    return series.to_numpy(dtype=float, na_value=np.nan)
+
+
+def _run_lengths(mask, stations, ordinal):
+    """조건을 만족하는 연속 구간의 (현재까지 길이, 구간 시작 위치) — 지점이 바뀌거나 기간이 비면 끊김"""
+    n = len(mask)
+    positions = np.arange(n)
+    continues = np.zeros(n, dtype=bool)
+    continues[1:] = mask[1:] & mask[:-1] & (stations[1:] == stations[:-1]) & (np.diff(ordinal) == 1)
+    start = np.maximum.accumulate(np.where(mask & ~continues, positions, 0))
+    return np.where(mask, positions - start + 1, 0), start
+
+
+@trace('evaluate_alerts')
+def evaluate_rules(df, rules=ALERT_RULES):
+    """관측 DataFrame(지점명, 일시, 항목 컬럼들) → 경보가 켜진 (규칙, 지점, 일시) 행
+
+    연속 조건을 만족한 기간부터 조건이 끝날 때까지의 모든 관측이 포함됩니다.
+    임계값은 열과 같은 정밀도로 바꿔 비교하므로 float32 열의 30.9도 '>= 30.9'에 걸리고,
+    값은 float64로 넓힐 때 생기는 30.899999…가 아닌 원래 관측값(30.9)으로 내보냅니다.
+    반환 컬럼: 규칙, label, 지점명, 일시, 항목, 값, 연속(지금까지 연속 기간 수), 시작일시
+
+    >>> obs = pd.DataFrame({'지점명': ['고흥'], '일시': ['2020-08'],
+    ...                     '평균최고기온(°C)': np.array([30.9], dtype='float32')})
+    >>> rule = {'name': 'heat', '항목': '평균최고기온(°C)', 'op': '>=', 'threshold': 30.9}
+    >>> evaluate_rules(obs, [rule])['값'].tolist()
+    [30.9]
+    """
+    rules = validate_rules(rules)
+    if df.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    order = np.lexsort((pd.to_datetime(df['일시']).to_numpy(), df['지점명'].astype(str).to_numpy()))
+    df = df.iloc[order].reset_index(drop=True)
+    stations = df['지점명'].astype(str).to_numpy()
+    dates = df['일시'].to_numpy()
+    ordinal = period_ordinal(df['일시'])
+
+    events = []
+    for rule in rules:
+        if rule['항목'] not in df.columns:
+            continue
+        values = _column_values(df[rule['항목']])
+        with np.errstate(invalid='ignore'):
+            mask = OPERATORS[rule['op']](values, values.dtype.type(rule['threshold'])) & ~np.isnan(values)
+        if rule['stations'] is not None:
+            mask &= np.isin(stations, list(rule['stations']))
+        run, start = _run_lengths(mask, stations, ordinal)
+        hit = np.nonzero(run >= rule['duration'])[0]
+        if not len(hit):
+            continue
+        events.append(pd.DataFrame({
+            '규칙': rule['name'], 'label': rule['label'], '지점명': stations[hit], '일시': dates[hit],
+            '항목': rule['항목'], '값': widen(values[hit]), '연속': run[hit], '시작일시': dates[start[hit]],
+        }))
+    if not events:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    return pd.concat(events, ignore_index=True)
+
+
+def alert_episodes(events, rules=ALERT_RULES):
+    """경보 행 → 연속 구간(에피소드)별 요약: 시작·경보·종료 일시, 지속 기간 수, 극값
+
+    극값은 비교 방향에 따라 최댓값(>, >=) 또는 최솟값(<, <=, ==)입니다.
+    """
+    if events.empty:
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+    keys = ['규칙', 'label', '지점명', '항목', '시작일시']
+    grouped = events.groupby(keys, sort=False)
+    out = grouped.agg(경보일시=('일시', 'first'), 종료일시=('일시', 'last'), 지속=('연속', 'max'),
+                      최대=('값', 'max'), 최소=('값', 'min')).reset_index()
+    high = out['규칙'].map({r['name']: r['op'].startswith('>') for r in validate_rules(rules)}).fillna(True)
+    out['극값'] = out['최대'].where(high.astype(bool), out['최소'])
+    return out[EPISODE_COLUMNS].sort_values(['시작일시', '지점명']).reset_index(drop=True)
+
+
+def active_alerts(events, date):
+    """지정 일시에 켜져 있는 경보"""
+    if events.empty:
+        return events
+    return events[pd.to_datetime(events['일시']) == pd.to_datetime(date)].reset_index(drop=True)
@@ -1,5 +1,8 @@
-import pandas as pd
+from modules.pest_risk import risk_by_month
+from modules.pest_store import top_pests, monthly_trend
+from modules.metrics import trace
 
+@trace('get_today_weather_summary')
 def get_today_weather_summary(df):
     """
     오늘 날짜 기준 기온, 강수량, 풍속 요약
@@ -16,26 +19,18 @@ def get_today_weather_summary(df):
     }
     return result
 
-def get_top_pest_disease(df, crop, region, month, top_n=5):
+@trace('get_top_pest_disease')
+def get_top_pest_disease(conn, crop, month, top_n=5, year=None):
     """
-    특정 작물, 지역, 월 기준 병해충 TOP N
+    특정 작물, 월 기준 병해충 TOP N (pest_bulletin 인덱스 조회)
     """
-    filtered = df[
-        (df['작물명'] == crop) &
-        (df['지역명'] == region) &
-        (df['월'] == month)
-    ]
-    top = filtered['병해충명'].value_counts().head(top_n).reset_index()
-    top.columns = ['병해충명', '발생건수']
-    return top
+    return top_pests(conn, crop, month, year, top_n)
 
-def get_monthly_pest_trend(df, crop, region):
+@trace('get_monthly_pest_trend')
+def get_monthly_pest_trend(conn, crop, year=None, stations=None):
     """
-    작물, 지역 기준 월별 평균 위험도 추이
+    작물 기준 월별 병해충 공고 건수 추이 + 기상 기반 위험도지수 (pest_risk_monthly, 전체 연도·지점 평균)
     """
-    filtered = df[
-        (df['작물명'] == crop) &
-        (df['지역명'] == region)
-    ]
-    trend = filtered.groupby('월')['위험도지수'].mean().reset_index()
-    return trend
+    trend = monthly_trend(conn, crop, year)
+    risk = risk_by_month(conn, crop, stations)[['월', '위험도지수']]
+    return trend.merge(risk, on='월', how='left')
@@ -0,0 +1,259 @@
+"""적합도 지도·기상 차트·병해충 표를 미리 계산해 두는 정적 리포트 번들
+
+    python -m modules.cli report --workers 4
+
+연도×월 적합도(지도 HTML + 요약 표), 기상 분석 차트(plotly figure JSON),
+작물별 월 병해충(TOP N/추이/방제약 표 + figure JSON)을 ProcessPoolExecutor로 나눠 계산하고
+ARTIFACT_DIR/<데이터 버전>-<원본 서명>/ 아래에 저장합니다. 페이지는 현재 데이터와 같은 키의
+번들이 있으면 계산 없이 파일을 읽어 보여주고, 없거나 해당 선택이 빠져 있으면 직접 계산합니다.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+import pandas as pd
+import plotly.io as pio
+
+from modules import core
+from modules.climatology import ensure_climatology
+from modules.map_layer import render_map_html
+from modules.pest_store import ensure_pest_store, list_crops, list_months, source_signature
+from modules.rollup import ensure_rollups
+from modules.schema import find_column
+from modules.suitability import ANALYSIS_COLUMNS
+from modules.weather_query import DB_PATH, connect, ensure_indexes
+
+ARTIFACT_DIR = os.environ.get('ARTIFACT_DIR', os.path.join('.cache', 'artifacts'))
+MANIFEST = 'manifest.json'
+
+
+def bundle_key(db_path=DB_PATH, data_dir='data'):
+    """번들 디렉터리 이름: 데이터 버전 + 병해충 CSV·좌표/감귤 엑셀 서명
+
+    적재로 데이터 버전이 오르거나 원본 파일이 바뀌면 키가 달라져 이전 번들은 쓰지 않습니다.
+    """
+    parts = [source_signature(data_dir)]
+    for path in (core.CITRUS_PATH, core.COORDS_PATH):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts.append(f"{path}:{int(stat.st_mtime)}:{stat.st_size}")
+    digest = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:10]
+    return f"v{core.data_version(db_path)}-{digest}"
+
+
+def _slug(text):
+    return hashlib.sha1(str(text).encode('utf-8')).hexdigest()[:12]
+
+
+def suitability_file(year, month):
+    return os.path.join('suitability', f"{year}-{month:02d}")
+
+
+def chart_file(keyword):
+    return os.path.join('charts', f"{_slug(keyword)}.json")
+
+
+def pest_file(crop, month):
+    return os.path.join('pests', f"{_slug(crop)}-{month:02d}.json")
+
+
+def _write_json(path, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False)
+
+
+def _read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _frame_json(df):
+    return df.to_json(orient='split', index=False, force_ascii=False, date_format='iso')
+
+
+def _frame(text):
+    return pd.read_json(io.StringIO(text), orient='split')
+
+
+# --- 워커 프로세스 ---
+# 워커마다 한 번 큐브·좌표·감귤 데이터를 읽어 두고 작업(연도×월, 차트, 작물×월)만 받아 처리
+_WORKER = {}
+
+
+def _init_worker(db_path, out_dir):
+    regions, citrus = core.region_coords(), core.citrus_production()
+    _WORKER.update(db_path=db_path, out_dir=out_dir, regions=regions, citrus=citrus,
+                   cube=core.suitability_cube(regions=regions, db_path=db_path))
+
+
+def _suitability_task(year, month):
+    table = core.suitability_table(_WORKER['cube'], _WORKER['regions'], _WORKER['citrus'], year, month)
+    base = os.path.join(_WORKER['out_dir'], suitability_file(year, month))
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    with open(base + '.html', 'w', encoding='utf-8') as f:
+        f.write(render_map_html(table, ANALYSIS_COLUMNS))
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        f.write(_frame_json(table))
+    return 'suitability', (year, month)
+
+
+def _chart_task(keyword, y_label, title):
+    db_path = _WORKER['db_path']
+    col_name = find_column(tuple(core.weather_columns(db_path)), (keyword,))
+    if col_name is None:
+        return 'chart', None
+    monthly_avg = core.monthly_mean(core.rollup('month', columns=[col_name], db_path=db_path), col_name)
+    band = core.normal_band(core.normals([col_name], db_path=db_path), col_name)
+    fig = core.metric_figure(monthly_avg, col_name, y_label, title, band)
+    _write_json(os.path.join(_WORKER['out_dir'], chart_file(keyword)),
+                {'keyword': keyword, 'y_label': y_label, 'title': title, 'column': col_name,
+                 'figure': fig.to_json()})
+    return 'chart', keyword
+
+
+def _pest_task(crop, months):
+    # 월별 공고 추이는 작물에만 의존하므로 작물 단위로 묶어 추이 그래프를 한 번만 생성
+    done, line_json = [], None
+    for month in months:
+        top, trend, pesticides = core.pest_report(crop, month, db_path=_WORKER['db_path'])
+        if line_json is None:
+            line = core.pest_trend_figure(trend)
+            line_json = '' if line is None else line.to_json()
+        bar = core.pest_top_figure(top)
+        _write_json(os.path.join(_WORKER['out_dir'], pest_file(crop, month)),
+                    {'top': _frame_json(top), 'trend': _frame_json(trend), 'pesticides': _frame_json(pesticides),
+                     'bar': bar.to_json(), 'line': line_json or None})
+        done.append((crop, month))
+    return 'pest', done
+
+
+def _run_task(task):
+    kind, args = task
+    return {'suitability': _suitability_task, 'chart': _chart_task, 'pest': _pest_task}[kind](*args)
+
+
+def plan_tasks(db_path=DB_PATH, data_dir='data'):
+    """전체 작업 목록: 적합도 연도×월, 차트, 병해충 작물(전체 월)
+
+    인덱스·롤업·평년값·병해충 테이블 생성(쓰기)은 여기서 한 번 끝내 두어 워커는 읽기만 합니다.
+    """
+    with closing(connect(db_path)) as conn:
+        try:
+            ensure_indexes(conn)
+        except sqlite3.OperationalError:
+            pass
+        ensure_rollups(conn)
+        ensure_climatology(conn)
+        ensure_pest_store(conn, data_dir)
+        crops, months = list_crops(conn), list_months(conn)
+    cube = core.suitability_cube(db_path=db_path)
+    pairs = cube[['연도', '월']].drop_duplicates().sort_values(['연도', '월'])
+    tasks = [('suitability', (int(y), int(m))) for y, m in pairs.itertuples(index=False)]
+    tasks += [('chart', spec) for spec in core.CHART_SPECS]
+    tasks += [('pest', (crop, [int(m) for m in months])) for crop in crops]
+    return tasks, {'crops': crops, 'months': [int(m) for m in months]}
+
+
+def build_bundle(db_path=DB_PATH, root=ARTIFACT_DIR, workers=None, data_dir='data', keep=2):
+    """전체 그리드를 병렬 계산해 번들 저장 → 번들 경로
+
+    임시 디렉터리에 모두 쓴 뒤 manifest와 함께 한 번에 이름을 바꾸므로
+    페이지가 만들다 만 번들을 읽는 일은 없습니다.
+    """
+    key = bundle_key(db_path, data_dir)
+    tasks, pests = plan_tasks(db_path, data_dir)
+    tmp = os.path.join(root, f".tmp-{key}-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    start = time.perf_counter()
+    done = {'suitability': [], 'chart': [], 'pest': []}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(db_path, tmp)) as pool:
+        for kind, item in pool.map(_run_task, tasks, chunksize=4):
+            if kind == 'pest':
+                done[kind].extend(item)
+            elif item is not None:
+                done[kind].append(item)
+
+    manifest = {'key': key, 'data_version': core.data_version(db_path),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'seconds': round(time.perf_counter() - start, 2),
+                'suitability': sorted(done['suitability']), 'charts': sorted(done['chart']),
+                'pest_crops': pests['crops'], 'pest_months': pests['months'],
+                'pests': sorted([list(p) for p in done['pest']])}
+    _write_json(os.path.join(tmp, MANIFEST), manifest)
+
+    target = os.path.join(root, key)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    prune(root, keep)
+    return target
+
+
+def prune(root=ARTIFACT_DIR, keep=2):
+    """최근 keep개 번들만 남기고 삭제"""
+    if not os.path.isdir(root):
+        return
+    bundles = [os.path.join(root, d) for d in os.listdir(root)
+               if not d.startswith('.') and os.path.exists(os.path.join(root, d, MANIFEST))]
+    bundles.sort(key=os.path.getmtime, reverse=True)
+    for path in bundles[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class ReportBundle:
+    """저장된 번들 읽기 (없는 항목은 None → 페이지가 직접 계산)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.manifest = _read_json(os.path.join(path, MANIFEST))
+        self.key = self.manifest['key']
+        self._suitability = {tuple(p) for p in self.manifest['suitability']}
+        self._charts = set(self.manifest['charts'])
+        self._pests = {tuple(p) for p in self.manifest['pests']}
+
+    @classmethod
+    def open(cls, root=ARTIFACT_DIR, db_path=DB_PATH, data_dir='data'):
+        """현재 데이터와 키가 같은 번들 (없으면 None)"""
+        path = os.path.join(root, bundle_key(db_path, data_dir))
+        if not os.path.exists(os.path.join(path, MANIFEST)):
+            return None
+        return cls(path)
+
+    def suitability(self, year, month):
+        """(지도 HTML, 적합도 표)"""
+        if (year, month) not in self._suitability:
+            return None
+        base = os.path.join(self.path, suitability_file(year, month))
+        with open(base + '.html', encoding='utf-8') as f:
+            html = f.read()
+        with open(base + '.json', encoding='utf-8') as f:
+            return html, _frame(f.read())
+
+    def chart(self, keyword, y_label, title):
+        """(기준 컬럼, plotly figure) — 저장 당시와 제목/축 이름이 다르면 None"""
+        if keyword not in self._charts:
+            return None
+        data = _read_json(os.path.join(self.path, chart_file(keyword)))
+        if (data['y_label'], data['title']) != (y_label, title):
+            return None
+        return data['column'], pio.from_json(data['figure'])
+
+    def pest_options(self):
+        """(작물 목록, 월 목록)"""
+        return self.manifest['pest_crops'], self.manifest['pest_months']
+
+    def pests(self, crop, month):
+        """(top, trend, pesticides, 막대 figure, 추이 figure 또는 None)"""
+        if (crop, month) not in self._pests:
+            return None
+        data = _read_json(os.path.join(self.path, pest_file(crop, month)))
+        line = data['line']
+        return (_frame(data['top']), _frame(data['trend']), _frame(data['pesticides']),
+                pio.from_json(data['bar']), None if line is None else pio.from_json(line))
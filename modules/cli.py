@@ -0,0 +1,215 @@
+"""Streamlit 없이 계산 계층(modules.core)을 실행하는 명령줄 도구
+
+    python -m modules.cli latest
+    python -m modules.cli weather --stations 제주 서귀포 --start 2023-01 --end 2023-12 --columns 평균기온(°C)
+    python -m modules.cli rollup --level year --out rollup.csv
+    python -m modules.cli suitability --year 2024 --month 5 --out suitability.json
+    python -m modules.cli pests 노지감귤 --month 6
+    python -m modules.cli risk 노지감귤 --month 6 --table pest
+    python -m modules.cli pesticide 카브 --table suggest
+    python -m modules.cli anomalies --date 2024-12
+    python -m modules.cli alerts --rules rules.json --episodes
+    python -m modules.cli normals --items 평균기온(°C) --stations 제주
+    python -m modules.cli parcels parcels.csv --year 2024 --month 5
+    python -m modules.cli report --workers 4
+    python -m modules.cli columnar
+
+결과는 CSV로 표준 출력에 쓰고, --out 경로를 주면 확장자(.csv/.json)에 맞춰 파일로 저장합니다.
+"""
+import argparse
+import os
+import sys
+
+
+def write_frame(df, out=None):
+    """DataFrame → 표준 출력(CSV) 또는 파일(.csv/.json)"""
+    if out is None:
+        df.to_csv(sys.stdout, index=False)
+    elif out.endswith('.json'):
+        df.to_json(out, orient='records', force_ascii=False, date_format='iso', indent=2)
+    else:
+        df.to_csv(out, index=False, encoding='utf-8-sig')
+
+
+def cmd_latest(args):
+    from modules import core
+    print(core.latest_date(args.db))
+
+
+def cmd_weather(args):
+    from modules import core
+    write_frame(core.weather(args.stations, args.start, args.end, args.columns, args.agg, args.freq,
+                             db_path=args.db, float_dtype='float64'), args.out)
+
+
+def cmd_rollup(args):
+    from modules import core
+    write_frame(core.rollup(args.level, args.stations, args.start_year, args.end_year, args.columns,
+                            db_path=args.db, float_dtype='float64'), args.out)
+
+
+def cmd_suitability(args):
+    from modules import core
+    regions, citrus = core.region_coords(), core.citrus_production()
+    cube = core.suitability_cube(args.start_year, args.end_year, regions, db_path=args.db)
+    if args.year is None:
+        write_frame(cube, args.out)
+        return
+    month = args.month
+    if month is None:
+        months = cube.loc[cube['연도'] == args.year, '월']
+        month = int(months.max()) if not months.empty else None
+    write_frame(core.suitability_table(cube, regions, citrus, args.year, month), args.out)
+
+
+def cmd_pests(args):
+    from modules import core
+    top, trend, pesticides = core.pest_report(args.crop, args.month, args.year, args.top, db_path=args.db)
+    write_frame({'top': top, 'trend': trend, 'pesticides': pesticides}[args.table], args.out)
+
+
+def cmd_risk(args):
+    from modules import core
+    by_month, by_pest = core.pest_risk(args.crop, args.month, args.stations, db_path=args.db)
+    write_frame(by_month if args.table == 'month' else by_pest, args.out)
+
+
+def cmd_pesticide(args):
+    from modules import core
+    write_frame(core.pesticide_search(args.query, args.table, args.limit, db_path=args.db), args.out)
+
+
+def cmd_anomalies(args):
+    from modules import core
+    scored, anomalies = core.anomalies(args.date, args.columns, db_path=args.db)
+    write_frame(scored if args.all else anomalies, args.out)
+
+
+def cmd_alerts(args):
+    from modules import core
+    from modules.alert_rules import ALERT_RULES, alert_episodes, load_rules
+    rules = load_rules(args.rules) if args.rules else ALERT_RULES
+    events = core.alerts(rules, args.stations, args.start, args.end, db_path=args.db)
+    write_frame(alert_episodes(events, rules) if args.episodes else events, args.out)
+
+
+def cmd_normals(args):
+    from modules import core
+    write_frame(core.normals(args.items, args.stations, args.period, db_path=args.db), args.out)
+
+
+def cmd_parcels(args):
+    import pandas as pd
+    from modules import core
+    points = pd.read_csv(args.points)
+    write_frame(core.parcel_suitability(points, args.year, args.month, args.k, args.power, args.radius,
+                                        db_path=args.db), args.out)
+
+
+def cmd_columnar(args):
+    from modules.columnar import build_store
+    print(build_store(args.db))
+
+
+def cmd_report(args):
+    from modules.artifacts import build_bundle
+    print(build_bundle(args.db, args.root, args.workers, keep=args.keep))
+
+
+def build_parser():
+    from modules.weather_query import DB_PATH
+
+    parser = argparse.ArgumentParser(prog='python -m modules.cli', description="제주 농장 대시보드 계산 CLI")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite DB 경로")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add(name, fn, help):
+        p = sub.add_parser(name, help=help)
+        p.set_defaults(fn=fn)
+        if name not in ('latest', 'report', 'columnar'):
+            p.add_argument('--out', help="저장 경로 (.csv/.json, 없으면 표준 출력)")
+        return p
+
+    add('latest', cmd_latest, "가장 최근 관측 일시")
+
+    p = add('weather', cmd_weather, "기상 관측 조회")
+    p.add_argument('--stations', nargs='+')
+    p.add_argument('--start')
+    p.add_argument('--end')
+    p.add_argument('--columns', nargs='+')
+    p.add_argument('--freq', choices=['year', 'month', 'day'])
+    p.add_argument('--agg', choices=['mean', 'sum', 'max', 'min'])
+
+    p = add('rollup', cmd_rollup, "지점×연×월 / 지점×연 사전 집계")
+    p.add_argument('--level', choices=['month', 'year'], default='month')
+    p.add_argument('--stations', nargs='+')
+    p.add_argument('--start-year', type=int)
+    p.add_argument('--end-year', type=int)
+    p.add_argument('--columns', nargs='+')
+
+    p = add('suitability', cmd_suitability, "감귤 재배 적합도 (연도 미지정 시 전체 큐브)")
+    p.add_argument('--year', type=int)
+    p.add_argument('--month', type=int, help="미지정 시 해당 연도의 마지막 월")
+    p.add_argument('--start-year', type=int, default=2020)
+    p.add_argument('--end-year', type=int, default=2024)
+
+    p = add('pests', cmd_pests, "작물별 병해충 TOP N / 월별 추이 / 방제약")
+    p.add_argument('crop')
+    p.add_argument('--month', type=int)
+    p.add_argument('--year', type=int)
+    p.add_argument('--top', type=int, default=5)
+    p.add_argument('--table', choices=['top', 'trend', 'pesticides'], default='top')
+
+    p = add('risk', cmd_risk, "작물 기상 기반 병해충 위험도 지수 (월별 / 병해충별)")
+    p.add_argument('crop')
+    p.add_argument('--month', type=int, help="병해충별 지수를 볼 공고 월")
+    p.add_argument('--stations', nargs='+')
+    p.add_argument('--table', choices=['month', 'pest'], default='month')
+
+    p = add('pesticide', cmd_pesticide, "방제약·병해충 이름 검색 (자동완성 / 약제↔병해충 권고 건수 / 권고 공고)")
+    p.add_argument('query', help="약제명 또는 병해충명 (앞부분·초성 가능, 예: 카브, ㅋㅂㄹ)")
+    p.add_argument('--table', choices=['suggest', 'lookup', 'bulletins'], default='suggest')
+    p.add_argument('--limit', type=int, default=10)
+
+    p = add('anomalies', cmd_anomalies, "평년 대비 이상기후 (기본: 최근 관측)")
+    p.add_argument('--date', help="관측 일시 (예: 2024-12)")
+    p.add_argument('--columns', nargs='+')
+    p.add_argument('--all', action='store_true', help="이상 항목만이 아니라 전체 점수 출력")
+
+    p = add('alerts', cmd_alerts, "경보 규칙을 전체 이력에 적용 (경보가 켜진 지점×일시 또는 연속 구간)")
+    p.add_argument('--rules', help="규칙 JSON 파일 (없으면 기본 규칙)")
+    p.add_argument('--stations', nargs='+')
+    p.add_argument('--start')
+    p.add_argument('--end')
+    p.add_argument('--episodes', action='store_true', help="연속 구간별 요약 출력")
+
+    p = add('normals', cmd_normals, "지점×월(또는 연중일)×항목 평년값·표준편차·분위수(p10/p50/p90)")
+    p.add_argument('--items', nargs='+')
+    p.add_argument('--stations', nargs='+')
+    p.add_argument('--period', choices=['월', '연중일'], default='월')
+
+    p = add('parcels', cmd_parcels, "좌표 CSV(위도, 경도)의 필지별 적합도 (주변 관측소 역거리 가중)")
+    p.add_argument('points')
+    p.add_argument('--year', type=int, required=True)
+    p.add_argument('--month', type=int, required=True)
+    p.add_argument('--k', type=int, default=3, help="섞을 관측소 수")
+    p.add_argument('--power', type=float, default=2.0, help="역거리 가중 지수")
+    p.add_argument('--radius', type=float, default=50.0, help="관측소 검색 반경(km)")
+
+    p = add('report', cmd_report, "적합도 지도·차트·병해충 표 전체를 병렬로 미리 계산해 번들로 저장")
+    p.add_argument('--workers', type=int, help="프로세스 수 (기본: CPU 수)")
+    p.add_argument('--root', default=os.environ.get('ARTIFACT_DIR', os.path.join('.cache', 'artifacts')))
+    p.add_argument('--keep', type=int, default=2, help="남겨 둘 최근 번들 수")
+
+    add('columnar', cmd_columnar, "asos_weather/sunshine_data를 연도×지점 Arrow 열 저장소로 내보내기 (pyarrow 필요)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.fn(args)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
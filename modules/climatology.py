@@ -0,0 +1,356 @@
+"""지점별 평년값 저장소: 월·연중일(1~366)별 관측 수·평균·편차제곱합과 고정 구간 히스토그램
+
+두 통계 모두 병합·제거가 가능한 요약이라 적재 때마다 새 관측만 더하고 덮어쓴 관측만 빼면 되고,
+평균·표준편차·분위수(히스토그램 누적 도수 보간)·백분위는 이력 전체를 다시 읽지 않고 바로 구합니다.
+연중일은 윤년 달력 기준(3월 1일 = 61일)이며 일 단위 이상의 관측('YYYY-MM-DD…')에만 생깁니다.
+"""
+import numpy as np
+import pandas as pd
+from modules.metrics import trace
+from modules.schema import SCHEMA, widen
+from modules.weather_query import WEATHER_TABLE, get_weather_columns, quote_ident
+
+MOMENTS_TABLE = 'climate_moments'
+HIST_TABLE = 'climate_hist'
+DOY_MOMENTS_TABLE = 'climate_doy_moments'
+DOY_HIST_TABLE = 'climate_doy_hist'
+# 기간 컬럼 → (모멘트 테이블, 히스토그램 테이블)
+PERIODS = {'월': (MOMENTS_TABLE, HIST_TABLE), '연중일': (DOY_MOMENTS_TABLE, DOY_HIST_TABLE)}
+CLIMATE_KEYS = ['지점명', '월', '항목']
+
+# 평년값 항목별 히스토그램 구간 (하한, 폭, 구간 수) — 범위 밖 값은 양 끝 구간에 넣음
+CLIMATE_BINS = {
+    '평균기온(°C)': (-20.0, 0.5, 130),
+    '평균상대습도(%)': (0.0, 1.0, 101),
+    '월합강수량(00~24h만)(mm)': (0.0, 5.0, 400),
+    '평균풍속(m/s)': (0.0, 0.2, 150),
+    '합계 일조시간(hr)': (0.0, 2.0, 200),
+}
+# 위에 없는 KMA 관측 항목은 단위별 기본 구간 (수증기압은 기압과 범위가 달라 따로 지정)
+UNIT_BINS = {
+    '°C': (-30.0, 0.5, 160),
+    '%': (0.0, 1.0, 101),
+    'mm': (0.0, 1.0, 500),
+    'm/s': (0.0, 0.2, 300),
+    'hPa': (900.0, 0.5, 300),
+    '1/10': (0.0, 0.1, 101),
+    'hr': (0.0, 2.0, 200),
+    'MJ/m2': (0.0, 2.0, 500),
+    'cm': (0.0, 1.0, 200),
+}
+KEY_BINS = {'vapor_': (0.0, 0.2, 250)}
+QUANTILES = (0.1, 0.5, 0.9)
+
+# 월별 누적 일수 (윤년 기준) — 연중일 = DOY_OFFSET[월 - 1] + 일
+DOY_OFFSET = np.cumsum([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30])
+
+# 이상기후 판정 규칙: 항목, 방향(high/low), 경고 문구
+ANOMALY_RULES = [
+    {'항목': '평균기온(°C)', 'direction': 'high', 'label': "🔥 고온 이상"},
+    {'항목': '월합강수량(00~24h만)(mm)', 'direction': 'low', 'label': "💧 과소강수 이상"},
+    {'항목': '평균풍속(m/s)', 'direction': 'high', 'label': "🌪️ 강풍 이상"},
+]
+Z_THRESHOLD = 2.0
+PCT_THRESHOLD = 0.95
+MIN_SAMPLES = 3
+
+
+def climate_keys(period='월'):
+    return ['지점명', period, '항목']
+
+
+def _bins_for(item):
+    if item in CLIMATE_BINS:
+        return CLIMATE_BINS[item]
+    spec = SCHEMA.get(item)
+    if spec is None or spec['agg'] is None:
+        return None  # 날짜코드·풍향 등 관측값이 아닌 컬럼
+    for prefix, bins in KEY_BINS.items():
+        if spec['key'].startswith(prefix):
+            return bins
+    return UNIT_BINS.get(spec['unit'])
+
+
+# 평년값을 관리하는 전체 항목 → 구간
+ITEM_BINS = {col: _bins_for(col) for col in list(CLIMATE_BINS) + list(SCHEMA) if _bins_for(col) is not None}
+
+
+def climate_columns(conn):
+    """평년값을 관리할 항목 중 DB에 있는 컬럼"""
+    available = get_weather_columns(conn)
+    return [c for c in ITEM_BINS if c in available]
+
+
+def to_long(df, columns=None):
+    """관측 DataFrame(지점명, 일시, 항목 컬럼들) → (지점명, 일시, 월, 연중일, 항목, 값) 긴 형태 (결측 제외)
+
+    연중일은 일자가 없는 월 관측이면 결측입니다. float32 열은 원래 소수 자릿수로 넓혀(schema.widen)
+    float64로 저장된 평년값과 같은 값으로 편차·z점수를 계산합니다.
+    """
+    columns = [c for c in (columns or ITEM_BINS) if c in df.columns and c in ITEM_BINS]
+    base = df[['지점명', '일시'] + columns]
+    base = base.assign(**{c: widen(base[c]) for c in columns if base[c].dtype == np.float32})
+    text = base['일시'].astype(str)
+    month = pd.to_numeric(text.str[5:7], errors='coerce')
+    day = pd.to_numeric(text.str[8:10], errors='coerce')  # 'YYYY-MM' 월자료는 결측
+    base = base.assign(월=month, 연중일=(DOY_OFFSET[month.fillna(1).astype(int) - 1] + day).astype('Int16'))
+    long = base.melt(id_vars=['지점명', '일시', '월', '연중일'], var_name='항목', value_name='값')
+    long = long.dropna(subset=['값', '월'])
+    long['지점명'] = long['지점명'].astype(str)
+    long['월'] = long['월'].astype(int)
+    long['값'] = long['값'].astype(float)
+    return long
+
+
+def bin_index(values, item):
+    """값 → 항목별 히스토그램 구간 번호"""
+    lo, width, bins = ITEM_BINS[item]
+    return np.clip(np.floor((np.asarray(values, dtype=float) - lo) / width), 0, bins - 1).astype(int)
+
+
+def _period_rows(long, period):
+    return long if period == '월' else long.dropna(subset=[period]).astype({period: int})
+
+
+def batch_moments(long, period='월'):
+    """긴 형태 관측 → 키별 (n, mean, m2)"""
+    grouped = _period_rows(long, period).groupby(climate_keys(period))['값']
+    out = grouped.agg(n='count', mean='mean').reset_index()
+    out['m2'] = grouped.var(ddof=0).to_numpy() * out['n'].to_numpy()
+    return out
+
+
+def hist_counts(long, period='월'):
+    """긴 형태 관측 → 키·구간별 도수 Series"""
+    long = _period_rows(long, period)
+    bins = np.zeros(len(long), dtype=int)
+    for item, idx in long.groupby('항목').indices.items():
+        bins[idx] = bin_index(long['값'].to_numpy()[idx], item)
+    return long.assign(bin=bins).groupby(climate_keys(period) + ['bin']).size()
+
+
+def combine_moments(a, b, sign=1):
+    """(n, mean, m2) 병합(sign=1) 또는 제거(sign=-1) — Chan 병렬 Welford 공식
+
+    a, b: 같은 길이의 (n, mean, m2) 배열 튜플. 제거 시 b는 a에 포함된 표본이어야 합니다.
+    """
+    n_a, mean_a, m2_a = (np.asarray(x, dtype=float) for x in a)
+    n_b, mean_b, m2_b = (np.asarray(x, dtype=float) for x in b)
+    if sign > 0:
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean_b - mean_a
+            mean = np.where(n > 0, mean_a + delta * n_b / n, 0.0)
+            m2 = np.where(n > 0, m2_a + m2_b + delta ** 2 * n_a * n_b / n, 0.0)
+        return n, mean, m2
+
+    n = n_a - n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n > 0, (n_a * mean_a - n_b * mean_b) / n, 0.0)
+        delta = mean_b - mean
+        m2 = np.where(n > 0, m2_a - m2_b - delta ** 2 * n * n_b / n_a, 0.0)
+    return n, mean, np.maximum(m2, 0.0)
+
+
+def create_climate_tables(conn):
+    for period, (moments_table, hist_table) in PERIODS.items():
+        conn.execute(f"""CREATE TABLE IF NOT EXISTS {moments_table} (
+            지점명 TEXT NOT NULL, {period} INTEGER NOT NULL, 항목 TEXT NOT NULL,
+            n INTEGER NOT NULL, mean REAL NOT NULL, m2 REAL NOT NULL,
+            PRIMARY KEY (지점명, {period}, 항목))""")
+        conn.execute(f"""CREATE TABLE IF NOT EXISTS {hist_table} (
+            지점명 TEXT NOT NULL, {period} INTEGER NOT NULL, 항목 TEXT NOT NULL,
+            bin INTEGER NOT NULL, count INTEGER NOT NULL,
+            PRIMARY KEY (지점명, {period}, 항목, bin))""")
+
+
+def update_climatology(conn, added=None, removed=None):
+    """평년값 증분 갱신: added(추가 관측)를 더하고 removed(덮어쓴 이전 관측)를 뺌
+
+    added/removed: to_long() 형태. 갱신 비용은 이력 길이와 무관하게 관측 수에 비례합니다.
+    트랜잭션은 호출한 쪽에서 관리합니다.
+    """
+    for period, (moments_table, hist_table) in PERIODS.items():
+        keys_sql = f"지점명, {period}, 항목"
+        for long, sign in ((removed, -1), (added, 1)):
+            if long is None or long.empty:
+                continue
+            batch = batch_moments(long, period)
+            if batch.empty:
+                continue  # 월 관측에는 연중일 평년값이 없음
+            keys = [(s, int(p), i) for s, p, i in batch[climate_keys(period)].itertuples(index=False, name=None)]
+            # 키 수(지점×기간×항목)는 이력 길이와 무관하게 작으므로 전체를 읽어 병합
+            current = {row[:3]: row[3:] for row in conn.execute(
+                f"SELECT {keys_sql}, n, mean, m2 FROM {moments_table}")}
+            base = np.array([current.get(key, (0, 0.0, 0.0)) for key in keys], dtype=float).reshape(-1, 3)
+            n, mean, m2 = combine_moments(base.T, (batch['n'], batch['mean'], batch['m2']), sign)
+            conn.executemany(f"""INSERT INTO {moments_table} ({keys_sql}, n, mean, m2) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT({keys_sql}) DO UPDATE SET n = excluded.n, mean = excluded.mean, m2 = excluded.m2""",
+                             [key + (int(c), float(m), float(s)) for key, c, m, s in zip(keys, n, mean, m2)])
+
+            counts = hist_counts(long, period)
+            conn.executemany(f"""INSERT INTO {hist_table} ({keys_sql}, bin, count) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT({keys_sql}, bin) DO UPDATE SET count = count + excluded.count""",
+                             [(s, int(p), i, int(b), sign * int(c)) for (s, p, i, b), c in counts.items()])
+        conn.execute(f"DELETE FROM {hist_table} WHERE count <= 0")
+        conn.execute(f"DELETE FROM {moments_table} WHERE n <= 0")
+
+
+def read_climate_observations(conn, where_sql='', params=()):
+    """asos_weather에서 평년값 항목만 긴 형태로 조회"""
+    columns = climate_columns(conn)
+    if not columns:
+        return pd.DataFrame(columns=['지점명', '일시', '월', '연중일', '항목', '값'])
+    sql = (f"SELECT 지점명, 일시, {', '.join(quote_ident(c) for c in columns)} "
+           f"FROM {WEATHER_TABLE}{where_sql}")
+    return to_long(pd.read_sql(sql, conn, params=list(params)), columns)
+
+
+def climatology_ready(conn):
+    """현재 구성의 평년값 테이블이 모두 있는지"""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return all(table in existing for pair in PERIODS.values() for table in pair)
+
+
+def ensure_climatology(conn):
+    """평년값 테이블이 없으면 생성 후 전체 관측으로 초기 집계
+
+    연중일 테이블이 없는 이전 구성(월·5개 항목)의 테이블은 지우고 전체 항목으로 다시 집계합니다.
+    """
+    if climatology_ready(conn):
+        return
+    tables = [table for pair in PERIODS.values() for table in pair]
+    with conn:
+        for table in tables:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        create_climate_tables(conn)
+        update_climatology(conn, read_climate_observations(conn))
+
+
+class Climatology:
+    """지점×기간(월 또는 연중일)×항목 평년값(평균·표준편차·히스토그램)
+
+    새 관측의 편차·z점수·백분위(score)와 평년 분위수 표(normals)를 계산합니다.
+    """
+
+    def __init__(self, moments, hist, period='월'):
+        self.period = period
+        self.keys = climate_keys(period)
+        self.moments = moments.set_index(self.keys).sort_index()
+        n = self.moments['n'].to_numpy(dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.moments['std'] = np.where(n > 1, np.sqrt(self.moments['m2'].to_numpy() / (n - 1)), np.nan)
+        # 누적 도수표는 항목을 처음 쓸 때 만듦 (연중일×전체 항목을 한 번에 펼치면 큼)
+        self._hist = dict(tuple(hist.groupby('항목')))
+        self._cum = {}
+
+    def _cumulative(self, item):
+        """항목별 (키 × 구간) 누적 도수표: cum[k, b] = b번 구간 미만 관측 수 → (키 색인, cum) 또는 None"""
+        if item not in self._cum:
+            group = self._hist.get(item)
+            if group is None or item not in ITEM_BINS:
+                self._cum[item] = None
+            else:
+                index = pd.MultiIndex.from_frame(group[self.keys])
+                keys = index.unique()
+                counts = np.zeros((len(keys), ITEM_BINS[item][2] + 1))
+                np.add.at(counts, (keys.get_indexer(index), group['bin'].to_numpy(dtype=int) + 1),
+                          group['count'].to_numpy())
+                self._cum[item] = (keys, np.cumsum(counts, axis=1))
+        return self._cum[item]
+
+    @classmethod
+    def from_db(cls, conn, period='월'):
+        """평년값 테이블에서 읽기"""
+        moments_table, hist_table = PERIODS[period]
+        moments = pd.read_sql(f"SELECT 지점명, {period}, 항목, n, mean, m2 FROM {moments_table}", conn)
+        hist = pd.read_sql(f"SELECT 지점명, {period}, 항목, bin, count FROM {hist_table}", conn)
+        return cls(moments, hist, period)
+
+    @classmethod
+    def from_observations(cls, long, period='월'):
+        """긴 형태 관측에서 바로 계산 (DB에 쓸 수 없을 때)"""
+        moments = batch_moments(long, period)
+        hist = hist_counts(long, period).rename('count').reset_index()
+        return cls(moments, hist, period)
+
+    @trace('score_anomalies')
+    def score(self, df, columns=None):
+        """관측 DataFrame → 지점·항목별 평년값, 편차, z점수, 백분위 (벡터 연산)
+
+        반환 컬럼: 지점명, 일시, 항목, 값, 평년값, 표준편차, 표본수, 편차, z점수, 백분위
+        """
+        long = to_long(df, columns)
+        keys = long[self.keys].astype({self.period: 'Int64'})
+        stats = self.moments.reindex(pd.MultiIndex.from_frame(keys))
+        long['평년값'] = stats['mean'].to_numpy()
+        long['표준편차'] = stats['std'].to_numpy()
+        long['표본수'] = stats['n'].fillna(0).astype(int).to_numpy()
+        long['편차'] = long['값'] - long['평년값']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            long['z점수'] = long['편차'] / long['표준편차'].where(long['표준편차'] > 0)
+
+        # 백분위: 해당 구간 미만 도수 + 구간 내 위치만큼(균등 분포 가정)
+        pct = np.full(len(long), np.nan)
+        for item, idx in long.groupby('항목').indices.items():
+            table = self._cumulative(item)
+            if table is None:
+                continue
+            index, cum = table
+            rows = index.get_indexer(pd.MultiIndex.from_frame(keys.iloc[idx]))
+            found = rows >= 0
+            values = long['값'].to_numpy()[idx][found]
+            lo, width, _ = ITEM_BINS[item]
+            bins = bin_index(values, item)
+            frac = np.clip((values - lo) / width - bins, 0, 1)
+            below, upto = cum[rows[found], bins], cum[rows[found], bins + 1]
+            pct[idx[found]] = (below + (upto - below) * frac) / cum[rows[found], -1]
+        long['백분위'] = pct
+        return long.drop(columns=['월', '연중일']).reset_index(drop=True)
+
+    @trace('climate_normals')
+    def normals(self, items=None, stations=None, quantiles=QUANTILES):
+        """평년 분위수 표 → 지점명, 기간, 항목, 표본수, 평년값, 표준편차, p10, p50, p90 …
+
+        분위수는 누적 도수가 q를 넘는 구간 안에서 선형 보간합니다 (오차는 구간 폭 이내).
+        """
+        table = self.moments
+        if items is not None:
+            table = table[table.index.get_level_values('항목').isin(list(items))]
+        if stations is not None:
+            table = table[table.index.get_level_values('지점명').isin(list(stations))]
+        out = table.reset_index().rename(columns={'n': '표본수', 'mean': '평년값', 'std': '표준편차'})
+        out = out.drop(columns='m2')
+        names = [f"p{round(q * 100)}" for q in quantiles]
+        values = np.full((len(out), len(quantiles)), np.nan)
+        for item, idx in out.groupby('항목').indices.items():
+            cum_table = self._cumulative(item)
+            if cum_table is None:
+                continue
+            index, cum = cum_table
+            rows = index.get_indexer(pd.MultiIndex.from_frame(out[self.keys].iloc[idx]))
+            found = rows >= 0
+            cum = cum[rows[found]]
+            lo, width, bins = ITEM_BINS[item]
+            target = cum[:, -1:] * np.asarray(quantiles)[None, :]              # (키, 분위)
+            # 누적 도수가 target 이상이 되는 첫 구간 경계 b → 값은 b-1번 구간 안
+            edge = np.clip((cum[:, None, :] < target[:, :, None]).sum(axis=2), 1, bins)
+            below = np.take_along_axis(cum, edge - 1, axis=1)
+            upto = np.take_along_axis(cum, edge, axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                frac = np.where(upto > below, (target - below) / (upto - below), 0.5)
+            values[idx[found]] = lo + width * (edge - 1 + np.clip(frac, 0, 1))
+        out[names] = values
+        return out
+
+
+def evaluate_anomalies(scored, rules=ANOMALY_RULES, z_threshold=Z_THRESHOLD,
+                       pct_threshold=PCT_THRESHOLD, min_samples=MIN_SAMPLES):
+    """z점수/백분위가 지점별 평년 분포의 양 끝에 있는 관측 → 경고 목록 DataFrame"""
+    rules = pd.DataFrame(rules)
+    out = scored.merge(rules, on='항목', how='inner')
+    high = out['direction'] == 'high'
+    z = out['z점수'].where(high, -out['z점수'])
+    pct = out['백분위'].where(high, 1 - out['백분위'])
+    out['경고'] = (out['표본수'] >= min_samples) & ((z >= z_threshold) | (pct >= pct_threshold))
+    return out[out['경고']].drop(columns=['경고', 'direction']).reset_index(drop=True)
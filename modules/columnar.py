@@ -0,0 +1,243 @@
+"""연도×지점 파티션 Arrow(IPC) 열 저장소 — 선택 기능 (pyarrow 필요)
+
+    python -m modules.cli columnar          # data/asos_weather.db → data/asos_weather_columnar/
+
+asos_weather를 연도=YYYY/지점명=<지점>.arrow 파일로, sunshine_data를 한 파일로 저장합니다.
+파일은 압축 없는 Arrow IPC라 메모리 매핑으로 열면 버퍼를 복사하지 않고 OS 페이지 캐시를 그대로 쓰므로,
+여러 Streamlit 워커 프로세스가 같은 데이터를 각자 디코딩해 들고 있지 않아도 됩니다.
+manifest의 데이터 버전이 DB와 같을 때만 사용하고(다르면 SQLite로 조회), 증분 적재 시에는
+적재된 연도×지점 파티션만 다시 씁니다. WEATHER_STORE=sqlite 로 끄거나 pyarrow가 없으면 항상 SQLite입니다.
+"""
+import json
+import os
+import shutil
+from contextlib import closing
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+except ImportError:  # 선택 의존성
+    pa = None
+
+from modules import ingest  # ingest도 이 모듈을 불러오므로 모듈 단위로 참조
+from modules.db_pool import read_connection
+from modules.schema import column_dtype
+from modules.weather_query import DB_PATH, WEATHER_TABLE, connect, get_weather_columns, quote_ident
+
+WEATHER_STORE = os.environ.get('WEATHER_STORE', 'auto')
+SUNSHINE_TABLE = 'sunshine_data'
+MANIFEST = 'manifest.json'
+
+# 스키마 dtype → Arrow 타입 / pandas 변환 시 dtype (apply_schema가 다시 변환하지 않도록 맞춤)
+ARROW_TYPES = {'float32': 'float32', 'Int32': 'int32', 'Int16': 'int16'}
+PANDAS_TYPES = {'int32': pd.Int32Dtype(), 'int16': pd.Int16Dtype()}
+
+
+def available():
+    return pa is not None and WEATHER_STORE != 'sqlite'
+
+
+def store_dir(db_path=DB_PATH):
+    """DB 파일 옆의 저장소 경로 (data/asos_weather.db → data/asos_weather_columnar)"""
+    return os.path.splitext(db_path)[0] + '_columnar'
+
+
+def _partition_path(root, year, station):
+    return os.path.join(root, WEATHER_TABLE, f"연도={year}", f"지점명={str(station).replace(os.sep, '_')}.arrow")
+
+
+def _arrow_schema(columns):
+    fields = []
+    for col in columns:
+        if col == '지점명':
+            fields.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        elif col == '일시':
+            fields.append(pa.field(col, pa.string()))  # SQLite와 같은 접두어 문자열 비교를 위해 문자열 유지
+        else:
+            fields.append(pa.field(col, getattr(pa, ARROW_TYPES.get(column_dtype(col), 'float64'))()))
+    return pa.schema(fields)
+
+
+def _write_table(path, df, schema):
+    """임시 파일에 쓴 뒤 교체 — 기존 파일을 매핑 중인 프로세스는 이전 내용을 계속 읽음"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False, safe=False)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, 'wb') as sink, ipc.new_file(sink, schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _read_manifest(root):
+    path = os.path.join(root, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(root, manifest):
+    tmp = os.path.join(root, f"{MANIFEST}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(root, MANIFEST))
+
+
+def _write_partitions(conn, root, columns, partitions):
+    """(연도, 지점명) 파티션 파일 다시 쓰기 (해당 파티션의 행이 없으면 파일 삭제)
+
+    지점별로 한 번 조회해 연도로 나눠 씁니다.
+    """
+    schema = _arrow_schema(columns)
+    select = ', '.join(quote_ident(c) for c in columns)
+    years_by_station = {}
+    for year, station in partitions:
+        years_by_station.setdefault(station, set()).add(int(year))
+    for station, years in sorted(years_by_station.items()):
+        df = pd.read_sql(f"SELECT {select} FROM {WEATHER_TABLE} WHERE 지점명 = ? AND 일시 >= ? AND 일시 < ? "
+                         f"ORDER BY 일시", conn, params=[station, str(min(years)), f"{max(years)}~"])
+        prefix = df['일시'].str[:4]
+        for year in sorted(years):
+            part = df[prefix == str(year)]
+            path = _partition_path(root, year, station)
+            if part.empty:
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            _write_table(path, part, schema)
+
+
+def build_store(db_path=DB_PATH, root=None):
+    """SQLite 전체 → 열 저장소 (새로 만든 뒤 교체) → 저장소 경로"""
+    if pa is None:
+        raise ImportError("열 저장소에는 pyarrow가 필요합니다: pip install pyarrow")
+    root = root or store_dir(db_path)
+    tmp = f"{root}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    with closing(connect(db_path)) as conn:
+        version = ingest.get_data_version(conn)
+        columns = get_weather_columns(conn)
+        partitions = conn.execute(f"SELECT DISTINCT CAST(substr(일시, 1, 4) AS INTEGER), 지점명 "
+                                  f"FROM {WEATHER_TABLE}").fetchall()
+        _write_partitions(conn, tmp, columns, partitions)
+        try:
+            sunshine = pd.read_sql(f"SELECT * FROM {SUNSHINE_TABLE}", conn)
+        except Exception:
+            sunshine = None
+    if sunshine is not None:
+        schema = pa.Schema.from_pandas(sunshine, preserve_index=False)
+        _write_table(os.path.join(tmp, f"{SUNSHINE_TABLE}.arrow"), sunshine, schema)
+    _write_manifest(tmp, {'version': version, 'columns': columns, 'sunshine': sunshine is not None})
+    shutil.rmtree(root, ignore_errors=True)
+    os.replace(tmp, root)
+    return root
+
+
+def update_store(conn, partitions, previous_version, root=None):
+    """증분 적재 후 호출: 적재 전 버전과 맞던 저장소만 해당 연도×지점 파일을 다시 쓰고 버전 갱신
+
+    partitions: [(지점명, 'YYYY-MM'), ...] (ingest_asos 반환값)
+    """
+    root = root or store_dir(conn.execute("PRAGMA database_list").fetchone()[2])
+    manifest = _read_manifest(root) if pa is not None else None
+    if manifest is None or manifest['version'] != previous_version:
+        return False  # 저장소가 없거나 이미 오래됨 → 다시 build_store 할 때까지 SQLite 사용
+    columns = get_weather_columns(conn)
+    if columns != manifest['columns']:
+        return False
+    _write_partitions(conn, root, columns, sorted({(int(month[:4]), station) for station, month in partitions}))
+    _write_manifest(root, dict(manifest, version=ingest.get_data_version(conn)))
+    return True
+
+
+_mapped = {}
+
+
+def _open(path):
+    """메모리 매핑된 Arrow 테이블 (파일이 바뀌면 다시 매핑)"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _mapped.get(path)
+    if cached is None or cached[0] != mtime:
+        with pa.memory_map(path, 'r') as source:
+            cached = _mapped[path] = (mtime, ipc.open_file(source).read_all())
+    return cached[1]
+
+
+def _to_pandas(table):
+    return table.to_pandas(types_mapper=PANDAS_TYPES.get)
+
+
+class ColumnarStore:
+    """열 저장소 읽기 — open()이 None이면 SQLite로 조회"""
+
+    def __init__(self, root, manifest):
+        self.root = root
+        self.manifest = manifest
+        self.columns = manifest['columns']
+
+    @classmethod
+    def open(cls, db_path=DB_PATH, version=None):
+        """DB 데이터 버전과 맞는 저장소 (없거나 오래됐거나 pyarrow가 없으면 None)"""
+        if not available():
+            return None
+        root = store_dir(db_path)
+        manifest = _read_manifest(root)
+        if manifest is None:
+            return None
+        if version is None:
+            with read_connection(db_path) as conn:
+                version = ingest.get_data_version(conn)
+        return cls(root, manifest) if manifest['version'] == version else None
+
+    def _partition_files(self, stations, start, end):
+        base = os.path.join(self.root, WEATHER_TABLE)
+        if not os.path.isdir(base):
+            return []
+        wanted = None if stations is None else {str(s).replace(os.sep, '_') for s in
+                                                ([stations] if isinstance(stations, str) else stations)}
+        files = []
+        for year_dir in sorted(os.listdir(base)):
+            year = year_dir.split('=', 1)[1]
+            if (start is not None and year < str(start)[:4]) or (end is not None and year > str(end)[:4]):
+                continue
+            for name in sorted(os.listdir(os.path.join(base, year_dir))):
+                if not name.endswith('.arrow'):
+                    continue
+                station = name.split('=', 1)[1][:-len('.arrow')]
+                if wanted is None or station in wanted:
+                    files.append((station, year, os.path.join(base, year_dir, name)))
+        # 파일은 한 지점·한 해를 '일시' 순으로 담고 있으므로 (지점, 연도) 순으로 이으면 정렬이 필요 없음
+        return [path for _, _, path in sorted(files)]
+
+    def query_weather(self, stations=None, start=None, end=None, columns=None):
+        """query_weather(집계 없음)와 같은 결과: 지점명, 일시 + 컬럼, (지점명, 일시) 순"""
+        if columns is None:
+            columns = [c for c in self.columns if c not in ('지점', '지점명', '일시')]
+        unknown = [c for c in columns if c not in self.columns]
+        if unknown:
+            raise ValueError(f"존재하지 않는 컬럼입니다: {unknown}")
+        select = ['지점명', '일시'] + [c for c in columns if c not in ('지점명', '일시')]
+
+        tables = [_open(path).select(select) for path in self._partition_files(stations, start, end)]
+        if not tables:
+            return pd.DataFrame(columns=select)
+        table = pa.concat_tables(tables)
+        mask = None
+        if start is not None:
+            mask = pc.greater_equal(table['일시'], str(start))
+        if end is not None:
+            upper = pc.less(table['일시'], str(end) + '~')  # SQLite와 같은 접두어 포함 상한
+            mask = upper if mask is None else pc.and_(mask, upper)
+        if mask is not None:
+            table = table.filter(mask)
+        return _to_pandas(table)
+
+    def sunshine(self):
+        """sunshine_data 전체 (없으면 None)"""
+        path = os.path.join(self.root, f"{SUNSHINE_TABLE}.arrow")
+        if not self.manifest.get('sunshine') or not os.path.exists(path):
+            return None
+        return _to_pandas(_open(path))
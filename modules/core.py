@@ -0,0 +1,372 @@
+"""Streamlit 없이 쓰는 계산 계층 (배치 작업·워커 프로세스·CLI용)
+
+페이지는 db_loader의 캐시 어댑터를 거쳐 이 함수들을 호출하고, 배치 작업은 직접 호출합니다.
+모든 함수는 db_path를 받고 오류는 예외로 전달합니다. 조회는 프로세스 공용 읽기 전용 연결 풀(modules.db_pool)을
+빌려 쓰고, 인덱스·롤업·평년값 테이블 생성 같은 쓰기는 prepare()에서 프로세스당 한 번만 합니다.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+
+from modules.alert_rules import ALERT_RULES, evaluate_rules, rule_columns, validate_rules
+from modules.climatology import (Climatology, climatology_ready, ensure_climatology, evaluate_anomalies,
+                                 read_climate_observations)
+from modules.columnar import SUNSHINE_TABLE, ColumnarStore
+from modules.db_pool import enable_wal, read_connection
+from modules.downsample import line_figure
+from modules.ingest import get_data_version, get_partition_token
+from modules.pest_index import PesticideIndex
+from modules.pest_risk import ensure_pest_risk, pest_risk_current, risk_by_month, risk_by_pest
+from modules.pest_store import (ensure_pest_store, monthly_trend, pest_store_current, pesticides_for, source_signature,
+                                top_pests)
+from modules.rollup import ensure_rollups, query_rollup, rollups_ready
+from modules.schema import apply_schema
+from modules.stations import StationIndex, nearest_stations
+from modules.suitability import ANALYSIS_COLUMNS, FLAG_COLUMNS, SOURCE_COLUMNS, score_cube, score_frame, slice_cube
+from modules.weather_query import (DB_PATH, connect, ensure_indexes, get_latest_date, get_stations,
+                                   get_weather_columns, query_weather)
+
+CITRUS_PATH = os.path.join('data', '5.xlsx')
+COORDS_PATH = os.path.join('data', 'coords.xlsx')
+CITRUS_PROD_COLUMNS = ['노지온주(극조생)', '노지온주(조생)', '노지온주(보통)', '하우스감귤(조기출하)',
+                       '비가림(월동)감귤', '만감류(시설)', '만감류(노지)']
+
+# 기상 분석 페이지의 차트 (render_chart 인자: 키워드, y축 이름, 제목)
+CHART_SPECS = [
+    ('기온', '평균 기온 (°C)', '월별 평균 기온 추이'),
+    ('습도', '평균 습도 (%)', '월별 평균 습도 추이'),
+    ('강수량', '일강수량 (mm)', '월별 평균 강수량 추이'),
+    ('풍속', '평균 풍속 (m/s)', '월별 평균 풍속 추이'),
+]
+
+
+_prepared = {}
+_prepare_lock = threading.Lock()
+
+
+def prepare(db_path=DB_PATH):
+    """WAL 전환과 인덱스·롤업·평년값 테이블 생성 (프로세스·DB 파일당 한 번) → 쓰기 가능 여부
+
+    이후 조회는 읽기 전용 연결만 쓰므로 적재 중에도 잠금 대기가 없습니다.
+    성공과 읽기 전용 DB만 기억하고, 다른 연결이 잠그고 있어 실패하면 False를 반환한 뒤 다음 호출에서 다시 시도합니다.
+    """
+    key = (os.path.abspath(db_path), os.stat(db_path).st_ino)
+    with _prepare_lock:
+        if key in _prepared:
+            return _prepared[key]
+        if not os.access(db_path, os.W_OK):
+            _prepared[key] = False
+            return False
+        with closing(connect(db_path)) as conn:
+            try:
+                enable_wal(conn)
+                ensure_indexes(conn)
+                ensure_rollups(conn)
+                ensure_climatology(conn)
+            except sqlite3.OperationalError as exc:
+                if 'readonly' in str(exc).lower():
+                    _prepared[key] = False  # 읽기 전용 DB (디렉터리·파일 시스템 권한 등)
+                return False  # 'database is locked' 등 일시적 실패는 기억하지 않음
+        _prepared[key] = True
+        return True
+
+
+def read_only(db_path=DB_PATH):
+    """prepare()가 읽기 전용 DB로 판정했는지 (일시적 잠금 실패는 해당 없음)"""
+    return _prepared.get((os.path.abspath(db_path), os.stat(db_path).st_ino)) is False
+
+
+def _not_prepared(what, db_path):
+    if read_only(db_path):
+        return RuntimeError(f"{what} 테이블이 없습니다: 읽기 전용 DB({db_path})입니다. "
+                            f"쓰기 가능한 곳에서 python -m modules.cli rollup 으로 한 번 준비해 두세요.")
+    return RuntimeError(f"{what} 테이블을 아직 만들지 못했습니다: 다른 연결이 DB({db_path})를 잠그고 있습니다 "
+                        f"(database is locked). 잠시 후 다시 시도하세요.")
+
+
+def data_version(db_path=DB_PATH):
+    """데이터 버전 (DB가 없으면 0)"""
+    if not os.path.exists(db_path):
+        return 0
+    with read_connection(db_path) as conn:
+        return get_data_version(conn)
+
+
+def partition_token(stations=None, start=None, end=None, db_path=DB_PATH):
+    """조회 범위 파티션의 최신 버전 (DB가 없으면 0)"""
+    if not os.path.exists(db_path):
+        return 0
+    with read_connection(db_path) as conn:
+        return get_partition_token(conn, stations, start, end)
+
+
+def weather_columns(db_path=DB_PATH):
+    with read_connection(db_path) as conn:
+        return get_weather_columns(conn)
+
+
+def stations(db_path=DB_PATH):
+    with read_connection(db_path) as conn:
+        return get_stations(conn)
+
+
+def station_index(db_path=DB_PATH):
+    """DB에 관측값이 있는 지점의 공간 색인"""
+    return StationIndex.from_names(stations(db_path))
+
+
+def latest_date(db_path=DB_PATH):
+    with read_connection(db_path) as conn:
+        return get_latest_date(conn)
+
+
+def weather(stations=None, start=None, end=None, columns=None, agg=None, freq=None, by_station=True,
+            db_path=DB_PATH, float_dtype='float32'):
+    """asos_weather 조회 (스키마 dtype 적용, 집계 없는 조회는 최신 열 저장소가 있으면 그쪽에서 읽음)
+
+    값을 임계값과 비교하거나 점수를 매기는 호출은 float_dtype='float64'로 관측값 그대로 받습니다.
+    """
+    if agg is None:
+        store = ColumnarStore.open(db_path, data_version(db_path))
+        if store is not None:
+            return apply_schema(store.query_weather(stations, start, end, columns), float_dtype)
+    prepare(db_path)  # 읽기 전용 DB면 인덱스 없이 조회
+    with read_connection(db_path) as conn:
+        return apply_schema(query_weather(conn, stations, start, end, columns, agg, freq, by_station), float_dtype)
+
+
+def sunshine(db_path=DB_PATH):
+    """sunshine_data 전체 (열 저장소 우선, 테이블이 없으면 빈 DataFrame), 일시는 datetime"""
+    store = ColumnarStore.open(db_path, data_version(db_path))
+    df = store.sunshine() if store is not None else None
+    if df is None:
+        with read_connection(db_path) as conn:
+            try:
+                df = pd.read_sql(f"SELECT * FROM {SUNSHINE_TABLE}", conn)
+            except Exception:
+                df = pd.DataFrame()
+    if not df.empty:
+        df['일시'] = pd.to_datetime(df['일시'])
+    return df
+
+
+def rollup(level='month', stations=None, start_year=None, end_year=None, columns=None, db_path=DB_PATH,
+           float_dtype='float32'):
+    """지점×연×월 / 지점×연 사전 집계 조회 (스키마 dtype 적용)"""
+    prepare(db_path)
+    with read_connection(db_path) as conn:
+        if not rollups_ready(conn):
+            raise _not_prepared('롤업', db_path)
+        return apply_schema(query_rollup(conn, level, stations, start_year, end_year, columns), float_dtype)
+
+
+def climatology(period='월', db_path=DB_PATH):
+    """지점×기간('월' 또는 '연중일') 평년값 (읽기 전용 DB면 관측에서 바로 계산)"""
+    prepare(db_path)
+    with read_connection(db_path) as conn:
+        if not climatology_ready(conn):
+            if not read_only(db_path):
+                raise _not_prepared('평년값', db_path)
+            return Climatology.from_observations(read_climate_observations(conn), period)
+        return Climatology.from_db(conn, period)
+
+
+def normals(items=None, stations=None, period='월', db_path=DB_PATH):
+    """지점×기간×항목 평년 분위수 표 (표본수, 평년값, 표준편차, p10, p50, p90)"""
+    return climatology(period, db_path).normals(items, stations)
+
+
+def normal_band(normals_df, col_name):
+    """평년 분위수 표 → 월별 지점 평균 평년 범위 (index: 월, columns: p10, p50, p90)"""
+    rows = normals_df[normals_df['항목'] == col_name]
+    return rows.groupby('월')[['p10', 'p50', 'p90']].mean()
+
+
+def anomalies(date=None, columns=None, db_path=DB_PATH):
+    """관측일(기본: 최근)의 지점별 평년 대비 점수와 이상기후 목록 → (scored, anomalies)
+
+    일자까지 있는 관측일('YYYY-MM-DD')은 연중일 평년값, 월('YYYY-MM')은 월 평년값과 비교합니다.
+    """
+    date = date or latest_date(db_path)
+    observed = weather(start=date, end=date, columns=columns, db_path=db_path, float_dtype='float64')
+    scored = climatology('연중일' if len(str(date)) >= 10 else '월', db_path).score(observed)
+    return scored, evaluate_anomalies(scored)
+
+
+def alerts(rules=None, stations=None, start=None, end=None, db_path=DB_PATH):
+    """경보 규칙(기본 ALERT_RULES)을 조회 범위 전체 지점×기간에 한 번에 평가 → 경보가 켜진 행"""
+    rules = validate_rules(ALERT_RULES if rules is None else rules)
+    columns = [c for c in rule_columns(rules) if c in weather_columns(db_path)]
+    observed = weather(stations, start, end, columns, db_path=db_path, float_dtype='float64')
+    return evaluate_rules(observed, rules)
+
+
+def citrus_production(path=CITRUS_PATH):
+    """감귤 생산 엑셀 → 읍면동별 총재배량(톤) 포함 DataFrame"""
+    df = pd.read_excel(path).rename(columns={'행정구역(읍면동)': '읍면동'})
+    prod_cols = [c for c in CITRUS_PROD_COLUMNS if c in df.columns]
+    df['총재배량(톤)'] = df[prod_cols].sum(axis=1, numeric_only=True) if prod_cols else 0
+    df['읍면동'] = df['읍면동'].str.strip()
+    return df
+
+
+def region_coords(path=COORDS_PATH, db_path=DB_PATH):
+    """읍면동 좌표 엑셀 → 읍면동, 위도, 경도, 지점명(관측값이 있는 최근접 관측소), 관측소거리(km)"""
+    df = pd.read_excel(path).rename(columns={'행정구역(읍면동)': '읍면동'})
+    df['읍면동'] = df['읍면동'].str.strip()
+    return nearest_stations(df, station_index(db_path))
+
+
+def suitability_cube(start_year=2020, end_year=2024, regions=None, db_path=DB_PATH):
+    """연도×월×읍면동 적합도 큐브"""
+    regions = region_coords() if regions is None else regions
+    monthly = rollup('month', start_year=start_year, end_year=end_year, columns=SOURCE_COLUMNS, db_path=db_path)
+    monthly = monthly.rename(columns=dict(zip(SOURCE_COLUMNS, ANALYSIS_COLUMNS)))
+    return score_cube(monthly[['지점명', '연도', '월'] + ANALYSIS_COLUMNS], regions[['읍면동', '지점명']])
+
+
+def parcel_suitability(points, year, month, k=3, power=2.0, radius_km=50.0, db_path=DB_PATH):
+    """임의 좌표(필지 등, 위도·경도 컬럼)의 (연도, 월) 적합도
+
+    반경 radius_km 안의 가까운 관측소 k개 월 집계값을 역거리 가중으로 섞어 지점별 기상값을 만든 뒤
+    읍면동과 같은 기준으로 점수를 매깁니다. 기본 반경은 제주 안의 필지가 바다 건너 완도/고흥 값을
+    섞지 않도록 잡은 값입니다. 최근접 관측소와 거리도 함께 붙입니다.
+    """
+    monthly = rollup('month', start_year=year, end_year=year, columns=SOURCE_COLUMNS, db_path=db_path)
+    monthly = monthly[monthly['월'] == month].rename(columns=dict(zip(SOURCE_COLUMNS, ANALYSIS_COLUMNS)))
+    index = StationIndex.from_names(monthly['지점명'].astype(str).tolist())
+    values = monthly.set_index(monthly['지점명'].astype(str)).loc[index.names, ANALYSIS_COLUMNS]
+    lat, lon = points['위도'].to_numpy(dtype=float), points['경도'].to_numpy(dtype=float)
+
+    table = nearest_stations(points, index)
+    table[ANALYSIS_COLUMNS] = index.idw(lat, lon, values.to_numpy(dtype=float), k=k, power=power,
+                                         radius_km=radius_km)
+    return score_frame(table, month)
+
+
+def suitability_table(cube, regions, citrus, year, month, scorer=None):
+    """큐브의 (연도, 월) 단면 + 좌표·해당 연도 총재배량 → 지도/요약용 DataFrame
+
+    scorer(CriteriaScorer)를 주면 조정된 기준으로 매긴 단면을 씁니다.
+    """
+    base = regions.merge(citrus.loc[citrus['연도'] == year, ['읍면동', '총재배량(톤)']], on='읍면동', how='left')
+    if month is None:
+        table = base.copy()
+        for col in ANALYSIS_COLUMNS:
+            table[col] = float('nan')
+        for col in FLAG_COLUMNS:
+            table[col] = 0
+        table['적합도점수'] = 0
+        table['결과'] = '정보 없음'
+        return table
+    scored = slice_cube(cube, year, month) if scorer is None else scorer.slice(year, month)
+    return base.merge(scored.drop(columns=['지점명', '연도', '월']), on='읍면동', how='left')
+
+
+def monthly_mean(df_monthly, col_name):
+    """지점×연×월 롤업 → (연, 월) 지점 평균, 월은 해당 월 1일 날짜"""
+    monthly_avg = df_monthly.groupby(['연도', '월'], as_index=False)[col_name].mean()
+    monthly_avg['월'] = pd.to_datetime(dict(year=monthly_avg['연도'], month=monthly_avg['월'], day=1))
+    return monthly_avg
+
+
+def metric_figure(monthly_avg, col_name, y_label, title, band=None):
+    """월별 평균 추이 선 그래프 (점이 많으면 다운샘플링·WebGL)
+
+    band(normal_band 결과)를 주면 같은 달 평년 범위(p10~p90)와 중앙값을 선 아래에 겹쳐 그립니다.
+    """
+    fig = line_figure(monthly_avg, '월', col_name, markers=True, title=title, labels={col_name: y_label})
+    fig.update_layout(yaxis_range=[0, None], xaxis_title='날짜')
+    if band is not None and not band.empty:
+        x = monthly_avg['월']
+        ref = band.reindex(x.dt.month.to_numpy())
+        fig.add_scatter(x=x, y=ref['p90'], mode='lines', line_width=0, hoverinfo='skip', showlegend=False)
+        fig.add_scatter(x=x, y=ref['p10'], mode='lines', line_width=0, fill='tonexty',
+                        fillcolor='rgba(128, 128, 128, 0.2)', name='평년 범위 (10~90%)')
+        fig.add_scatter(x=x, y=ref['p50'], mode='lines', line=dict(color='gray', dash='dot', width=1),
+                        name='평년 중앙값')
+        fig.data = fig.data[1:] + fig.data[:1]  # 관측 선을 맨 위에
+    return fig
+
+
+def pest_top_figure(top):
+    """병해충 TOP N 막대 그래프"""
+    import plotly.express as px  # 차트가 필요할 때만 (CLI 시작 시간 단축)
+    return px.bar(top, x='병해충명', y='발생건수', color='병해충명',
+                  labels={'발생건수': '발생 건수'}, title="병해충 TOP 5")
+
+
+def pest_trend_figure(trend):
+    """월별 병해충 공고 추이 선 그래프 (추이가 없으면 None)"""
+    import plotly.express as px
+    if trend.empty:
+        return None
+    return px.line(trend, x='월', y='공고건수', markers=True,
+                   title="월별 병해충 공고 건수", labels={'공고건수': '공고 건수'})
+
+
+def pest_risk_figure(by_month):
+    """월별 기상 기반 위험도 지수 막대 그래프 (0~100)"""
+    import plotly.express as px
+    fig = px.bar(by_month, x='월', y='위험도지수', color='위험도지수', range_color=(0, 100),
+                 color_continuous_scale='YlOrRd', hover_data=['공고수', '최고위험도지수'],
+                 title="월별 기상 기반 위험도 지수", labels={'위험도지수': '위험도 지수'})
+    return fig.update_yaxes(range=[0, 100]).update_xaxes(dtick=1)
+
+
+def pest_signature(db_path=DB_PATH, data_dir='data'):
+    """병해충 원본 CSV 서명 (필요 시 pest_bulletin 재적재, 공고·관측이 바뀐 만큼 위험도 지수 갱신)
+
+    확인은 파일 정보와 공용 읽기 연결로 하고, 서명이나 데이터 버전이 달라졌을 때만 쓰기 연결을 엽니다.
+    """
+    signature = source_signature(data_dir)
+    with read_connection(db_path) as conn:
+        if pest_store_current(conn, signature) and pest_risk_current(conn, signature, get_data_version(conn)):
+            return signature
+    with closing(connect(db_path)) as conn:
+        signature = ensure_pest_store(conn, data_dir)
+        ensure_pest_risk(conn, signature, get_data_version(conn))
+        return signature
+
+
+def pest_report(crop, month=None, year=None, top_n=5, db_path=DB_PATH):
+    """작물(·월·연도) 병해충 TOP N, 월별 공고 추이, 방제약 → (top, trend, pesticides)"""
+    pest_signature(db_path)  # 원본 CSV가 바뀌었을 때만 다시 적재
+    with read_connection(db_path) as conn:
+        top = top_pests(conn, crop, month, year, top_n)
+        trend = monthly_trend(conn, crop, year)
+        pesticides = pesticides_for(conn, crop, tuple(top['병해충명']), month, year)
+    return top, trend, pesticides
+
+
+def pest_risk(crop, month=None, stations=None, db_path=DB_PATH):
+    """작물 기상 기반 위험도 지수 → (월별 추이, 병해충별 지수) — 미리 계산된 pest_risk 테이블 조회"""
+    pest_signature(db_path)
+    with read_connection(db_path) as conn:
+        return risk_by_month(conn, crop, stations), risk_by_pest(conn, crop, month, stations)
+
+
+def pesticide_index(db_path=DB_PATH):
+    """방제약 ↔ 병해충 역색인 (공고 CSV가 바뀌었으면 다시 적재한 뒤 생성)"""
+    pest_signature(db_path)
+    with read_connection(db_path) as conn:
+        return PesticideIndex.from_conn(conn)
+
+
+def pesticide_search(query, table='suggest', limit=10, db_path=DB_PATH):
+    """방제약·병해충 검색
+
+    suggest: 자동완성 후보 / lookup: 약제면 병해충별, 병해충이면 약제별 권고 건수 / bulletins: 약제를 권고한 공고
+    """
+    index = pesticide_index(db_path)
+    if table == 'suggest':
+        return pd.DataFrame(index.suggest(query, limit), columns=['이름', '종류'])
+    if table == 'bulletins':
+        return index.bulletins(query)
+    entry = index.pesticide(query)
+    if entry is not None:
+        return pd.DataFrame(entry['병해충'], columns=['병해충', '건수'])
+    return pd.DataFrame(index.pesticides_for(query), columns=['방제약', '건수'])
@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Whale/4.31.304.16 Safari/537.36"
+}
+
+
+def make_session(pool_size=10):
+    """연결 풀을 재사용하는 requests 세션"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+class ConditionalFetcher:
+    """URL별 캐시 + ETag/Last-Modified 재검증 + stale-while-revalidate 병렬 수집기
+
+    - ttl 이내: 캐시를 그대로 반환
+    - ttl ~ ttl+stale_ttl: 이전 값을 즉시 반환하고 백그라운드에서 재검증
+    - 그 이후(또는 캐시 없음): 조건부 GET으로 동기 수집
+    - 캐시 없이 실패한 URL은 error_ttl 동안 재시도하지 않고 오류를 반환
+    parse: 응답 본문 → 저장할 값 (본문이 바뀐 경우에만 호출, 304면 재사용)
+    """
+
+    def __init__(self, session=None, parse=None, ttl=3600, stale_ttl=86400, error_ttl=300,
+                 timeout=10, max_workers=8):
+        self.session = session or make_session(max_workers)
+        self.parse = parse or (lambda text, url: text)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self._entries = {}
+        self._errors = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _request(self, url):
+        """조건부 GET 후 캐시 항목 갱신 (실패 시 예외)"""
+        with self._lock:
+            entry = self._entries.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        res = self.session.get(url, headers=headers, timeout=self.timeout)
+        if res.status_code == 304 and entry:
+            new_entry = dict(entry, fetched_at=time.monotonic())
+        else:
+            res.raise_for_status()
+            new_entry = {
+                'value': self.parse(res.text, url),
+                'etag': res.headers.get('ETag'),
+                'last_modified': res.headers.get('Last-Modified'),
+                'fetched_at': time.monotonic(),
+            }
+        with self._lock:
+            self._entries[url] = new_entry
+            self._errors.pop(url, None)
+        return new_entry
+
+    def _revalidate(self, url):
+        try:
+            self._request(url)
+        except Exception:
+            pass  # 재검증 실패 시 기존 캐시 유지
+        finally:
+            with self._lock:
+                self._refreshing.discard(url)
+
+    def fetch(self, url):
+        """URL 하나 조회 → {'url', 'value', 'error', 'stale'}"""
+        with self._lock:
+            entry = self._entries.get(url)
+            failure = self._errors.get(url)
+        now = time.monotonic()
+        age = now - entry['fetched_at'] if entry else None
+
+        if entry and age < self.ttl:
+            return {'url': url, 'value': entry['value'], 'error': None, 'stale': False}
+        if entry and age < self.ttl + self.stale_ttl:
+            with self._lock:
+                start = url not in self._refreshing
+                self._refreshing.add(url)
+            if start:
+                self._executor.submit(self._revalidate, url)
+            return {'url': url, 'value': entry['value'], 'error': None, 'stale': True}
+
+        if not entry and failure and now - failure[1] < self.error_ttl:
+            return {'url': url, 'value': None, 'error': failure[0], 'stale': False}
+
+        try:
+            entry = self._request(url)
+            return {'url': url, 'value': entry['value'], 'error': None, 'stale': False}
+        except Exception as e:
+            if entry:  # 오래된 캐시라도 있으면 반환
+                return {'url': url, 'value': entry['value'], 'error': e, 'stale': True}
+            with self._lock:
+                self._errors[url] = (e, time.monotonic())
+            return {'url': url, 'value': None, 'error': e, 'stale': False}
+
+    def fetch_all(self, urls):
+        """여러 URL을 병렬로 조회 (입력 순서대로 결과 반환)"""
+        return list(self._executor.map(self.fetch, urls))
+
+    def invalidate(self, url=None):
+        """URL(없으면 전체) 캐시 삭제"""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                self._errors.clear()
+            else:
+                self._entries.pop(url, None)
+                self._errors.pop(url, None)
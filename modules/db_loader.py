@@ -1,24 +1,133 @@
 import os
 import pandas as pd
-import sqlite3
 import streamlit as st  # ✅ 이거 빠져서 오류난 거에요!
+from modules import artifacts, core
+from modules.db_pool import read_connection
+from modules.weather_query import DB_PATH
+from modules.metrics import metered_cache
+from modules.registry import shared_cache
+
+# Streamlit 캐시 어댑터: 계산은 modules.core, 여기서는 캐시 키와 화면 오류 표시만 담당
+# 큰 DataFrame/객체는 st.cache_data(호출마다 역직렬화한 사본) 대신 공유 등록소(modules.registry)에
+# 데이터 버전별로 한 벌만 두고 복사 없이 빌려 줌
 
-@st.cache_data
 def load_db_table(table_name):
     db_path = os.path.join('data', 'asos_weather.db')
     if not os.path.exists(db_path):
         st.error(f"DB 파일이 존재하지 않습니다: {db_path}")
         return pd.DataFrame()
+    return _load_db_table(table_name, load_data_version())
+
+@metered_cache('load_db_table', shared_cache('version'))
+def _load_db_table(table_name, version):
+    with read_connection() as conn:
+        return pd.read_sql(f"SELECT * FROM {table_name}", conn)
+
+def load_data_version():
+    """현재 데이터 버전 (적재 시 증가, 전체 범위 캐시 키)"""
+    return core.data_version()
+
+def load_partition_token(stations=None, start=None, end=None):
+    """조회 범위에 해당하는 파티션의 최신 버전 (범위 밖 적재는 캐시를 무효화하지 않음)"""
+    return core.partition_token(stations, start, end)
+
+def load_weather(stations=None, start=None, end=None, columns=None, agg=None, freq=None, by_station=True):
+    """asos_weather 조회 (지점/기간/컬럼/집계를 DB에서 처리)"""
+    token = load_partition_token(stations, start, end)
+    return _load_weather(stations, start, end, columns, agg, freq, by_station, token)
+
+@metered_cache('load_weather', shared_cache('token'))
+def _load_weather(stations, start, end, columns, agg, freq, by_station, token):
+    # token: 조회 범위 파티션 버전 — 해당 범위에 적재가 있을 때만 캐시 키가 바뀜
+    if not os.path.exists(DB_PATH):
+        st.error(f"DB 파일이 존재하지 않습니다: {DB_PATH}")
+        return pd.DataFrame()
+    return core.weather(stations, start, end, columns, agg, freq, by_station)
+
+def load_rollup(level='month', stations=None, start_year=None, end_year=None, columns=None):
+    """지점×연×월(level='month') 또는 지점×연(level='year') 사전 집계 조회"""
+    token = load_partition_token(stations,
+                                 None if start_year is None else str(start_year),
+                                 None if end_year is None else str(end_year))
+    return _load_rollup(level, stations, start_year, end_year, columns, token)
+
+@metered_cache('load_rollup', shared_cache('token'))
+def _load_rollup(level, stations, start_year, end_year, columns, token):
+    if not os.path.exists(DB_PATH):
+        st.error(f"DB 파일이 존재하지 않습니다: {DB_PATH}")
+        return pd.DataFrame()
+    return core.rollup(level, stations, start_year, end_year, columns)  # 최초 1회 원본에서 전체 집계
+
+@metered_cache('load_weather_columns', st.cache_data)
+def load_weather_columns():
+    """asos_weather 컬럼명 목록"""
+    if not os.path.exists(DB_PATH):
+        return []
+    return core.weather_columns()
+
+def load_latest_date():
+    """가장 최근 관측 '일시'"""
+    return _load_latest_date(load_data_version())
 
-    conn = sqlite3.connect(db_path)
-    df = pd.read_sql(f"SELECT * FROM {table_name}", conn)
-    conn.close()
-    return df
+@metered_cache('load_latest_date', st.cache_data)
+def _load_latest_date(version):
+    return core.latest_date()
+
+def load_climatology(period='월'):
+    """지점×기간('월'/'연중일') 평년값 (데이터 버전이 바뀔 때만 다시 읽음)"""
+    return _load_climatology(load_data_version(), period)
+
+@metered_cache('load_climatology', shared_cache('version'))
+def _load_climatology(version, period):
+    return core.climatology(period)  # 최초 1회 전체 관측으로 집계, 이후 적재 시 증분 갱신
+
+def load_normals(period='월'):
+    """지점×기간×항목 평년 분위수 표 (p10/p50/p90)"""
+    return _load_normals(load_data_version(), period)
+
+@metered_cache('load_normals', shared_cache('version'))
+def _load_normals(version, period):
+    return load_climatology(period).normals()
+
+def load_alert_events():
+    """기본 경보 규칙의 전체 이력 (데이터 버전이 바뀔 때만 다시 평가)"""
+    return _load_alert_events(load_data_version())
+
+@metered_cache('load_alert_events', shared_cache('version'))
+def _load_alert_events(version):
+    return core.alerts()
+
+def load_report_bundle():
+    """현재 데이터 키의 사전 계산 번들 (python -m modules.cli report, 없으면 None)"""
+    path = os.path.join(artifacts.ARTIFACT_DIR, artifacts.bundle_key())
+    if not os.path.exists(os.path.join(path, artifacts.MANIFEST)):
+        return None
+    return _load_report_bundle(path)
+
+@metered_cache('load_report_bundle', st.cache_resource)
+def _load_report_bundle(path):
+    return artifacts.ReportBundle(path)
+
+# 번들 파일은 키별로 바뀌지 않으므로 (키, 선택값)으로 캐시
+@metered_cache('load_suitability_artifact', st.cache_data)
+def load_suitability_artifact(key, year, month, _bundle):
+    return _bundle.suitability(year, month)
+
+@metered_cache('load_chart_artifact', st.cache_data)
+def load_chart_artifact(key, keyword, y_label, title, _bundle):
+    return _bundle.chart(keyword, y_label, title)
+
+@metered_cache('load_pest_artifact', st.cache_data)
+def load_pest_artifact(key, crop, month, _bundle):
+    return _bundle.pests(crop, month)
 
-@st.cache_data
 def load_csv(file_name):
     csv_path = os.path.join('data', file_name)
     if not os.path.exists(csv_path):
         st.error(f"CSV 파일이 존재하지 않습니다: {csv_path}")
         return pd.DataFrame()
+    return _load_csv(csv_path, os.stat(csv_path).st_mtime_ns)
+
+@metered_cache('load_csv', shared_cache('mtime'))
+def _load_csv(csv_path, mtime):
     return pd.read_csv(csv_path)
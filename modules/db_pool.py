@@ -0,0 +1,178 @@
+"""프로세스 공용 읽기 전용 SQLite 연결 풀
+
+Streamlit은 세션마다 다른 스레드에서 스크립트를 실행하므로, 조회마다 연결을 새로 열면 파일 열기·스키마 읽기·
+PRAGMA 설정 비용을 매번 치릅니다. 여기서는 DB 파일별로 읽기 전용(mode=ro) 연결을 최대 POOL_SIZE개까지
+필요할 때 열어 두고 스레드 간에 빌려 씁니다. 연결마다 mmap·페이지 캐시와 준비된 문장(cached_statements)이
+유지되므로 같은 조회를 반복할 때 SQL 파싱도 다시 하지 않습니다.
+
+DB를 WAL 모드로 바꿔 두면(enable_wal, 쓰기 연결에서 한 번) 적재 중에도 읽기 연결은 잠금 대기 없이
+마지막으로 커밋된 내용을 읽습니다. 쓰기(적재·테이블 생성)는 기존처럼 weather_query.connect로 엽니다.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from modules.weather_query import DB_PATH
+
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 4))
+POOL_TIMEOUT = 30.0
+MMAP_SIZE = 256 * 2**20
+CACHE_KIB = 16 * 1024
+CACHED_STATEMENTS = 256
+BUSY_TIMEOUT_MS = 5000
+
+
+def enable_wal(conn):
+    """DB를 WAL 모드로 전환 (파일에 기록되므로 한 번이면 됨, 읽기 전용 DB면 그대로) → 현재 저널 모드"""
+    try:
+        return conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    except sqlite3.OperationalError:
+        return conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+
+def _open_read_only(path):
+    uri = f"file:{quote(os.path.abspath(path))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_KIB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    return conn
+
+
+class PoolClosed(Exception):
+    """연결을 기다리는 동안 풀이 닫힘 — read_connection이 새 풀에서 다시 빌림"""
+
+
+_CLOSED = object()  # 닫힌 풀의 대기열에 넣어 기다리는 스레드를 깨우는 표식
+
+
+class ConnectionPool:
+    """한 DB 파일의 읽기 전용 연결 풀 (스레드 안전, 연결은 필요할 때 size개까지 생성)"""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()  # 최근에 쓴(캐시가 따뜻한) 연결부터 재사용
+        self._opened = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """연결 빌리기 (release로 반환) — 모두 사용 중이면 POOL_TIMEOUT초까지 대기 후 TimeoutError,
+        기다리는 동안 풀이 닫히면(DB 파일 교체) PoolClosed"""
+        if self._closed:
+            raise PoolClosed(self.path)
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        return _open_read_only(self.path)
+                    except Exception:
+                        self._opened -= 1
+                        raise
+            try:
+                conn = self._idle.get(timeout=POOL_TIMEOUT)
+            except queue.Empty:
+                raise TimeoutError(f"읽기 연결 {self.size}개가 모두 사용 중이라 {POOL_TIMEOUT:.0f}초 동안 기다렸지만 "
+                                   f"반환되지 않았습니다 (DB_POOL_SIZE로 늘릴 수 있음): {self.path}") from None
+        if conn is _CLOSED:
+            self._idle.put(_CLOSED)  # 같이 기다리던 다른 스레드도 깨움
+            raise PoolClosed(self.path)
+        return conn
+
+    def release(self, conn):
+        """빌린 연결 반환 (열린 읽기 트랜잭션은 정리, 닫힌 풀이면 연결을 닫음)"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._opened -= 1
+        if closed:
+            conn.close()  # 닫힌 풀(교체된 DB 파일)의 연결은 반환 대신 닫아 파일 핸들·mmap 해제
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """연결 빌리기 — with 블록이 끝나면 풀로 반환"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """풀 닫기: 쉬고 있는 연결은 바로 닫고, 빌려 간 연결은 반환될 때 닫음 (기다리는 스레드는 PoolClosed)"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if conn is _CLOSED:
+                continue
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+        self._idle.put(_CLOSED)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=DB_PATH):
+    """DB 파일별 프로세스 공용 풀 (없으면 FileNotFoundError)
+
+    DB 파일이 교체되면(inode 변경) 이전 풀을 닫고 새로 만듭니다. fork로 만든 워커 프로세스는
+    부모의 연결을 쓰지 않도록 자기 풀을 새로 엽니다.
+    """
+    stat = os.stat(db_path) if os.path.exists(db_path) else None
+    if stat is None:
+        raise FileNotFoundError(f"DB 파일이 존재하지 않습니다: {db_path}")
+    key = (os.getpid(), os.path.abspath(db_path))
+    with _pools_lock:
+        entry = _pools.get(key)
+        if entry is None or entry[0] != stat.st_ino:
+            if entry is not None:
+                entry[1].close()
+            entry = _pools[key] = (stat.st_ino, ConnectionPool(db_path))
+        return entry[1]
+
+
+@contextmanager
+def read_connection(db_path=DB_PATH):
+    """읽기 전용 연결 (with 블록 안에서만 사용, 스레드 간 공유 금지)
+
+    기다리던 풀이 DB 파일 교체로 닫히면 get_pool로 새 풀을 찾아 다시 빌립니다.
+    """
+    while True:
+        pool = get_pool(db_path)
+        try:
+            conn = pool.acquire()
+            break
+        except PoolClosed:
+            continue
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def close_pools():
+    """모든 풀의 연결 닫기 (테스트·DB 교체용)"""
+    with _pools_lock:
+        for (pid, _), (_, pool) in _pools.items():
+            if pid == os.getpid():
+                pool.close()
+        _pools.clear()
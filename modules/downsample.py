@@ -0,0 +1,116 @@
+"""긴 시계열 차트용 다운샘플링 (LTTB / 구간 최소·최대)
+
+화면 폭보다 훨씬 많은 점을 보내면 브라우저 전송량과 plotly 생성 시간만 늘고 보이는 모양은 같으므로,
+계열마다 픽셀 예산(MAX_POINTS)만큼만 남긴 뒤 그래프를 만듭니다. 두 방법 모두 원본 행 일부를 고르므로
+극값(최고/최저)은 근사값이 아니라 실제 관측값 그대로 남습니다.
+
+- minmax: 구간마다 최소·최대 행 — 모든 구간의 극값 보장, 완전 벡터화 (기본)
+- lttb: 구간 최소·최대로 후보를 먼저 줄인 뒤 Largest-Triangle-Three-Buckets — 모양 보존이 더 좋지만
+  구간마다 순차 계산이라 계열이 많으면 느림
+어느 방법이든 계열 전체의 최고/최저 행은 항상 남깁니다.
+"""
+import numpy as np
+import pandas as pd
+
+from modules.metrics import trace
+
+# 계열당 최대 점 수 (차트 폭 약 1000px × 2)
+MAX_POINTS = 2000
+# 그래프 전체 점 수가 이보다 많으면 WebGL(scattergl)로 그림
+WEBGL_THRESHOLD = 5000
+# LTTB 전에 최소·최대로 남길 후보 배수 (출력 점 수 × PRESELECT)
+PRESELECT = 4
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """LTTB로 고른 위치 배열 (처음·마지막 점 포함, 오름차순)"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    # 처음/마지막 점을 뺀 n-2개를 n_out-2개 구간으로 나눔
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        # 다음 구간 평균점 (마지막 구간은 마지막 점)
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], max(edges[i + 2], edges[i + 1] + 1))
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        # 이전 선택점·후보·다음 평균점이 이루는 삼각형 넓이가 가장 큰 후보
+        area = np.abs((x[prev] - cx) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (cy - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """같은 크기 구간마다 최소·최대 위치 (n_out//2 구간, 오름차순·중복 제거)"""
+    n = len(y)
+    buckets = max(1, n_out // 2)
+    if n <= n_out:
+        return np.arange(n)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(buckets, size)
+    valid = ~np.isnan(grid).all(axis=1)  # 마지막 구간은 일부만 채워질 수 있음
+    base = np.arange(buckets)[valid] * size
+    lo = base + np.nanargmin(grid[valid], axis=1)
+    hi = base + np.nanargmax(grid[valid], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lo, hi]))
+
+
+def minmax_lttb_indices(x, y, n_out, preselect=PRESELECT):
+    """구간 최소·최대로 n_out × preselect개 후보를 고른 뒤 LTTB (긴 계열에서 LTTB 반복 횟수·비용 감소)"""
+    candidates = minmax_indices(y, n_out * preselect)
+    return candidates[lttb_indices(np.asarray(x)[candidates], np.asarray(y)[candidates], n_out)]
+
+
+METHODS = {'lttb': lambda x, y, n: minmax_lttb_indices(x, y, n), 'minmax': lambda x, y, n: minmax_indices(y, n)}
+
+
+@trace('downsample')
+def downsample(df, x, y, max_points=MAX_POINTS, method='minmax', by=None):
+    """계열(by 컬럼 값)마다 max_points개 이하로 줄인 DataFrame (원본 행 일부, 계열 안에서 x 순서)
+
+    줄일 필요가 없으면 원본을 그대로 반환합니다. 줄일 때는 선으로 이어지지 않는 y 결측 행을 뺍니다.
+    """
+    groups = list(df.groupby(by, observed=True, sort=False).indices.values()) if by else [np.arange(len(df))]
+    if max(map(len, groups), default=0) <= max_points:
+        return df
+    pick = METHODS[method]
+    xs, ys = df[x].to_numpy(), df[y].to_numpy(dtype=float)
+    keep = []
+    for positions in groups:
+        positions = positions[~np.isnan(ys[positions])]
+        if len(positions) and not pd.Index(xs[positions]).is_monotonic_increasing:
+            positions = positions[np.argsort(xs[positions], kind='stable')]
+        values = ys[positions]
+        if len(positions) > max_points:
+            idx = pick(xs[positions], values, max_points)
+            idx = np.union1d(idx, [np.argmin(values), np.argmax(values)])  # 계열 최고/최저 보장
+            positions = positions[idx]
+        keep.append(positions)
+    return df.iloc[np.concatenate(keep)]
+
+
+def line_figure(df, x, y, color=None, max_points=MAX_POINTS, method='minmax', webgl_threshold=WEBGL_THRESHOLD,
+                **px_kwargs):
+    """다운샘플링 후 px.line 그래프 (점이 많으면 WebGL)"""
+    import plotly.express as px  # modules.core를 불러올 때 plotly까지 읽지 않도록
+    df = downsample(df, x, y, max_points, method, by=color)
+    with trace('plotly_build'):
+        render_mode = 'webgl' if len(df) > webgl_threshold else 'auto'
+        return px.line(df, x=x, y=y, color=color, render_mode=render_mode, **px_kwargs)
@@ -0,0 +1,157 @@
+import argparse
+import pandas as pd
+from modules import columnar
+from modules.climatology import climate_columns, ensure_climatology, to_long, update_climatology
+from modules.db_pool import enable_wal
+from modules.pest_risk import refresh_pest_risk
+from modules.rollup import ensure_rollups, refresh_rollups
+from modules.weather_query import (DB_PATH, WEATHER_TABLE, connect, date_range_clause,
+                                   get_weather_columns, quote_ident)
+
+# 기존 DB의 '일시' 형식 (월자료: 'YYYY-MM')
+DATE_FORMAT = '%Y-%m'
+
+
+def ensure_ingest_tables(conn):
+    """워터마크/데이터 버전/파티션 버전 테이블과 (지점명, 일시) 유니크 인덱스 생성"""
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_asos_weather_station_date ON {WEATHER_TABLE} (지점명, 일시)")
+    conn.execute("CREATE TABLE IF NOT EXISTS ingest_watermark (지점명 TEXT PRIMARY KEY, 최종일시 TEXT NOT NULL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS data_version (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)")
+    conn.execute("""CREATE TABLE IF NOT EXISTS partition_version (
+        지점명 TEXT NOT NULL, 연월 TEXT NOT NULL, version INTEGER NOT NULL,
+        PRIMARY KEY (지점명, 연월))""")
+    conn.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+    # 기존 데이터로 워터마크 초기화
+    conn.execute(f"""INSERT OR IGNORE INTO ingest_watermark (지점명, 최종일시)
+        SELECT 지점명, MAX(일시) FROM {WEATHER_TABLE} GROUP BY 지점명""")
+    conn.commit()
+
+
+def get_watermarks(conn):
+    """지점별 최종 적재 '일시' {지점명: 일시}"""
+    try:
+        return dict(conn.execute("SELECT 지점명, 최종일시 FROM ingest_watermark").fetchall())
+    except Exception:
+        return {}
+
+
+def get_data_version(conn):
+    """전체 데이터 버전 (적재할 때마다 1 증가, 적재 이력 없으면 0)"""
+    try:
+        row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+    except Exception:
+        return 0
+    return row[0] if row else 0
+
+
+def get_partition_token(conn, stations=None, start=None, end=None):
+    """조회 범위(지점/기간)에 해당하는 파티션의 최신 버전 (캐시 키로 사용)"""
+    where, params = date_range_clause('연월', start[:7] if start else start, end)
+    if stations is not None:
+        stations = [stations] if isinstance(stations, str) else list(stations)
+        where.append(f"지점명 IN ({', '.join('?' * len(stations))})")
+        params.extend(stations)
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+    try:
+        row = conn.execute(f"SELECT MAX(version) FROM partition_version{where_sql}", params).fetchone()
+    except Exception:
+        return 0
+    return row[0] or 0
+
+
+def ingest_asos(conn, df, date_format=DATE_FORMAT):
+    """신규 관측치를 워터마크 기준으로 증분 적재(upsert)
+
+    지점별 워터마크보다 이전 '일시'는 이미 적재된 것으로 보고 건너뛰며,
+    워터마크와 같은 '일시'(진행 중인 기간의 수정값)는 갱신합니다.
+    적재된 지점/월 파티션의 월·연 롤업과 평년값(덮어쓴 이전 값은 빼고 새 값은 더함), 그 기간 이후에 발표된
+    병해충 공고의 위험도 지수도 같은 트랜잭션에서 갱신합니다.
+    열 저장소(modules.columnar)가 최신이면 해당 연도×지점 파일도 다시 씁니다.
+    반환값: {'version', 'rows', 'partitions': [(지점명, 연월), ...]}
+    """
+    ensure_ingest_tables(conn)
+    ensure_rollups(conn)
+    ensure_climatology(conn)
+    if df.empty:
+        return {'version': get_data_version(conn), 'rows': 0, 'partitions': []}
+
+    available = get_weather_columns(conn)
+    unknown = [c for c in df.columns if c not in available]
+    if unknown:
+        raise ValueError(f"asos_weather에 없는 컬럼입니다: {unknown}")
+    if '지점명' not in df.columns or '일시' not in df.columns:
+        raise ValueError("'지점명'과 '일시' 컬럼이 필요합니다.")
+
+    df = df.copy()
+    if pd.api.types.is_datetime64_any_dtype(df['일시']):
+        df['일시'] = df['일시'].dt.strftime(date_format)
+    df['일시'] = df['일시'].astype(str)
+
+    watermarks = pd.Series(get_watermarks(conn), dtype=object)
+    mark = df['지점명'].map(watermarks)
+    df = df[mark.isna() | (df['일시'] >= mark.fillna(''))]
+    df = df.drop_duplicates(subset=['지점명', '일시'], keep='last')
+    if df.empty:
+        return {'version': get_data_version(conn), 'rows': 0, 'partitions': []}
+
+    cols = list(df.columns)
+    updates = [c for c in cols if c not in ('지점명', '일시')]
+    sql = (f"INSERT INTO {WEATHER_TABLE} ({', '.join(quote_ident(c) for c in cols)}) "
+           f"VALUES ({', '.join('?' * len(cols))})")
+    if updates:
+        sql += (" ON CONFLICT(지점명, 일시) DO UPDATE SET "
+                + ', '.join(f"{quote_ident(c)} = excluded.{quote_ident(c)}" for c in updates))
+    else:
+        sql += " ON CONFLICT(지점명, 일시) DO NOTHING"
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+    partitions = sorted(set(zip(df['지점명'], df['일시'].str[:7])))
+    latest = df.groupby('지점명')['일시'].max()
+
+    # 덮어쓸 기존 관측 (워터마크와 같은 '일시'만 해당) → 평년값에서 제외
+    climate_cols = [c for c in climate_columns(conn) if c in df.columns]
+    revised = df[df['일시'] == df['지점명'].map(watermarks)]
+    keys = list(revised[['지점명', '일시']].itertuples(index=False, name=None))
+    previous = pd.read_sql(
+        f"SELECT 지점명, 일시, {', '.join(quote_ident(c) for c in climate_cols)} FROM {WEATHER_TABLE} "
+        f"WHERE (지점명, 일시) IN (VALUES {', '.join(['(?, ?)'] * len(keys))})",
+        conn, params=[v for key in keys for v in key]) if climate_cols and keys else None
+
+    with conn:
+        conn.executemany(sql, rows)
+        refresh_rollups(conn, partitions)
+        if climate_cols:
+            update_climatology(conn, to_long(df, climate_cols),
+                               None if previous is None else to_long(previous, climate_cols))
+        conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+        version = get_data_version(conn)
+        conn.executemany("""INSERT INTO partition_version (지점명, 연월, version) VALUES (?, ?, ?)
+            ON CONFLICT(지점명, 연월) DO UPDATE SET version = excluded.version""",
+                         [(station, month, version) for station, month in partitions])
+        conn.executemany("""INSERT INTO ingest_watermark (지점명, 최종일시) VALUES (?, ?)
+            ON CONFLICT(지점명) DO UPDATE SET 최종일시 = MAX(최종일시, excluded.최종일시)""",
+                         list(latest.items()))
+        refresh_pest_risk(conn, partitions, version)
+    columnar.update_store(conn, partitions, version - 1)  # 열 저장소가 있으면 적재된 파티션만 다시 씀
+    return {'version': version, 'rows': len(df), 'partitions': partitions}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ASOS 관측 CSV 증분 적재")
+    parser.add_argument('csv', help="asos_weather 컬럼 구성의 CSV 파일")
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--date-format', default=DATE_FORMAT)
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.csv, dtype={'일시': str})
+    conn = connect(args.db)
+    try:
+        enable_wal(conn)  # 적재 중에도 페이지의 읽기 연결이 기다리지 않도록
+        result = ingest_asos(conn, df, args.date_format)
+    finally:
+        conn.close()
+    print(f"적재 {result['rows']}행, 데이터 버전 {result['version']}, 파티션 {len(result['partitions'])}개")
+
+
+if __name__ == '__main__':
+    main()
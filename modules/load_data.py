@@ -1,19 +1,23 @@
 import pandas as pd
-import sqlite3
-import streamlit as st  # 🔥 이 부분 추가!!
+from modules import core
+from modules.db_loader import load_data_version, load_weather
+from modules.metrics import metered_cache
+from modules.registry import shared_cache
 
-@st.cache_data
-def load_data():
-    conn = sqlite3.connect('data/asos_weather.db')
-    df_weather = pd.read_sql("SELECT * FROM asos_weather", conn)
-    try:
-        df_sunshine = pd.read_sql("SELECT * FROM sunshine_data", conn)
-    except Exception:
-        df_sunshine = pd.DataFrame()
-    conn.close()
+def load_data(stations=None, start=None, end=None, columns=None):
+    """기상/일조 데이터 로딩 (asos_weather는 필요한 지점·기간·컬럼만 조회)"""
+    # load_weather는 조회 범위 파티션 버전으로 캐시되므로 여기서 다시 캐시하지 않음
+    df_weather = load_weather(stations=stations, start=start, end=end, columns=columns)
+    df_sunshine = load_sunshine()
 
-    df_weather['일시'] = pd.to_datetime(df_weather['일시'])
-    if not df_sunshine.empty:
-        df_sunshine['일시'] = pd.to_datetime(df_sunshine['일시'])
+    if not df_weather.empty:
+        df_weather['일시'] = pd.to_datetime(df_weather['일시'])
 
     return df_weather, df_sunshine
+
+def load_sunshine():
+    return _load_sunshine(load_data_version())
+
+@metered_cache('load_sunshine', shared_cache('version'))
+def _load_sunshine(version):
+    return core.sunshine()  # 최신 열 저장소가 있으면 메모리 매핑 파일에서, 없으면 SQLite에서
@@ -0,0 +1,73 @@
+import folium
+import numpy as np
+import pandas as pd
+from modules.metrics import trace
+
+RESULT_COLORS = {'적합': 'green', '부분적합': 'orange', '부적합': 'red'}
+DEFAULT_COLOR = 'grey'
+
+
+def _fmt1(values):
+    """수치 Series → 소수 첫째 자리 문자열 Series"""
+    return values.round(1).astype(str)
+
+
+def build_feature_collection(df, analysis_cols):
+    """적합도 결과 DataFrame → 스타일/팝업 속성이 포함된 GeoJSON FeatureCollection
+
+    색상·반경·팝업 HTML을 컬럼 단위로 계산한 뒤 한 번에 Feature로 묶습니다.
+    analysis_cols: [평균기온, 평균상대습도, 월합강수량, 평균풍속, 월합일조시간] 컬럼명
+    """
+    df = df[df['위도'].notna() & df['경도'].notna()]
+    temp, _, rain, _, sun = (df[c] for c in analysis_cols)
+
+    color = df['결과'].map(RESULT_COLORS).fillna(DEFAULT_COLOR)
+    total = df['총재배량(톤)'] if '총재배량(톤)' in df.columns else pd.Series(np.nan, index=df.index)
+    radius = np.where(total.notna(), np.clip(total / 2000, 5, 12), 6)
+
+    popup = ("<b>" + df['읍면동'] + " (" + df['결과'].fillna('N/A') + ")</b><br>"
+             + "적합도점수: " + df['적합도점수'].fillna(0).astype(int).astype(str) + "/5<br>"
+             + "가까운 관측소: " + df['지점명'].fillna('N/A') + "<br>")
+    popup += np.where(temp.notna(), "평균기온: " + _fmt1(temp) + "°C (적합: "
+                      + df['기온적합'].fillna(0).astype(int).astype(str) + ")<br>", "")
+    popup += np.where(rain.notna(), "월강수량: " + _fmt1(rain) + "mm (적합: "
+                      + df['강수적합'].fillna(0).astype(int).astype(str) + ")<br>", "")
+    popup += np.where(sun.notna(), "월일조: " + _fmt1(sun) + "hr (적합: "
+                      + df['일조적합'].fillna(0).astype(int).astype(str) + ")", "")
+
+    features = [
+        {'type': 'Feature',
+         'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+         'properties': {'읍면동': name, 'color': c, 'radius': float(r), 'popup': p}}
+        for lon, lat, name, c, r, p in zip(df['경도'].tolist(), df['위도'].tolist(), df['읍면동'].tolist(),
+                                           color.tolist(), radius.tolist(), popup.tolist())
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def _feature_style(feature):
+    props = feature['properties']
+    return {'color': props['color'], 'fillColor': props['color'], 'fillOpacity': 0.7,
+            'radius': props['radius'], 'weight': 3}
+
+
+def build_map(feature_collection, location=(33.37, 126.53), zoom_start=9):
+    """FeatureCollection을 단일 GeoJson 레이어(CircleMarker)로 올린 folium 지도"""
+    m = folium.Map(location=list(location), zoom_start=zoom_start)
+    folium.GeoJson(
+        feature_collection,
+        name='적합도',
+        marker=folium.CircleMarker(fill=True),
+        style_function=_feature_style,
+        tooltip=folium.GeoJsonTooltip(fields=['읍면동'], labels=False),
+        popup=folium.GeoJsonPopup(fields=['popup'], labels=False, max_width=350),
+    ).add_to(m)
+    return m
+
+
+def render_map_html(df, analysis_cols, **kwargs):
+    """적합도 결과 → 지도 HTML 문자열 (캐시/정적 저장용)"""
+    with trace('folium_build'):
+        m = build_map(build_feature_collection(df, analysis_cols), **kwargs)
+    with trace('folium_render'):
+        return m.get_root().render()
@@ -0,0 +1,282 @@
+"""페이지 rerun 구간별 지연 시간·캐시 적중 지표 (Prometheus 텍스트 형식)
+
+- trace('단계'): 데코레이터/컨텍스트 매니저로 (페이지, 단계)별 지연 히스토그램 기록
+- with page_run('페이지'): 페이지 스크립트 전체를 감싸 rerun 전체 시간 기록 (st.stop()·예외로 끝난 rerun 포함,
+  status 라벨: ok / stop / error)
+- metered_cache('이름', st.cache_data): 캐시 데코레이터를 감싸 hit/miss 횟수 기록
+- 지표는 METRICS_PATH 파일(기본 .cache/metrics.prom)에 주기적으로 저장되며,
+  METRICS_PORT 환경 변수가 있으면 http://localhost:<port>/metrics 로도 제공합니다.
+"""
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PATH = os.environ.get('METRICS_PATH', os.path.join('.cache', 'metrics.prom'))
+METRICS_PORT = os.environ.get('METRICS_PORT')
+METRICS_INTERVAL = float(os.environ.get('METRICS_INTERVAL', '15'))
+PREFIX = 'basic2'
+
+# 정상 종료로 보는 Streamlit 흐름 제어 예외 (st.stop(), st.rerun())
+STOP_EXCEPTIONS = ('StopException', 'RerunException')
+
+# 지연 시간 히스토그램 구간 상한(초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+_page = contextvars.ContextVar('metrics_page', default='unknown')
+_page_start = contextvars.ContextVar('metrics_page_start', default=None)
+_cache_miss = contextvars.ContextVar('metrics_cache_miss', default=False)
+
+
+class Histogram:
+    """고정 구간 누적 히스토그램"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """구간 상한 기준 근사 분위수 (예: q=0.95)"""
+        if not self.count:
+            return None
+        target, seen = q * self.count, 0
+        for upper, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return upper
+        return self.buckets[-1]
+
+
+class Registry:
+    """(지표, 라벨)별 히스토그램/카운터 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self):
+        """Prometheus 텍스트 노출 형식 문자열"""
+        with self._lock:
+            histograms = {k: (list(h.counts), h.sum, h.count) for k, h in self.histograms.items()}
+            counters = dict(self.counters)
+
+        lines = []
+        for name in sorted({k[0] for k in histograms}):
+            lines.append(f"# TYPE {PREFIX}_{name} histogram")
+            for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for upper, n in zip(BUCKETS, counts):
+                    cumulative += n
+                    le = '+Inf' if upper == float('inf') else repr(upper)
+                    lines.append(f"{PREFIX}_{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{PREFIX}_{name}_sum{_labels(labels)} {total:.6f}")
+                lines.append(f"{PREFIX}_{name}_count{_labels(labels)} {count}")
+        for name in sorted({k[0] for k in counters}):
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{PREFIX}_{name}{_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+
+REGISTRY = Registry()
+
+
+class trace:
+    """(페이지, 단계) 지연 시간 기록 — 데코레이터 또는 with 문으로 사용
+
+        @trace('preprocess_weather')
+        def preprocess_weather(df): ...
+
+        with trace('plotly_build'):
+            fig = px.line(...)
+    """
+
+    def __init__(self, phase, registry=None):
+        self.phase = phase
+        self.registry = registry or REGISTRY
+        self._starts = threading.local()
+
+    def __enter__(self):
+        stack = self._starts.__dict__.setdefault('stack', [])
+        stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._starts.stack.pop()
+        self.registry.observe('phase_seconds', {'page': _page.get(), 'phase': self.phase}, elapsed)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self:
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def begin_page(page, registry=None):
+    """페이지 스크립트 시작: 이후 trace 기록에 페이지 라벨을 붙이고 rerun 시간 측정 시작"""
+    _page.set(page)
+    _page_start.set(time.perf_counter())
+    start_exporters(registry)
+
+
+def end_page(registry=None, status='ok'):
+    """페이지 스크립트 끝: rerun 전체 시간 기록"""
+    start = _page_start.get()
+    if start is None:
+        return
+    (registry or REGISTRY).observe('rerun_seconds', {'page': _page.get(), 'status': status},
+                                   time.perf_counter() - start)
+    _page_start.set(None)
+
+
+@contextlib.contextmanager
+def page_run(page, registry=None):
+    """페이지 스크립트 전체를 감싸는 rerun 측정 — st.stop()·st.rerun()·예외로 중간에 끝난 rerun도 기록"""
+    begin_page(page, registry)
+    status = 'error'
+    try:
+        yield
+        status = 'ok'
+    except BaseException as exc:
+        status = 'stop' if type(exc).__name__ in STOP_EXCEPTIONS else 'error'
+        raise
+    finally:
+        end_page(registry, status)
+
+
+def metered_cache(name, cache, registry=None):
+    """캐시 데코레이터(st.cache_data 등)를 감싸 호출 시간과 hit/miss 횟수를 기록
+
+    캐시가 함수 본문을 실행하면 miss, 본문 실행 없이 값을 돌려주면 hit 입니다.
+    """
+    registry = registry or REGISTRY
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _cache_miss.set(True)
+            return fn(*args, **kwargs)
+
+        cached = cache(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            token = _cache_miss.set(False)
+            start = time.perf_counter()
+            try:
+                result = cached(*args, **kwargs)
+                miss = _cache_miss.get()
+            finally:
+                _cache_miss.reset(token)
+            registry.observe('phase_seconds', {'page': _page.get(), 'phase': name}, time.perf_counter() - start)
+            registry.inc('cache_requests_total', {'cache': name, 'result': 'miss' if miss else 'hit'})
+            return result
+
+        wrapper.clear = getattr(cached, 'clear', None)
+        return wrapper
+
+    return decorator
+
+
+def write_textfile(path=METRICS_PATH, registry=None):
+    """지표를 파일로 저장 (임시 파일 작성 후 교체 — 읽는 쪽이 쓰다 만 파일을 보지 않음)"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write((registry or REGISTRY).render())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_exporters_lock = threading.Lock()
+_exporters = {}
+
+
+def start_exporters(registry=None, path=METRICS_PATH, port=METRICS_PORT, interval=METRICS_INTERVAL):
+    """지표 파일 저장 스레드와 (port 지정 시) /metrics HTTP 서버를 프로세스당 한 번 시작"""
+    registry = registry or REGISTRY
+    with _exporters_lock:
+        if path and 'file' not in _exporters:
+            stop = threading.Event()
+
+            def loop():
+                while not stop.wait(interval):
+                    try:
+                        write_textfile(path, registry)
+                    except OSError:
+                        pass  # 다음 주기에 재시도
+
+            thread = threading.Thread(target=loop, name='metrics-file', daemon=True)
+            thread.start()
+            _exporters['file'] = (thread, stop)
+
+        if port and 'http' not in _exporters:
+            handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+            try:
+                server = ThreadingHTTPServer(('127.0.0.1', int(port)), handler)
+            except OSError:
+                return  # 다른 프로세스가 이미 사용 중
+            threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+            _exporters['http'] = server
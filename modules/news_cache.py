@@ -0,0 +1,117 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+# 로컬 대체 API로 테스트할 때는 NAVER_NEWS_API_URL 환경 변수로 주소를 바꿉니다.
+API_URL = os.environ.get('NAVER_NEWS_API_URL', "https://openapi.naver.com/v1/search/news.json")
+CACHE_PATH = os.environ.get('NEWS_CACHE_PATH', os.path.join('.cache', 'news_cache.sqlite'))
+
+
+class NewsCache:
+    """(검색어, start, display, sort)별 API 응답을 저장하는 SQLite 디스크 캐시"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS news_cache (
+                query TEXT NOT NULL, start INTEGER NOT NULL, display INTEGER NOT NULL, sort TEXT NOT NULL,
+                fetched_at REAL NOT NULL, items TEXT NOT NULL,
+                PRIMARY KEY (query, start, display, sort))""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, query, start, display, sort):
+        """(items, fetched_at) 또는 None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT items, fetched_at FROM news_cache WHERE query = ? AND start = ? AND display = ? AND sort = ?",
+                               (query, start, display, sort)).fetchone()
+        finally:
+            conn.close()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put(self, query, start, display, sort, items):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO news_cache VALUES (?, ?, ?, ?, ?, ?)",
+                             (query, start, display, sort, time.time(), json.dumps(items, ensure_ascii=False)))
+        finally:
+            conn.close()
+
+
+class NewsClient:
+    """디스크 캐시를 거치는 네이버 뉴스 검색 API 클라이언트"""
+
+    def __init__(self, client_id, client_secret, cache=None, api_url=API_URL, ttl=3600, timeout=10, session=None):
+        self.cache = cache or NewsCache()
+        self.api_url = api_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.update({"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret})
+
+    def fetch(self, query, display=10, start=1, sort="date"):
+        """API 직접 호출 후 캐시에 저장"""
+        params = {"query": query, "display": display, "start": start, "sort": sort}
+        response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+        response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
+        items = response.json().get('items', [])
+        self.cache.put(query, start, display, sort, items)
+        return items
+
+    def is_fresh(self, query, display=10, start=1, sort="date", min_ttl=None):
+        cached = self.cache.get(query, start, display, sort)
+        ttl = self.ttl if min_ttl is None else min_ttl
+        return cached is not None and time.time() - cached[1] < ttl
+
+    def search(self, query, display=10, start=1, sort="date"):
+        """캐시가 ttl 이내면 캐시, 아니면 API 호출 (실패 시 오래된 캐시라도 반환)"""
+        cached = self.cache.get(query, start, display, sort)
+        if cached and time.time() - cached[1] < self.ttl:
+            return cached[0]
+        try:
+            return self.fetch(query, display, start, sort)
+        except (requests.exceptions.RequestException, ValueError):
+            if cached:
+                return cached[0]
+            raise
+
+
+class NewsPrefetcher(threading.Thread):
+    """추천 키워드의 첫 페이지를 ttl이 지나기 전에 미리 갱신하는 백그라운드 스레드"""
+
+    def __init__(self, client, keywords, display=20, interval=60):
+        super().__init__(name='news-prefetch', daemon=True)
+        self.client = client
+        self.keywords = list(keywords)
+        self.display = display
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def refresh_once(self):
+        # ttl의 80%가 지난 키워드만 다시 받아 사용자 요청 시점에 만료되지 않도록 유지
+        for keyword in self.keywords:
+            if self._stop_event.is_set():
+                return
+            if not self.client.is_fresh(keyword, self.display, min_ttl=self.client.ttl * 0.8):
+                try:
+                    self.client.fetch(keyword, self.display)
+                except (requests.exceptions.RequestException, ValueError):
+                    pass  # 다음 주기에 재시도
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.refresh_once()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
@@ -1,29 +1,36 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from modules.db_loader import load_db_table
-from modules.preprocess import preprocess_weather
+from modules import core
+from modules.db_loader import (load_chart_artifact, load_normals, load_report_bundle, load_rollup,
+                               load_weather_columns)
+from modules.metrics import trace
+from modules.schema import find_column
 
 def render_chart(keyword, y_label, title):
-    df_weather = load_db_table('asos_weather')
-    df_weather = preprocess_weather(df_weather)
+    # 0. 사전 계산 번들(python -m modules.cli report)에 있으면 파일에서 바로 표시
+    bundle = load_report_bundle()
+    artifact = load_chart_artifact(bundle.key, keyword, y_label, title, bundle) if bundle else None
+    if artifact is not None:
+        col_name, fig = artifact
+        st.info(f"📊 기준 컬럼: {col_name}")
+        with trace('plotly_render'):
+            st.plotly_chart(fig)
+        return
 
     # 1. 컬럼 자동 탐색
-    target_cols = [col for col in df_weather.columns if keyword in col]
-    if not target_cols:
+    col_name = find_column(tuple(load_weather_columns()), (keyword,))
+    if col_name is None:
         st.error(f"⚠️ '{keyword}'가 포함된 컬럼이 없습니다. 데이터 확인 필요.")
         return
 
-    col_name = target_cols[0]
     st.info(f"📊 기준 컬럼: {col_name}")
 
-    # 2. 월별 평균으로 집계
-    df_weather['월'] = df_weather['일시'].dt.to_period('M').dt.to_timestamp()
-    monthly_avg = df_weather.groupby('월')[col_name].mean().reset_index()
-
-    # 3. 그래프 그리기
-    fig = px.line(monthly_avg, x='월', y=col_name, markers=True,
-                  title=title, labels={col_name: y_label})
+    # 2. 월별 평균으로 집계 (지점×연×월 롤업에서 해당 컬럼만 읽어 지점 평균)
+    df_monthly = load_rollup('month', columns=[col_name])
+    with trace('groupby'):
+        monthly_avg = core.monthly_mean(df_monthly, col_name)
 
-    fig.update_layout(yaxis_range=[0, None], xaxis_title='날짜')
-    st.plotly_chart(fig)
+    # 3. 그래프 그리기 (같은 달 평년 범위를 함께 표시)
+    band = core.normal_band(load_normals(), col_name)
+    fig = core.metric_figure(monthly_avg, col_name, y_label, title, band)  # 다운샘플링·plotly_build 구간은 내부에서 기록
+    with trace('plotly_render'):
+        st.plotly_chart(fig)
@@ -0,0 +1,144 @@
+"""방제약 ↔ 병해충 역색인 (공고 적재 때 만든 pest_pesticide 테이블을 한 번 읽어 메모리 사전으로)
+
+방제약 칸은 '가네마이트(액수)·쇼크(액상수) 등' 같은 자유 텍스트라 약제로 찾으려면 모든 행을 정규식으로 훑어야 합니다.
+적재 때 약제 단위로 나눠 둔 행(pest_store.write_pesticides)을 읽어
+약제 → 병해충/작물/연도, 병해충 → 약제 사전과 이름 검색용 정렬 목록을 만들어 두므로,
+'카브리오를 권고한 공고'나 자동완성 검색은 사전·이진 탐색 한 번으로 끝납니다.
+색인은 읽기 전용이라 서명(원본 CSV)이 같은 동안 프로세스에 하나만 두고 세션들이 같이 씁니다.
+
+    index = PesticideIndex.from_conn(conn)
+    index.suggest('카브')            # [('카브리오', '방제약'), ...]
+    index.suggest('ㅋㅂㄹ')          # 초성 검색
+    index.pesticide('카브리오')      # {'공고수': .., '병해충': [(병해충, 건수), ..], '작물': [..], '연도': [..], '제형': [..]}
+    index.pesticides_for('귤응애')   # [(약제, 건수), ...]
+"""
+import bisect
+import re
+from collections import Counter
+
+import pandas as pd
+
+from modules.pest_store import PEST_TABLE, PESTICIDE_TABLE
+
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+POSTING_COLUMNS = ['약제', '제형', '작물', '병해충', '연도', '월', '발표일', '호수', '출처']
+KINDS = ('방제약', '병해충')
+
+
+def normalize_term(text):
+    """검색 키: 공백·'-' 제거, 영문 소문자"""
+    return re.sub(r'[\s\-]+', '', str(text)).lower()
+
+
+def initials(text):
+    """한글 음절 → 초성 ('카브리오' → 'ㅋㅂㄹㅇ'), 나머지 글자는 그대로"""
+    return ''.join(CHOSEONG[(ord(ch) - 0xAC00) // 588] if '가' <= ch <= '힣' else ch for ch in text)
+
+
+def _ranked(counter):
+    """Counter → 건수 많은 순, 이름 순 튜플"""
+    return tuple(sorted(counter.items(), key=lambda item: (-item[1], item[0])))
+
+
+def _prefix_range(keys, prefix):
+    """정렬된 (키, 번호) 목록에서 prefix로 시작하는 구간"""
+    lo = bisect.bisect_left(keys, (prefix,))
+    hi = bisect.bisect_left(keys, (prefix + '\uffff',))
+    return keys[lo:hi]
+
+
+class PesticideIndex:
+    """방제약 ↔ 병해충 역색인 (읽기 전용, 스레드 간 공유)"""
+
+    def __init__(self, postings):
+        self.postings = postings[POSTING_COLUMNS].reset_index(drop=True)
+        pesticides, pests = {}, {}
+        for pos, (name, form, crop, pest, year) in enumerate(
+                self.postings[['약제', '제형', '작물', '병해충', '연도']].itertuples(index=False, name=None)):
+            entry = pesticides.setdefault(name, {'rows': [], '병해충': Counter(), '작물': Counter(),
+                                                 '연도': set(), '제형': set()})
+            entry['rows'].append(pos)
+            entry['작물'][crop] += 1
+            if pd.notna(pest):
+                entry['병해충'][pest] += 1
+                pests.setdefault(pest, Counter())[name] += 1
+            if pd.notna(year):
+                entry['연도'].add(int(year))
+            if pd.notna(form):
+                entry['제형'].add(form)
+
+        self._rows = {name: entry.pop('rows') for name, entry in pesticides.items()}
+        self._pesticides = {name: {'공고수': len(self._rows[name]), '병해충': _ranked(entry['병해충']),
+                                   '작물': _ranked(entry['작물']), '연도': tuple(sorted(entry['연도'])),
+                                   '제형': tuple(sorted(entry['제형']))}
+                            for name, entry in pesticides.items()}
+        self._pests = {pest: _ranked(counter) for pest, counter in pests.items()}
+
+        # 자동완성: (정규화 키, 번호) / (초성 키, 번호) 정렬 목록 + 공고 많은 순 목록(부분 일치용)
+        self._terms = [(name, '방제약', self._pesticides[name]['공고수']) for name in self._pesticides]
+        self._terms += [(pest, '병해충', sum(n for _, n in self._pests[pest])) for pest in self._pests]
+        keys = [normalize_term(term) for term, _, _ in self._terms]
+        self._keys = sorted((key, i) for i, key in enumerate(keys))
+        self._initials = sorted((initials(key), i) for i, key in enumerate(keys))
+        self._by_weight = sorted(range(len(self._terms)), key=lambda i: (-self._terms[i][2], self._terms[i][0]))
+        self._weighted_keys = [(keys[i], i) for i in self._by_weight]
+
+    @classmethod
+    def from_conn(cls, conn):
+        """pest_pesticide × pest_bulletin 한 번 조회로 색인 생성"""
+        sql = (f"SELECT p.약제, p.제형, b.작물, b.병해충, b.연도, b.월, b.발표일, b.호수, b.출처 "
+               f"FROM {PESTICIDE_TABLE} p JOIN {PEST_TABLE} b ON b.id = p.bulletin_id "
+               f"ORDER BY b.연도, b.월, b.id, p.순번")
+        return cls(pd.read_sql(sql, conn))
+
+    def __len__(self):
+        return len(self._pesticides)
+
+    def pesticide_names(self):
+        """약제명 목록 (공고 많은 순)"""
+        return [self._terms[i][0] for i in self._by_weight if self._terms[i][1] == '방제약']
+
+    def pesticide(self, name):
+        """약제 → {'공고수', '병해충': ((병해충, 건수), ..), '작물': ((작물, 건수), ..), '연도', '제형'} (없으면 None)"""
+        return self._pesticides.get(name)
+
+    def pesticides_for(self, pest):
+        """병해충 → ((약제, 건수), ...) 권고 건수 많은 순 (없으면 빈 튜플)"""
+        return self._pests.get(pest, ())
+
+    def bulletins(self, name):
+        """약제를 권고한 공고 행 (연도·월 순)"""
+        rows = self._rows.get(name)
+        if rows is None:
+            return self.postings.iloc[:0]
+        return self.postings.iloc[rows].reset_index(drop=True)
+
+    def suggest(self, query, limit=10, kinds=KINDS):
+        """자동완성 → [(이름, '방제약'|'병해충'), ...]
+
+        접두어 일치(공고 많은 순) → 초성 접두어 일치(질의가 초성만일 때) → 부분 일치 순으로 limit개까지 채웁니다.
+        """
+        key = normalize_term(query)
+        if not key:
+            return []
+        found, seen = [], set()
+
+        def take(indices):
+            for i in sorted(indices, key=lambda i: (-self._terms[i][2], self._terms[i][0])):
+                if len(found) >= limit:
+                    return
+                if i not in seen and self._terms[i][1] in kinds:
+                    seen.add(i)
+                    found.append(self._terms[i][:2])
+
+        take(i for _, i in _prefix_range(self._keys, key))
+        if len(found) < limit and all(ch in CHOSEONG for ch in key):
+            take(i for _, i in _prefix_range(self._initials, key))
+        if len(found) < limit:
+            for term_key, i in self._weighted_keys:
+                if len(found) >= limit:
+                    break
+                if key in term_key and i not in seen and self._terms[i][1] in kinds:
+                    seen.add(i)
+                    found.append(self._terms[i][:2])
+        return found
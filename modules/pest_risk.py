@@ -0,0 +1,289 @@
+"""기상 기반 병해충 위험도 지수 (예찰 공고 발표일 × 직전 기상 구간)
+
+발표일이 있는 병해충 공고(pest_bulletin)마다 관측 지점별로 발표일 전에 끝난 최근 RISK_WINDOW 기간
+(월자료 2개월, 일자료 30일)의 평균기온·평균습도·월 환산 강수량을 as-of 조인(지점별 정렬 후 이진 탐색)으로 붙이고,
+병해충 유형(응애/병/해충)별 선호 기상 범위에 얼마나 들어맞는지로 0~100 위험도 지수를 계산해 pest_risk 테이블에 둡니다.
+작물×지점×월 요약(pest_risk_monthly)은 기본키로 한 번에 읽습니다.
+
+공고 CSV가 바뀌면 새로 생기거나 사라진 공고만, 관측이 적재되면(ingest_asos) 해당 지점에서 적재된 기간 이후에
+발표된 공고만 다시 계산합니다. 지수 계산 방식(RISK_VERSION)이나 구간 길이가 바뀌면 전체를 다시 계산합니다.
+"""
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from modules.alert_rules import period_unit
+from modules.pest_store import PEST_TABLE
+from modules.weather_query import get_stations, get_weather_columns, query_weather
+
+RISK_TABLE = 'pest_risk'
+RISK_SUMMARY_TABLE = 'pest_risk_monthly'
+RISK_META_TABLE = 'pest_risk_meta'
+RISK_VERSION = 1
+
+# 관측 단위별 기상 구간 길이(기간 수)와 한 기간의 길이 (as-of 허용 간격 계산용)
+RISK_WINDOW = {'month': 2, 'day': 30, 'hour': 24 * 30}
+PERIOD_SPAN = {'month': pd.Timedelta(days=31), 'day': pd.Timedelta(days=1), 'hour': pd.Timedelta(hours=1)}
+PERIODS_PER_MONTH = {'month': 1.0, 'day': 30.4, 'hour': 730.0}
+
+# 특징 → 관측 컬럼 (강수는 구간 평균을 월 합계로 환산)
+RISK_FEATURES = {'평균기온': '평균기온(°C)', '평균습도': '평균상대습도(%)', '월강수량': '월합강수량(00~24h만)(mm)'}
+
+# 병해충 유형별 선호 기상: 기온은 사다리꼴 (a, b, c, d) — b~c에서 1, a 이하·d 이상에서 0,
+# 습도·강수는 (0이 되는 값, 1이 되는 값) — 거꾸로 주면 건조할수록 위험. weights는 특징 순서대로.
+RISK_PROFILES = {
+    '응애': {'평균기온': (15, 24, 32, 38), '평균습도': (85, 55), '월강수량': (200, 40), 'weights': (0.5, 0.3, 0.2)},
+    '병': {'평균기온': (10, 18, 26, 32), '평균습도': (60, 85), '월강수량': (50, 200), 'weights': (0.3, 0.4, 0.3)},
+    '해충': {'평균기온': (12, 20, 30, 35), '평균습도': (50, 75), '월강수량': (20, 100), 'weights': (0.5, 0.3, 0.2)},
+}
+
+RISK_COLUMNS = ['작물', '병해충', '발표일', '지점명', '연도', '월', '유형', '기준일시', '기간수',
+                *RISK_FEATURES, '위험도지수']
+
+
+def risk_profile(pest):
+    """병해충명 → 위험도 유형 ('응애', '병', '해충')"""
+    pest = str(pest)
+    if '응애' in pest:
+        return '응애'
+    return '병' if pest.endswith('병') else '해충'
+
+
+def _ramp(x, zero, one):
+    """zero에서 0, one에서 1인 선형 구간 (zero > one이면 감소)"""
+    return np.clip((x - zero) / (one - zero), 0.0, 1.0)
+
+
+def risk_index(features, profiles):
+    """특징 DataFrame(평균기온, 평균습도, 월강수량)과 행별 유형 → 0~100 위험도 지수 (결측 특징은 가중치에서 제외)"""
+    scores = np.full((len(features), len(RISK_FEATURES)), np.nan)
+    weights = np.zeros_like(scores)
+    profiles = np.asarray(profiles)
+    for name, profile in RISK_PROFILES.items():
+        rows = profiles == name
+        if not rows.any():
+            continue
+        for j, feature in enumerate(RISK_FEATURES):
+            x = features[feature].to_numpy(dtype=float)[rows]
+            shape = profile[feature]
+            if len(shape) == 4:
+                scores[rows, j] = np.minimum(_ramp(x, shape[0], shape[1]), _ramp(x, shape[3], shape[2]))
+            else:
+                scores[rows, j] = _ramp(x, *shape)
+            weights[rows, j] = profile['weights'][j]
+    weights[np.isnan(scores)] = 0.0
+    total = weights.sum(axis=1)
+    with np.errstate(invalid='ignore'):
+        index = np.nansum(np.nan_to_num(scores) * weights, axis=1) / total * 100
+    return np.where(total > 0, np.round(index, 1), np.nan)
+
+
+def _window_features(obs, window, unit):
+    """지점별 관측 → 각 기간이 끝나는 시각과 그 기간까지 window개 기간의 특징 (지점, 종료 순)"""
+    obs = obs.assign(일시=pd.to_datetime(obs['일시'])).sort_values(['지점명', '일시'], kind='stable')
+    values = obs[list(RISK_FEATURES.values())].astype(float)
+    values.columns = list(RISK_FEATURES)
+    rolling = values.groupby(obs['지점명'].to_numpy()).rolling(window, min_periods=1)
+    features = rolling.mean().reset_index(level=0, drop=True)
+    features['월강수량'] *= PERIODS_PER_MONTH[unit]
+    features['기간수'] = rolling['평균기온'].count().reset_index(level=0, drop=True).astype(int)
+    end = obs['일시'] + (pd.DateOffset(months=1) if unit == 'month' else PERIOD_SPAN[unit])
+    fmt = {'month': '%Y-%m', 'day': '%Y-%m-%d', 'hour': '%Y-%m-%d %H:%M'}[unit]
+    return pd.concat([obs[['지점명']], features], axis=1).assign(
+        종료=end, 기준일시=obs['일시'].dt.strftime(fmt)).sort_values('종료', kind='stable')
+
+
+def compute_risk(conn, bulletins, stations=None, window=None):
+    """공고 (작물, 병해충, 발표일) × 지점 → 위험도 행 (RISK_COLUMNS)
+
+    발표일 이전에 끝난 가장 최근 기간을 as-of 조인으로 찾고, 그 기간이 구간 길이 안에 없으면 지수는 결측입니다.
+    """
+    stations = get_stations(conn) if stations is None else list(stations)
+    if bulletins.empty or not stations:
+        return pd.DataFrame(columns=RISK_COLUMNS)
+    dates = pd.to_datetime(bulletins['발표일'])
+    pairs = bulletins.assign(_발표=dates).merge(pd.DataFrame({'지점명': stations}), how='cross')
+
+    columns = [c for c in RISK_FEATURES.values() if c in get_weather_columns(conn)]
+    missing = [c for c in RISK_FEATURES.values() if c not in columns]
+    lookback = PERIOD_SPAN['month'] * ((window or RISK_WINDOW['month']) + 2)  # 단위를 모르므로 월 기준으로 넉넉히
+    obs = query_weather(conn, stations, (dates.min() - lookback).strftime('%Y-%m'),
+                        dates.max().strftime('%Y-%m-%d'), columns=columns)
+    obs = obs.assign(**{c: np.nan for c in missing})
+    if obs.empty:
+        merged = pairs.assign(**{c: np.nan for c in RISK_FEATURES}, 기간수=0, 기준일시=None)
+    else:
+        unit = period_unit(obs['일시'])
+        window = window or RISK_WINDOW[unit]
+        features = _window_features(obs, window, unit)
+        merged = pd.merge_asof(pairs.sort_values('_발표', kind='stable'), features, left_on='_발표',
+                               right_on='종료', by='지점명', direction='backward',
+                               tolerance=PERIOD_SPAN[unit] * (window + 1))
+        merged['기간수'] = merged['기간수'].fillna(0).astype(int)
+    merged['유형'] = merged['병해충'].map(risk_profile)
+    merged['위험도지수'] = risk_index(merged, merged['유형'])
+    merged['연도'] = merged['_발표'].dt.year
+    merged['월'] = merged['_발표'].dt.month
+    return merged[RISK_COLUMNS].reset_index(drop=True)
+
+
+def bulletin_keys(conn, since=None):
+    """발표일이 있는 공고 (작물, 병해충, 발표일) — since(YYYY-MM-DD) 이후만"""
+    sql = (f"SELECT DISTINCT 작물, 병해충, 발표일 FROM {PEST_TABLE} "
+           f"WHERE 발표일 IS NOT NULL AND 병해충 IS NOT NULL")
+    params = []
+    if since is not None:
+        sql += " AND 발표일 >= ?"
+        params.append(since)
+    return pd.read_sql(sql, conn, params=params)
+
+
+def _create_tables(conn):
+    features = ', '.join(f"{name} REAL" for name in RISK_FEATURES)
+    conn.execute(f"""CREATE TABLE IF NOT EXISTS {RISK_TABLE} (
+        작물 TEXT NOT NULL, 병해충 TEXT NOT NULL, 발표일 TEXT NOT NULL, 지점명 TEXT NOT NULL,
+        연도 INTEGER, 월 INTEGER, 유형 TEXT, 기준일시 TEXT, 기간수 INTEGER, {features}, 위험도지수 REAL,
+        PRIMARY KEY (작물, 병해충, 발표일, 지점명))""")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_pest_risk_station_date ON {RISK_TABLE} (지점명, 발표일)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_pest_risk_crop_station_month ON {RISK_TABLE} (작물, 지점명, 월)")
+    conn.execute(f"""CREATE TABLE IF NOT EXISTS {RISK_SUMMARY_TABLE} (
+        작물 TEXT NOT NULL, 지점명 TEXT NOT NULL, 월 INTEGER NOT NULL, 공고수 INTEGER,
+        위험도지수 REAL, 최고위험도지수 REAL, 최근발표일 TEXT,
+        PRIMARY KEY (작물, 지점명, 월)) WITHOUT ROWID""")
+    conn.execute(f"""CREATE TABLE IF NOT EXISTS {RISK_META_TABLE} (
+        id INTEGER PRIMARY KEY CHECK (id = 1), config TEXT, signature TEXT, version INTEGER)""")
+
+
+def _config(window):
+    return f"v{RISK_VERSION}:{window or 'auto'}"
+
+
+def _write(conn, rows):
+    if rows.empty:
+        return
+    conn.executemany(f"INSERT OR REPLACE INTO {RISK_TABLE} ({', '.join(RISK_COLUMNS)}) "
+                     f"VALUES ({', '.join('?' * len(RISK_COLUMNS))})",
+                     rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None))
+
+
+def _refresh_summary(conn, crop_months=None):
+    """요약 테이블 갱신: crop_months=[(작물, 월), ...]만 (None이면 전체)"""
+    select = (f"SELECT 작물, 지점명, 월, COUNT(*), ROUND(AVG(위험도지수), 1), MAX(위험도지수), MAX(발표일) "
+              f"FROM {RISK_TABLE}")
+    if crop_months is None:
+        conn.execute(f"DELETE FROM {RISK_SUMMARY_TABLE}")
+        conn.execute(f"INSERT INTO {RISK_SUMMARY_TABLE} {select} GROUP BY 작물, 지점명, 월")
+        return
+    for crop, month in sorted(set(crop_months)):
+        conn.execute(f"DELETE FROM {RISK_SUMMARY_TABLE} WHERE 작물 = ? AND 월 = ?", (crop, int(month)))
+        conn.execute(f"INSERT INTO {RISK_SUMMARY_TABLE} {select} WHERE 작물 = ? AND 월 = ? "
+                     f"GROUP BY 작물, 지점명, 월", (crop, int(month)))
+
+
+def _crop_months(frame):
+    return list(zip(frame['작물'], pd.to_datetime(frame['발표일']).dt.month))
+
+
+def pest_risk_current(conn, signature, version, window=None):
+    """위험도 지수가 이 공고 서명·데이터 버전·계산 방식으로 계산돼 있는지 (읽기 전용 연결로 확인 가능)"""
+    try:
+        meta = conn.execute(f"SELECT config, signature, version FROM {RISK_META_TABLE} WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return meta == (_config(window), signature, version)
+
+
+def ensure_pest_risk(conn, signature, version, window=None):
+    """공고 서명·데이터 버전이 마지막 계산과 같으면 그대로, 아니면 필요한 부분만 다시 계산 → 계산한 행 수
+
+    - 계산 방식·구간 길이나 데이터 버전이 다르면(적재 외의 경로로 관측이 바뀜) 전체 재계산
+    - 공고 서명만 다르면 새로 생긴 공고(와 아직 계산하지 않은 지점)만 계산하고 사라진 공고는 삭제
+    """
+    if pest_risk_current(conn, signature, version, window):
+        return 0
+    _create_tables(conn)
+    meta = conn.execute(f"SELECT config, signature, version FROM {RISK_META_TABLE} WHERE id = 1").fetchone()
+    with conn:
+        keys = bulletin_keys(conn)
+        if meta is None or meta[0] != _config(window) or meta[2] != version:
+            conn.execute(f"DELETE FROM {RISK_TABLE}")
+            rows = compute_risk(conn, keys, window=window)
+            _write(conn, rows)
+            _refresh_summary(conn)
+        else:
+            done = pd.read_sql(f"SELECT DISTINCT 작물, 병해충, 발표일 FROM {RISK_TABLE}", conn)
+            diff = keys.merge(done, how='outer', indicator=True)
+            added, removed = diff[diff['_merge'] == 'left_only'], diff[diff['_merge'] == 'right_only']
+            conn.executemany(f"DELETE FROM {RISK_TABLE} WHERE 작물 = ? AND 병해충 = ? AND 발표일 = ?",
+                             removed[['작물', '병해충', '발표일']].itertuples(index=False, name=None))
+            rows = compute_risk(conn, added[['작물', '병해충', '발표일']], window=window)
+            stations = {r[0] for r in conn.execute(f"SELECT DISTINCT 지점명 FROM {RISK_TABLE}")}
+            new_stations = [s for s in get_stations(conn) if s not in stations]
+            if new_stations and not keys.empty:
+                rows = pd.concat([rows, compute_risk(conn, keys, new_stations, window)], ignore_index=True)
+            _write(conn, rows)
+            _refresh_summary(conn, _crop_months(pd.concat([added, removed])) + _crop_months(rows))
+        conn.execute(f"INSERT OR REPLACE INTO {RISK_META_TABLE} (id, config, signature, version) "
+                     f"VALUES (1, ?, ?, ?)", (_config(window), signature, version))
+    return len(rows)
+
+
+def refresh_pest_risk(conn, partitions, version, window=None):
+    """관측 적재 후 호출: 적재된 지점별로 가장 이른 적재 기간 이후에 발표된 공고만 다시 계산 → 계산한 행 수
+
+    partitions: [(지점명, 'YYYY-MM'), ...] (ingest_asos). 위험도 테이블이 없으면 아무것도 하지 않습니다.
+    트랜잭션은 호출한 쪽에서 관리합니다.
+    """
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                          (RISK_META_TABLE,)).fetchone()
+    if not exists or not partitions:
+        return 0
+    since = {}
+    for station, month in partitions:
+        since[station] = min(since.get(station, month), month)
+    frames = []
+    for station, month in sorted(since.items()):
+        keys = bulletin_keys(conn, f"{month}-01")
+        if not keys.empty:
+            frames.append(compute_risk(conn, keys, [station], window))
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RISK_COLUMNS)
+    _write(conn, rows)
+    _refresh_summary(conn, _crop_months(rows))
+    conn.execute(f"UPDATE {RISK_META_TABLE} SET version = ? WHERE id = 1", (version,))
+    return len(rows)
+
+
+def _station_filter(stations):
+    if stations is None:
+        return "", []
+    stations = [stations] if isinstance(stations, str) else list(stations)
+    return f" AND 지점명 IN ({', '.join('?' * len(stations))})", stations
+
+
+def risk_lookup(conn, crop, station, month):
+    """작물·지점·월 위험도 요약 (기본키 조회) → dict (공고수, 위험도지수, 최고위험도지수, 최근발표일) 또는 None"""
+    row = conn.execute(f"SELECT 공고수, 위험도지수, 최고위험도지수, 최근발표일 FROM {RISK_SUMMARY_TABLE} "
+                       f"WHERE 작물 = ? AND 지점명 = ? AND 월 = ?", (crop, station, int(month))).fetchone()
+    return None if row is None else dict(zip(['공고수', '위험도지수', '최고위험도지수', '최근발표일'], row))
+
+
+def risk_by_month(conn, crop, stations=None):
+    """작물의 월별 위험도 지수 (여러 지점이면 지점 평균) → 월, 공고수, 위험도지수, 최고위험도지수"""
+    where_sql, params = _station_filter(stations)
+    sql = (f"SELECT 월, MAX(공고수) AS 공고수, ROUND(AVG(위험도지수), 1) AS 위험도지수, "
+           f"MAX(최고위험도지수) AS 최고위험도지수 FROM {RISK_SUMMARY_TABLE} WHERE 작물 = ?{where_sql} "
+           f"GROUP BY 월 ORDER BY 월")
+    return pd.read_sql(sql, conn, params=[crop] + params)
+
+
+def risk_by_pest(conn, crop, month=None, stations=None):
+    """작물(·월)의 병해충별 평균 위험도 지수 → 병해충, 유형, 공고수, 위험도지수 (높은 순)"""
+    where_sql, params = _station_filter(stations)
+    if month is not None:
+        where_sql += " AND 월 = ?"
+        params.append(int(month))
+    sql = (f"SELECT 병해충, 유형, COUNT(DISTINCT 발표일) AS 공고수, ROUND(AVG(위험도지수), 1) AS 위험도지수 "
+           f"FROM {RISK_TABLE} WHERE 작물 = ?{where_sql} GROUP BY 병해충, 유형 "
+           f"ORDER BY 위험도지수 DESC, 병해충")
+    return pd.read_sql(sql, conn, params=[crop] + params)
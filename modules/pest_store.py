@@ -0,0 +1,223 @@
+import os
+import re
+import pandas as pd
+
+PEST_TABLE = 'pest_bulletin'
+PEST_FILES = ["pest_disease_info_1.csv", "pest_disease_info_2.csv", "pest_disease_info_3.csv"]
+
+# 작물명 표기 정리 (오타/띄어쓰기)
+CROP_FIXES = {'만감규': '만감류', '노지 감귤': '노지감귤'}
+CROP_SPLIT = re.compile(r'\s*[.·/,]\s*')
+
+BULLETIN_COLUMNS = ['출처', '연도', '월', '발표일', '호수', '분류', '작물', '병해충', '방제약', '데이터기준일자']
+
+# 방제약 칸: '가네마이트(액수)·쇼크(액상수)·주움(수) 등' → (약제명, 제형) 목록
+PESTICIDE_TABLE = 'pest_pesticide'
+PESTICIDE_ENTRY = re.compile(r'(?:\([^()]*\))?\s*(?P<name>[^\s()]+)\s*(?:\((?P<form>[^()]*)\))?\s*(?P<note>.*)')
+PESTICIDE_NOTE = re.compile(r'|[\d~∼.,\s]+배\S*|혼용')  # 약제 뒤에 붙어도 되는 희석배수·혼용 표기
+PESTICIDE_TAIL = re.compile(r'(?:(?<=\))\s*등|\s+등|\.)+$')
+PESTICIDE_NEXT = re.compile(r'(?<=\))\s+(?=[가-힣A-Za-z][^\s()]*\()')  # '차단(액수) 탈렌트(액상)'처럼 구분자 누락
+FORMULATION = re.compile(r'[가-힣.]{1,5}')
+# 제형 약칭 정리 (액상수화제: 액상수/액수, 입상수화제: 입상수/입수, 유제: 유제/유)
+FORMULATION_FIXES = {'액상수': '액수', '입상수': '입수', '유제': '유', '임상': '입상'}
+
+
+def split_crops(value):
+    """'하우스감귤. 만감류', '양파·쪽파' 등 복수 작물 표기 → 작물 목록"""
+    if pd.isna(value):
+        return []
+    crops = [c.strip() for c in CROP_SPLIT.split(str(value)) if c.strip()]
+    return [CROP_FIXES.get(c, c).replace(' ', '') for c in crops]
+
+
+def _split_top_level(text, separators='·,+'):
+    """괄호 밖의 구분자로만 나누기 ('티람수화제(큰나락·삼공베노람)'은 한 항목)"""
+    items, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth = max(depth - 1, 0)
+        elif depth == 0 and ch in separators:
+            items.append(text[start:i])
+            start = i + 1
+    items.append(text[start:])
+    return items
+
+
+def split_pesticides(value):
+    """방제약 자유 텍스트 → [(약제명, 제형), ...]
+
+    '·'/'+'로 이은 약제를 나누고 '등', 희석배수, '(브로콜리/무)' 같은 앞 괄호를 떼어 냅니다.
+    '꽃이 20~30% 피면 …'처럼 약제명이 아닌 방제 요령 문장은 건너뜁니다. 약제명의 띄어쓰기·'-'는 없앱니다.
+    """
+    if pd.isna(value):
+        return []
+    out = []
+    for part in _split_top_level(str(value).strip()):
+        for item in PESTICIDE_NEXT.split(part.strip()):
+            match = PESTICIDE_ENTRY.fullmatch(PESTICIDE_TAIL.sub('', item.strip()))
+            if match is None or not PESTICIDE_NOTE.fullmatch(match['note'].strip()):
+                continue
+            name = match['name'].replace('-', '')
+            if not re.search(r'[가-힣A-Za-z]', name):
+                continue
+            form = (match['form'] or '').replace(' ', '')
+            form = FORMULATION_FIXES.get(form, form) if FORMULATION.fullmatch(form) else None
+            out.append((name, form))
+    return out
+
+
+def normalize_bulletins(df, source):
+    """세 가지 CSV 스키마(중점방제대상/병해충 vs 농작물명/병해충유형/발표일) → 공통 스키마
+
+    작물이 여러 개인 행은 작물별 행으로 나누고, 발표일이 없으면 데이터기준일자로 연/월을 정합니다.
+    """
+    out = pd.DataFrame({
+        '출처': source,
+        '발표일': pd.to_datetime(df['발표일'], errors='coerce') if '발표일' in df.columns else pd.NaT,
+        '호수': df['호수'] if '호수' in df.columns else None,
+        '분류': df['분류'] if '분류' in df.columns else df.get('구분'),
+        '작물': df['농작물명'] if '농작물명' in df.columns else df.get('중점방제대상'),
+        '병해충': df['병해충유형'] if '병해충유형' in df.columns else df.get('병해충'),
+        '방제약': df.get('방제약'),
+        '데이터기준일자': pd.to_datetime(df.get('데이터기준일자'), errors='coerce'),
+    })
+    base_date = out['발표일'].fillna(out['데이터기준일자'])
+    out['연도'] = base_date.dt.year.astype('Int64')
+    out['월'] = base_date.dt.month.astype('Int64')
+    out['병해충'] = out['병해충'].str.strip()
+
+    out['작물'] = out['작물'].map(split_crops)
+    out = out.explode('작물').dropna(subset=['작물'])
+    out['발표일'] = out['발표일'].dt.strftime('%Y-%m-%d')
+    out['데이터기준일자'] = out['데이터기준일자'].dt.strftime('%Y-%m-%d')
+    return out[BULLETIN_COLUMNS].reset_index(drop=True)
+
+
+def source_signature(data_dir='data', files=PEST_FILES):
+    """원본 CSV 변경 감지용 (파일명, 수정시각, 크기) 서명"""
+    parts = []
+    for file in files:
+        path = os.path.join(data_dir, file)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts.append(f"{file}:{int(stat.st_mtime)}:{stat.st_size}")
+    return '|'.join(parts)
+
+
+def ingest_pest_csvs(conn, data_dir='data', files=PEST_FILES):
+    """병해충 CSV를 정규화해 pest_bulletin 테이블로 다시 적재하고 인덱스·약제 테이블(pest_pesticide) 생성"""
+    frames = []
+    for file in files:
+        path = os.path.join(data_dir, file)
+        if os.path.exists(path):
+            frames.append(normalize_bulletins(pd.read_csv(path), file))
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=BULLETIN_COLUMNS)
+
+    with conn:
+        conn.execute(f"DROP TABLE IF EXISTS {PEST_TABLE}")
+        conn.execute(f"""CREATE TABLE {PEST_TABLE} (
+            id INTEGER PRIMARY KEY, 출처 TEXT, 연도 INTEGER, 월 INTEGER, 발표일 TEXT, 호수 TEXT,
+            분류 TEXT, 작물 TEXT NOT NULL, 병해충 TEXT, 방제약 TEXT, 데이터기준일자 TEXT)""")
+        conn.executemany(f"INSERT INTO {PEST_TABLE} ({', '.join(BULLETIN_COLUMNS)}) VALUES ({', '.join('?' * len(BULLETIN_COLUMNS))})",
+                         df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+        conn.execute(f"CREATE INDEX idx_pest_crop_year_month ON {PEST_TABLE} (작물, 연도, 월, 병해충)")
+        conn.execute(f"CREATE INDEX idx_pest_crop_month ON {PEST_TABLE} (작물, 월, 병해충)")
+        conn.execute(f"CREATE INDEX idx_pest_pest ON {PEST_TABLE} (병해충, 작물)")
+        conn.execute(f"CREATE INDEX idx_pest_year_month ON {PEST_TABLE} (연도, 월)")
+        write_pesticides(conn)
+        conn.execute("CREATE TABLE IF NOT EXISTS pest_source (id INTEGER PRIMARY KEY CHECK (id = 1), signature TEXT)")
+        conn.execute("INSERT OR REPLACE INTO pest_source (id, signature) VALUES (1, ?)", (source_signature(data_dir, files),))
+    return len(df)
+
+
+def write_pesticides(conn):
+    """pest_bulletin의 방제약 칸을 약제 단위로 나눠 pest_pesticide (공고 id, 순번, 약제, 제형) 테이블로 저장"""
+    rows = [(bulletin_id, order, name, form)
+            for bulletin_id, value in conn.execute(f"SELECT id, 방제약 FROM {PEST_TABLE}").fetchall()
+            for order, (name, form) in enumerate(split_pesticides(value))]
+    conn.execute(f"DROP TABLE IF EXISTS {PESTICIDE_TABLE}")
+    conn.execute(f"""CREATE TABLE {PESTICIDE_TABLE} (
+        bulletin_id INTEGER NOT NULL, 순번 INTEGER NOT NULL, 약제 TEXT NOT NULL, 제형 TEXT,
+        PRIMARY KEY (bulletin_id, 순번)) WITHOUT ROWID""")
+    conn.executemany(f"INSERT INTO {PESTICIDE_TABLE} VALUES (?, ?, ?, ?)", rows)
+    conn.execute(f"CREATE INDEX idx_pesticide_name ON {PESTICIDE_TABLE} (약제, bulletin_id)")
+    return len(rows)
+
+
+def pest_store_current(conn, signature):
+    """적재된 공고가 이 서명의 CSV와 같은지 (읽기만 하므로 읽기 전용 연결로 확인 가능)"""
+    try:
+        row = conn.execute("SELECT signature FROM pest_source WHERE id = 1").fetchone()
+        conn.execute(f"SELECT 1 FROM {PESTICIDE_TABLE} LIMIT 1")  # 약제 테이블 이전에 적재한 DB도 다시 적재
+    except Exception:
+        return False
+    return row is not None and row[0] == signature
+
+
+def ensure_pest_store(conn, data_dir='data'):
+    """원본 CSV가 바뀌었거나 테이블이 없으면 다시 적재 → 현재 서명(캐시 키) 반환"""
+    signature = source_signature(data_dir)
+    if not pest_store_current(conn, signature):
+        ingest_pest_csvs(conn, data_dir)
+    return signature
+
+
+def _where(crop=None, month=None, year=None):
+    where, params = [], []
+    for col, value in (('작물', crop), ('월', month), ('연도', year)):
+        if value is not None:
+            where.append(f"{col} = ?")
+            params.append(value if col == '작물' else int(value))
+    return (f" WHERE {' AND '.join(where)}" if where else ""), params
+
+
+def list_crops(conn):
+    """작물 목록 (공고 건수 많은 순)"""
+    return [r[0] for r in conn.execute(f"SELECT 작물 FROM {PEST_TABLE} GROUP BY 작물 ORDER BY COUNT(*) DESC, 작물")]
+
+
+def list_months(conn, crop=None):
+    """공고가 있는 월 목록"""
+    where_sql, params = _where(crop)
+    sql = f"SELECT DISTINCT 월 FROM {PEST_TABLE}{where_sql}{' AND' if where_sql else ' WHERE'} 월 IS NOT NULL ORDER BY 월"
+    return [r[0] for r in conn.execute(sql, params)]
+
+
+def list_years(conn, crop=None):
+    """공고가 있는 연도 목록"""
+    where_sql, params = _where(crop)
+    sql = f"SELECT DISTINCT 연도 FROM {PEST_TABLE}{where_sql}{' AND' if where_sql else ' WHERE'} 연도 IS NOT NULL ORDER BY 연도"
+    return [r[0] for r in conn.execute(sql, params)]
+
+
+def top_pests(conn, crop, month=None, year=None, top_n=5):
+    """작물(·월·연도) 기준 병해충 공고 건수 TOP N"""
+    where_sql, params = _where(crop, month, year)
+    sql = (f"SELECT 병해충 AS 병해충명, COUNT(*) AS 발생건수 FROM {PEST_TABLE}{where_sql} "
+           f"GROUP BY 병해충 ORDER BY 발생건수 DESC, 병해충 LIMIT ?")
+    return pd.read_sql(sql, conn, params=params + [int(top_n)])
+
+
+def monthly_trend(conn, crop, year=None):
+    """작물 기준 월별 공고 건수 추이"""
+    where_sql, params = _where(crop, year=year)
+    sql = f"SELECT 월, COUNT(*) AS 공고건수 FROM {PEST_TABLE}{where_sql} GROUP BY 월 ORDER BY 월"
+    return pd.read_sql(sql, conn, params=params)
+
+
+def pesticides_for(conn, crop, pests, month=None, year=None):
+    """작물·병해충별 방제약 (중복 제거)"""
+    if not pests:
+        return pd.DataFrame(columns=['병해충', '방제약'])
+    where_sql, params = _where(crop, month, year)
+    sql = (f"SELECT DISTINCT 병해충, 방제약 FROM {PEST_TABLE}{where_sql}"
+           f"{' AND' if where_sql else ' WHERE'} 병해충 IN ({', '.join('?' * len(pests))}) ORDER BY 병해충")
+    return pd.read_sql(sql, conn, params=params + list(pests))
+
+
+def query_bulletins(conn, crop=None, month=None, year=None):
+    """정규화된 공고 조회"""
+    where_sql, params = _where(crop, month, year)
+    return pd.read_sql(f"SELECT {', '.join(BULLETIN_COLUMNS)} FROM {PEST_TABLE}{where_sql} ORDER BY 연도, 월", conn, params=params)
@@ -1,26 +1,23 @@
+import logging
 import pandas as pd
-import streamlit as st
+from modules.metrics import trace
+from modules.schema import apply_schema
 
+logger = logging.getLogger(__name__)
+
+@trace('preprocess_weather')
 def preprocess_weather(df, debug=False):
-    """기상 데이터 전처리"""
+    """기상 데이터 전처리 (스키마 dtype으로 한 번에 변환, 결측은 NaN 유지, 원본 변경 없음)"""
     if debug:
-        st.info("📦 기상 데이터 전처리 중...")
-
-    if '일시' in df.columns:
-        df['일시'] = pd.to_datetime(df['일시'], errors='coerce')
-
-    target_keywords = ['기온', '강수량', '습도', '풍속']
-    for key in target_keywords:
-        target_cols = [col for col in df.columns if key in col]
-        for col in target_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        logger.info("📦 기상 데이터 전처리 중...")
 
-    return df
+    return apply_schema(df)
 
+@trace('preprocess_sunshine')
 def preprocess_sunshine(df, debug=False):
     """일조량 데이터 전처리"""
     if debug:
-        st.info("🌞 일조량 데이터 전처리 중...")
+        logger.info("🌞 일조량 데이터 전처리 중...")
 
     if '일시' in df.columns:
         df['일시'] = pd.to_datetime(df['일시'], errors='coerce')
@@ -29,10 +26,11 @@ def preprocess_sunshine(df, debug=False):
 
     return df
 
+@trace('preprocess_pest_disease')
 def preprocess_pest_disease(df, debug=False):
     """병해충 데이터 전처리"""
     if debug:
-        st.info("🐛 병해충 데이터 전처리 중...")
+        logger.info("🐛 병해충 데이터 전처리 중...")
 
     if '월' in df.columns:
         df['월'] = pd.to_numeric(df['월'], errors='coerce').fillna(0).astype(int)
@@ -0,0 +1,143 @@
+"""데이터 버전별 공유 데이터 등록소 (프로세스당 한 벌, 세션은 복사 없이 빌려 씀)
+
+st.cache_data는 반환값을 pickle로 저장해 두고 호출할 때마다 새로 역직렬화한 사본을 돌려주므로,
+세션이 많아지면 같은 기상 DataFrame이 세션 수만큼 메모리에 생깁니다. 여기서는 (이름, 인자)마다
+최신 버전의 값 하나만 두고, 호출한 쪽에는 버퍼를 공유하는 얕은 사본(DataFrame.copy(deep=False))을 줍니다.
+pandas Copy-on-Write(pandas 3부터 기본) 덕분에 빌린 쪽이 컬럼을 추가하거나 값을 고쳐도 공유 버퍼는 바뀌지 않습니다
+(requirements.txt가 pandas>=3을 요구하며, 전역 설정을 바꾸지 않도록 2.x에서는 불러올 때 오류를 냅니다).
+버전이 바뀌면 이전 값은 교체되므로 세션 수와 무관하게 (이름, 인자)당 한 벌만 남습니다.
+
+    @metered_cache('load_weather', shared_cache('token'))
+    def _load_weather(stations, start, end, columns, token): ...
+"""
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+if int(pd.__version__.split('.')[0]) < 3:
+    raise ImportError("공유 데이터 등록소에는 Copy-on-Write가 기본인 pandas 3 이상이 필요합니다: pip install 'pandas>=3'")
+
+MAX_ENTRIES = 256
+
+
+def _freeze_key(value):
+    """인자 → 해시 가능한 키 (리스트·집합·딕셔너리는 튜플로)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_key(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze_key(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze_key(v)) for k, v in value.items()))
+    return value
+
+
+def _freeze(value):
+    """저장할 값의 numpy 배열은 읽기 전용으로 (DataFrame은 Copy-on-Write로 보호)"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def borrow(value):
+    """공유 값 → 호출한 쪽에 줄 값 (DataFrame/Series는 버퍼를 공유하는 얕은 사본)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(borrow(item) for item in value)
+    return value
+
+
+def nbytes(value):
+    """공유 값의 대략적인 메모리 크기 (bytes)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sum(nbytes(item) for item in value)
+    return 0
+
+
+class DataRegistry:
+    """(이름, 인자) → (버전, 값) 등록소 — 스레드 안전, 같은 키는 동시에 요청돼도 한 번만 계산"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, key, version, build):
+        """버전이 같은 값이 있으면 빌려 주고, 없거나 버전이 다르면 build()로 만들어 교체"""
+        slot = (name, key)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(slot)
+                return borrow(entry[1])
+            lock = self._building.setdefault(slot, threading.Lock())
+        with lock:
+            with self._lock:  # 기다리는 동안 다른 스레드가 만들었으면 그대로 사용
+                entry = self._entries.get(slot)
+                if entry is not None and entry[0] == version:
+                    return borrow(entry[1])
+            value = _freeze(build())
+            with self._lock:
+                self._entries[slot] = (version, value)
+                self._entries.move_to_end(slot)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return borrow(value)
+
+    def clear(self, name=None):
+        with self._lock:
+            for slot in [s for s in self._entries if name is None or s[0] == name]:
+                del self._entries[slot]
+
+    def stats(self):
+        """이름별 (항목 수, 메모리 bytes)"""
+        with self._lock:
+            entries = list(self._entries.items())
+        out = {}
+        for (name, _), (_, value) in entries:
+            count, size = out.get(name, (0, 0))
+            out[name] = (count + 1, size + nbytes(value))
+        return out
+
+
+SHARED = DataRegistry()
+
+
+def shared_cache(version_arg, registry=None):
+    """metered_cache에 넘길 캐시 데코레이터: version_arg 인자를 버전으로, 나머지 인자를 키로 등록소에 보관
+
+    st.cache_data처럼 '_'로 시작하는 인자는 키에서 뺍니다.
+    """
+    registry = registry or SHARED
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            version = bound.arguments[version_arg]
+            key = _freeze_key([(k, v) for k, v in bound.arguments.items()
+                               if k != version_arg and not k.startswith('_')])
+            return registry.get(name, key, version, lambda: fn(*args, **kwargs))
+
+        wrapper.clear = lambda: registry.clear(name)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,107 @@
+import pandas as pd
+from modules.schema import agg_rule
+from modules.weather_query import WEATHER_TABLE, get_weather_columns, quote_ident
+
+ROLLUP_TABLES = {'month': 'asos_monthly', 'year': 'asos_yearly'}
+ROLLUP_KEYS = {'month': ['지점명', '연도', '월'], 'year': ['지점명', '연도']}
+
+AGG_SQL = {'mean': 'AVG', 'sum': 'SUM', 'min': 'MIN', 'max': 'MAX'}
+
+
+def is_rollup_column(col):
+    """집계 대상 수치 컬럼 여부 (지점번호, 날짜/풍향 코드 컬럼 제외)"""
+    return col not in ('지점', '지점명', '일시') and '나타난날' not in col and '풍향' not in col
+
+
+def rollup_columns(conn):
+    """롤업 테이블에 들어갈 원본 컬럼 목록"""
+    return [c for c in get_weather_columns(conn) if is_rollup_column(c)]
+
+
+def rollup_select_sql(conn, level, where_sql=''):
+    """원본 관측에서 롤업 행을 만드는 SELECT 문"""
+    select = ["지점명", "CAST(substr(일시, 1, 4) AS INTEGER) AS 연도"]
+    group = ["지점명", "substr(일시, 1, 4)"]
+    if level == 'month':
+        select.append("CAST(substr(일시, 6, 2) AS INTEGER) AS 월")
+        group.append("substr(일시, 6, 2)")
+    select.append("COUNT(*) AS 관측수")
+    select += [f"{AGG_SQL[agg_rule(c)]}({quote_ident(c)}) AS {quote_ident(c)}" for c in rollup_columns(conn)]
+    return (f"SELECT {', '.join(select)} FROM {WEATHER_TABLE}{where_sql} "
+            f"GROUP BY {', '.join(group)}")
+
+
+def rollups_ready(conn):
+    """롤업 테이블이 모두 있는지"""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return all(table in existing for table in ROLLUP_TABLES.values())
+
+
+def ensure_rollups(conn):
+    """롤업 테이블이 없으면 생성 후 전체 집계"""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for level, table in ROLLUP_TABLES.items():
+        if table in existing:
+            continue
+        keys = ROLLUP_KEYS[level]
+        cols = ', '.join(f"{quote_ident(c)} REAL" for c in rollup_columns(conn))
+        key_cols = ', '.join(f"{k} {'TEXT' if k == '지점명' else 'INTEGER'} NOT NULL" for k in keys)
+        with conn:
+            conn.execute(f"CREATE TABLE {table} ({key_cols}, 관측수 INTEGER, {cols}, "
+                         f"PRIMARY KEY ({', '.join(keys)}))")
+            conn.execute(f"INSERT INTO {table} {rollup_select_sql(conn, level)}")
+
+
+def refresh_rollups(conn, partitions=None):
+    """롤업 갱신: partitions=[(지점명, 'YYYY-MM'), ...]만 다시 집계 (None이면 전체)
+
+    트랜잭션은 호출한 쪽에서 관리합니다.
+    """
+    if partitions is None:
+        for level, table in ROLLUP_TABLES.items():
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"INSERT INTO {table} {rollup_select_sql(conn, level)}")
+        return
+
+    months = sorted(set(partitions))
+    years = sorted({(station, month[:4]) for station, month in months})
+    for level, targets in (('month', months), ('year', years)):
+        table = ROLLUP_TABLES[level]
+        select_sql = rollup_select_sql(conn, level, " WHERE 지점명 = ? AND 일시 >= ? AND 일시 < ?")
+        for station, prefix in targets:
+            if level == 'month':
+                conn.execute(f"DELETE FROM {table} WHERE 지점명 = ? AND 연도 = ? AND 월 = ?",
+                             (station, int(prefix[:4]), int(prefix[5:7])))
+            else:
+                conn.execute(f"DELETE FROM {table} WHERE 지점명 = ? AND 연도 = ?", (station, int(prefix)))
+            conn.execute(f"INSERT INTO {table} {select_sql}", (station, prefix, prefix + '~'))
+
+
+def query_rollup(conn, level='month', stations=None, start_year=None, end_year=None, columns=None):
+    """롤업 테이블 조회 (지점/연도 범위/컬럼 선택)"""
+    if level not in ROLLUP_TABLES:
+        raise ValueError(f"지원하지 않는 롤업 단위입니다: {level}")
+    available = rollup_columns(conn)
+    columns = available if columns is None else list(columns)
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ValueError(f"롤업에 없는 컬럼입니다: {unknown}")
+
+    where, params = [], []
+    if stations is not None:
+        stations = [stations] if isinstance(stations, str) else list(stations)
+        where.append(f"지점명 IN ({', '.join('?' * len(stations))})")
+        params.extend(stations)
+    if start_year is not None:
+        where.append("연도 >= ?")
+        params.append(int(start_year))
+    if end_year is not None:
+        where.append("연도 <= ?")
+        params.append(int(end_year))
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+    keys = ROLLUP_KEYS[level]
+    select = keys + ['관측수'] + [quote_ident(c) for c in columns]
+    sql = (f"SELECT {', '.join(select)} FROM {ROLLUP_TABLES[level]}{where_sql} "
+           f"ORDER BY {', '.join(keys)}")
+    return pd.read_sql(sql, conn, params=params)
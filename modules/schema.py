@@ -0,0 +1,178 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# KMA ASOS 월자료(asos_weather) 컬럼 정의: (컬럼명, 표준 키, dtype, 단위, 집계 방식)
+# dtype: float32 관측값 / Int32 날짜코드(yyyymmdd, 결측 허용) / Int16 풍향(16방위) / category 지점명
+KMA_COLUMNS = [
+    ('지점', 'station_id', 'Int32', None, None),
+    ('지점명', 'station', 'category', None, None),
+    ('일시', 'date', 'datetime64[ns]', None, None),
+    ('평균기온(°C)', 'temp_mean', 'float32', '°C', 'mean'),
+    ('평균최고기온(°C)', 'temp_max_mean', 'float32', '°C', 'mean'),
+    ('평균최저기온(°C)', 'temp_min_mean', 'float32', '°C', 'mean'),
+    ('최고기온(°C)', 'temp_max', 'float32', '°C', 'max'),
+    ('최저기온(°C)', 'temp_min', 'float32', '°C', 'min'),
+    ('최고기온 나타난날(yyyymmdd)', 'temp_max_day', 'Int32', 'yyyymmdd', None),
+    ('최저기온 나타난날(yyyymmdd)', 'temp_min_day', 'Int32', 'yyyymmdd', None),
+    ('평균현지기압(hPa)', 'pressure_local_mean', 'float32', 'hPa', 'mean'),
+    ('평균해면기압(hPa)', 'pressure_sea_mean', 'float32', 'hPa', 'mean'),
+    ('최고해면기압(hPa)', 'pressure_sea_max', 'float32', 'hPa', 'max'),
+    ('최저해면기압(hPa)', 'pressure_sea_min', 'float32', 'hPa', 'min'),
+    ('최고해면기압 나타난날(yyyymmdd)', 'pressure_sea_max_day', 'Int32', 'yyyymmdd', None),
+    ('최저해면기압 나타난날(yyyymmdd)', 'pressure_sea_min_day', 'Int32', 'yyyymmdd', None),
+    ('평균수증기압(hPa)', 'vapor_mean', 'float32', 'hPa', 'mean'),
+    ('최고수증기압(hPa)', 'vapor_max', 'float32', 'hPa', 'max'),
+    ('최저수증기압(hPa)', 'vapor_min', 'float32', 'hPa', 'min'),
+    ('최고수증기압 나타난날(yyyymmdd)', 'vapor_max_day', 'Int32', 'yyyymmdd', None),
+    ('최저수증기압 나타난날(yyyymmdd)', 'vapor_min_day', 'Int32', 'yyyymmdd', None),
+    ('평균이슬점온도(°C)', 'dewpoint_mean', 'float32', '°C', 'mean'),
+    ('평균상대습도(%)', 'humidity_mean', 'float32', '%', 'mean'),
+    ('최소상대습도(%)', 'humidity_min', 'float32', '%', 'min'),
+    ('최소상대습도 나타난날(yyyymmdd)', 'humidity_min_day', 'Int32', 'yyyymmdd', None),
+    ('월합강수량(00~24h만)(mm)', 'rain_total', 'float32', 'mm', 'sum'),
+    ('일최다강수량(mm)', 'rain_day_max', 'float32', 'mm', 'max'),
+    ('1시간최다강수량(mm)', 'rain_1h_max', 'float32', 'mm', 'max'),
+    ('10분최다강수량(mm)', 'rain_10m_max', 'float32', 'mm', 'max'),
+    ('일최다강수량 나타난날(yyyymmdd)', 'rain_day_max_day', 'Int32', 'yyyymmdd', None),
+    ('1시간최다강수량 나타난날(yyyymmdd)', 'rain_1h_max_day', 'Int32', 'yyyymmdd', None),
+    ('10분최다강수량 나타난날(yyyymmdd)', 'rain_10m_max_day', 'Int32', 'yyyymmdd', None),
+    ('소형총증발량(mm)', 'evap_small_total', 'float32', 'mm', 'sum'),
+    ('소형일최대증발량(mm)', 'evap_small_day_max', 'float32', 'mm', 'max'),
+    ('대형총증발량(mm)', 'evap_large_total', 'float32', 'mm', 'sum'),
+    ('대형일최대증발량(mm)', 'evap_large_day_max', 'float32', 'mm', 'max'),
+    ('소형일최대증발량 나타난날(yyyymmdd)', 'evap_small_day_max_day', 'Int32', 'yyyymmdd', None),
+    ('대형일최대증발량 나타난날(yyyymmdd)', 'evap_large_day_max_day', 'Int32', 'yyyymmdd', None),
+    ('평균풍속(m/s)', 'wind_mean', 'float32', 'm/s', 'mean'),
+    ('최대풍속(m/s)', 'wind_max', 'float32', 'm/s', 'max'),
+    ('최대순간풍속(m/s)', 'gust_max', 'float32', 'm/s', 'max'),
+    ('최대풍속 풍향(16방위)', 'wind_max_dir', 'Int16', '16방위', None),
+    ('최대순간풍속 풍향(16방위)', 'gust_max_dir', 'Int16', '16방위', None),
+    ('최대풍속 나타난날(yyyymmdd)', 'wind_max_day', 'Int32', 'yyyymmdd', None),
+    ('최대순간풍속 나타난날(yyyymmdd)', 'gust_max_day', 'Int32', 'yyyymmdd', None),
+    ('최다풍향(16방위)', 'wind_mode_dir', 'Int16', '16방위', None),
+    ('평균운량(1/10)', 'cloud_mean', 'float32', '1/10', 'mean'),
+    ('평균중하층운량(1/10)', 'cloud_low_mean', 'float32', '1/10', 'mean'),
+    ('합계 일조시간(hr)', 'sunshine_total', 'float32', 'hr', 'sum'),
+    ('일조율(%)', 'sunshine_ratio', 'float32', '%', 'mean'),
+    ('합계 일사량(MJ/m2)', 'radiation_total', 'float32', 'MJ/m2', 'sum'),
+    ('최심적설(cm)', 'snow_depth_max', 'float32', 'cm', 'max'),
+    ('최심신적설(cm)', 'snow_new_max', 'float32', 'cm', 'max'),
+    ('3시간신적설합(cm)', 'snow_3h_total', 'float32', 'cm', 'sum'),
+    ('최심적설 나타난날(yyyymmdd)', 'snow_depth_max_day', 'Int32', 'yyyymmdd', None),
+    ('최심신적설 나타난날(yyyymmdd)', 'snow_new_max_day', 'Int32', 'yyyymmdd', None),
+    ('평균 최저초상온도(°C)', 'grass_min_mean', 'float32', '°C', 'mean'),
+    ('최저초상온도(°C)', 'grass_min', 'float32', '°C', 'min'),
+    ('최저초상온도 나타난날(yyyymmdd)', 'grass_min_day', 'Int32', 'yyyymmdd', None),
+    ('평균지면온도(°C)', 'ground_temp_mean', 'float32', '°C', 'mean'),
+    ('0.05m평균지중온도(°C)', 'soil_temp_005', 'float32', '°C', 'mean'),
+    ('0.1m평균지중온도(°C)', 'soil_temp_010', 'float32', '°C', 'mean'),
+    ('0.2m평균지중온도(°C)', 'soil_temp_020', 'float32', '°C', 'mean'),
+    ('0.3m평균지중온도(°C)', 'soil_temp_030', 'float32', '°C', 'mean'),
+    ('0.5m평균지중온도(°C)', 'soil_temp_050', 'float32', '°C', 'mean'),
+    ('1.0m평균지중온도(°C)', 'soil_temp_100', 'float32', '°C', 'mean'),
+    ('1.5m평균지중온도(°C)', 'soil_temp_150', 'float32', '°C', 'mean'),
+    ('3.0m평균지중온도(°C)', 'soil_temp_300', 'float32', '°C', 'mean'),
+    ('5.0m평균지중온도(°C)', 'soil_temp_500', 'float32', '°C', 'mean'),
+]
+
+SCHEMA = {col: {'key': key, 'dtype': dtype, 'unit': unit, 'agg': agg} for col, key, dtype, unit, agg in KMA_COLUMNS}
+KEY_TO_COLUMN = {spec['key']: col for col, spec in SCHEMA.items()}
+
+# 롤업 테이블의 키 컬럼 dtype
+ROLLUP_DTYPES = {'연도': 'int32', '월': 'int8', '관측수': 'int32'}
+
+
+def column_for(key):
+    """표준 키 → 컬럼명 (예: 'temp_mean' → '평균기온(°C)')"""
+    return KEY_TO_COLUMN[key]
+
+
+def agg_rule(col):
+    """컬럼 집계 방식 (평균/합계/최대/최소) — 스키마에 없는 컬럼은 KMA 컬럼명 규칙으로 추정"""
+    spec = SCHEMA.get(col)
+    if spec and spec['agg']:
+        return spec['agg']
+    if col.startswith('평균'):
+        return 'mean'
+    if any(k in col for k in ('최고', '최대', '최다', '최심')):
+        return 'max'
+    if any(k in col for k in ('최저', '최소')):
+        return 'min'
+    if any(k in col for k in ('합', '총')):
+        return 'sum'
+    return 'mean'
+
+
+def column_dtype(col):
+    """컬럼의 메모리용 dtype (스키마/롤업 키가 아니면 None)"""
+    spec = SCHEMA.get(col)
+    if spec:
+        return spec['dtype']
+    return ROLLUP_DTYPES.get(col)
+
+
+@lru_cache(maxsize=1024)
+def find_column(columns, keywords):
+    """컬럼명 튜플에서 표준 키 또는 키워드가 포함된 첫 컬럼 (없으면 None) — 결과 캐시"""
+    for keyword in keywords:
+        col = KEY_TO_COLUMN.get(keyword)
+        if col in columns:
+            return col
+    for col in columns:
+        if any(k in col for k in keywords):
+            return col
+    return None
+
+
+def widen(values):
+    """float32 값 → float64 (유효숫자 7자리로 반올림해 30.9가 30.899999618…로 바뀌지 않게, float64는 그대로)"""
+    values = np.asarray(values)
+    if values.dtype != np.float32:
+        return values.astype('float64')
+    wide = values.astype('float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        digits = np.where(np.isfinite(wide) & (wide != 0), 6 - np.floor(np.log10(np.abs(wide))), 0)
+    scale = 10.0 ** digits
+    return np.where(np.isfinite(wide), np.round(wide * scale) / scale, wide)
+
+
+def _convert(values, dtype):
+    if dtype == 'category':
+        return values.astype('category')
+    if dtype.startswith('datetime'):
+        return pd.to_datetime(values, errors='coerce')
+    if values.dtype == object:
+        values = pd.to_numeric(values, errors='coerce')
+    if dtype.startswith('Int'):
+        # yyyymmdd/풍향은 float32로 표현하면 자릿수가 깨지므로 결측 허용 정수로 보관
+        return values.round().astype(dtype)
+    if dtype == 'float64' and values.dtype == np.float32:
+        return pd.Series(widen(values), index=values.index, name=values.name)
+    return values.astype(dtype)
+
+
+def apply_schema(df, float_dtype='float32'):
+    """스키마에 맞춘 dtype의 새 DataFrame (원본은 변경하지 않음)
+
+    수치 컬럼은 float32, 지점명은 category, 일시는 datetime으로 한 번에 변환하며
+    결측값은 0으로 채우지 않고 NaN/<NA>로 유지합니다.
+    임계값 비교·점수 계산·내보내기처럼 값이 그대로 쓰이는 조회는 float_dtype='float64'로 부릅니다
+    (float32로 줄인 30.9는 float64 30.9보다 작아 '>= 30.9' 비교에서 빠짐).
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        dtype = column_dtype(col)
+        if dtype is None and pd.api.types.is_float_dtype(values):
+            dtype = 'float32'  # 스키마 밖의 수치 컬럼(롤업 집계값 등)
+        if dtype == 'float32':
+            dtype = float_dtype
+        columns[col] = values if dtype is None or str(values.dtype) == dtype else _convert(values, dtype)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def memory_mb(df):
+    """DataFrame 메모리 사용량(MB, 문자열 포함)"""
+    return df.memory_usage(deep=True).sum() / 2**20
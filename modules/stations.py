@@ -0,0 +1,148 @@
+"""관측소 공간 색인: 최근접(k개)·반경 검색과 역거리 가중(IDW) 보간
+
+지점 좌표를 단위 구 위의 3차원 벡터로 바꿔 두고, 질의 좌표 묶음과의 내적(행렬 곱) 한 번으로
+모든 점×관측소 거리를 구합니다. 내적이 클수록 대원 거리가 짧으므로 정렬은 내적으로 하고
+반환할 때만 km로 바꿉니다. 점이 많으면 CHUNK_CELLS 단위로 나눠 메모리를 제한합니다.
+"""
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+
+# 기상청 ASOS 관측소 위치: 지점명 → (지점번호, 위도, 경도)
+STATION_COORDS = {
+    '제주': (184, 33.51411, 126.52969),
+    '고산': (185, 33.29382, 126.16283),
+    '성산': (188, 33.38677, 126.88020),
+    '서귀포': (189, 33.24616, 126.56530),
+    '완도': (170, 34.39590, 126.70182),
+    '고흥': (262, 34.61826, 127.27572),
+}
+
+# 한 번에 계산할 (점 수 × 관측소 수) 상한
+CHUNK_CELLS = 1 << 22
+
+
+def unit_vectors(lat, lon):
+    """위도/경도(도) 배열 → (n, 3) 단위 벡터"""
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 좌표(배열 브로드캐스트 가능) 사이 대원 거리(km)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _dot_to_km(dot):
+    # 단위 벡터 내적 → 현 길이 → 대원 거리 (가까운 거리에서도 arccos보다 정확)
+    chord = np.sqrt(np.clip(2 - 2 * dot, 0, 4))
+    return 2 * EARTH_RADIUS_KM * np.arcsin(chord / 2)
+
+
+def _km_to_dot(km):
+    return 1 - 2 * np.sin(np.minimum(km / EARTH_RADIUS_KM, np.pi) / 2) ** 2
+
+
+class StationIndex:
+    """관측소 좌표 색인
+
+        index = StationIndex.from_names(['제주', '서귀포'])
+        dist, idx = index.query(df['위도'], df['경도'], k=2)
+        df['지점명'] = index.names[idx[:, 0]]
+    """
+
+    def __init__(self, names, lat, lon):
+        self.names = np.asarray(names, dtype=object)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        if not len(self.names):
+            raise ValueError("관측소가 없습니다.")
+        self._xyz = unit_vectors(self.lat, self.lon)
+
+    @classmethod
+    def from_names(cls, names=None, coords=STATION_COORDS):
+        """지점명 목록(없으면 좌표가 있는 전체) → 색인 (좌표를 모르는 지점은 제외)"""
+        names = [n for n in (coords if names is None else names) if n in coords]
+        return cls(names, [coords[n][1] for n in names], [coords[n][2] for n in names])
+
+    def __len__(self):
+        return len(self.names)
+
+    def _chunks(self, lat, lon):
+        xyz = unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        step = max(1, CHUNK_CELLS // len(self))
+        for start in range(0, len(xyz), step):
+            yield start, xyz[start:start + step] @ self._xyz.T
+
+    def query(self, lat, lon, k=1):
+        """각 점에서 가까운 관측소 k개 → (거리 km (n, k), 관측소 위치 (n, k)), 가까운 순"""
+        k = min(k, len(self))
+        n = np.atleast_1d(lat).shape[0]
+        dist, idx = np.empty((n, k)), np.empty((n, k), dtype=np.intp)
+        for start, dot in self._chunks(lat, lon):
+            if k < len(self):
+                part = np.argpartition(-dot, k - 1, axis=1)[:, :k]
+            else:
+                part = np.broadcast_to(np.arange(k), (len(dot), k))
+            part_dot = np.take_along_axis(dot, part, axis=1)
+            order = np.argsort(-part_dot, axis=1, kind='stable')
+            stop = start + len(dot)
+            idx[start:stop] = np.take_along_axis(part, order, axis=1)
+            dist[start:stop] = _dot_to_km(np.take_along_axis(part_dot, order, axis=1))
+        return dist, idx
+
+    def nearest(self, lat, lon):
+        """각 점의 최근접 관측소 → (지점명 배열, 거리 km 배열)"""
+        dist, idx = self.query(lat, lon, k=1)
+        names = self.names[idx[:, 0]]
+        names[np.isnan(dist[:, 0])] = None  # 좌표 결측
+        return names, dist[:, 0]
+
+    def query_radius(self, lat, lon, radius_km):
+        """반경 안의 (점 위치, 관측소 위치, 거리 km) 쌍 — 점 순서, 같은 점 안에서는 가까운 순"""
+        threshold = _km_to_dot(float(radius_km))
+        points, stations, dots = [], [], []
+        for start, dot in self._chunks(lat, lon):
+            p, s = np.nonzero(dot >= threshold)
+            points.append(p + start)
+            stations.append(s)
+            dots.append(dot[p, s])
+        points, stations, dots = (np.concatenate(a) for a in (points, stations, dots))
+        order = np.lexsort((-dots, points))
+        return points[order], stations[order], _dot_to_km(dots[order])
+
+    def idw(self, lat, lon, values, k=3, power=2.0, radius_km=None):
+        """가까운 관측소 k개 값의 역거리 가중 평균
+
+        values: 관측소 순서(self.names)의 (관측소 수,) 또는 (관측소 수, 항목 수) 배열.
+        결측 관측값은 가중치에서 빼고, 관측소와 같은 위치(거리 0)는 그 관측소 값을 그대로 씁니다.
+        radius_km를 주면 반경 밖 관측소는 제외 (모두 밖이면 NaN).
+        """
+        values = np.asarray(values, dtype=float)
+        flat = values.ndim == 1
+        values = values[:, None] if flat else values
+        dist, idx = self.query(lat, lon, k)
+        near = values[idx]                                   # (n, k, 항목)
+        with np.errstate(divide='ignore'):
+            weight = np.where(dist > 1e-9, dist ** -power, np.inf)
+        if radius_km is not None:
+            weight = np.where(dist <= radius_km, weight, 0.0)
+        exact = np.isinf(weight)
+        weight = np.where(exact.any(axis=1, keepdims=True), exact.astype(float), weight)
+        weight = np.where(np.isnan(near), 0.0, weight[:, :, None])
+        total = weight.sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            out = np.nansum(near * weight, axis=1) / total
+        out[total == 0] = np.nan
+        return out[:, 0] if flat else out
+
+
+def nearest_stations(df, index, lat_col='위도', lon_col='경도'):
+    """좌표 DataFrame에 최근접 관측소(지점명)와 거리(관측소거리(km)) 컬럼을 붙인 새 DataFrame"""
+    names, dist = index.nearest(df[lat_col].to_numpy(dtype=float), df[lon_col].to_numpy(dtype=float))
+    return df.assign(지점명=pd.Series(names, index=df.index, dtype=object),
+                     **{'관측소거리(km)': np.round(dist, 2)})
@@ -0,0 +1,163 @@
+import numpy as np
+from modules.metrics import trace
+
+# 원본 데이터의 기상 컬럼명 (DB 컬럼명과 일치)
+SOURCE_COLUMNS = ['평균기온(°C)', '평균상대습도(%)', '월합강수량(00~24h만)(mm)', '평균풍속(m/s)', '합계 일조시간(hr)']
+# 집계 후 사용할 분석용 컬럼명 (SOURCE_COLUMNS와 같은 순서)
+ANALYSIS_COLUMNS = ['평균기온(°C)', '평균상대습도(%)', '월합강수량(mm)', '평균풍속(m/s)', '월합일조시간(hr)']
+FLAG_COLUMNS = ['기온적합', '습도적합', '강수적합', '풍속적합', '일조적합']
+
+# 적합도 기준 (월 기준)
+DEFAULT_CRITERIA = {
+    '기온': (16, 23), '습도': (60, 85), '강수': (30, 150), '풍속_max': 4, '일조_min': 100
+}
+SPECIAL_CRITERIA_NOV = {
+    '기온': (10, 18), '습도': (55, 80), '강수': (10, 120), '풍속_max': 5, '일조_min': 70
+}
+SPECIAL_CRITERIA_WINTER = {
+    '기온': (5, 15), '습도': (50, 80), '강수': (10, 100), '풍속_max': 6, '일조_min': 60
+}
+SPECIAL_CRITERIA_SUMMER = {
+    '기온': (22, 30), '습도': (70, 90), '강수': (100, 300), '풍속_max': 5, '일조_min': 150
+}
+
+# 기준 이름 → (기준, 안내 문구)
+CRITERIA_SETS = {
+    'default': (DEFAULT_CRITERIA, "일반(봄/가을철) 적합도 기준이 적용되었습니다."),
+    'nov': (SPECIAL_CRITERIA_NOV, "11월 특별 적합도 기준이 적용되었습니다."),
+    'winter': (SPECIAL_CRITERIA_WINTER, "겨울철 특별 적합도 기준이 적용되었습니다."),
+    'summer': (SPECIAL_CRITERIA_SUMMER, "여름철 특별 적합도 기준이 적용되었습니다."),
+}
+
+
+def criteria_name(month):
+    """월 → 적용할 기준 이름"""
+    if month == 11:
+        return 'nov'
+    if month in (12, 1, 2):
+        return 'winter'
+    if month in (7, 8):
+        return 'summer'
+    return 'default'
+
+
+def criteria_bounds(criteria):
+    """기준 딕셔너리 → 지표별 (하한, 상한) 배열 (한쪽 기준은 ±inf)"""
+    lo = np.array([criteria['기온'][0], criteria['습도'][0], criteria['강수'][0], -np.inf, criteria['일조_min']], dtype=float)
+    hi = np.array([criteria['기온'][1], criteria['습도'][1], criteria['강수'][1], criteria['풍속_max'], np.inf], dtype=float)
+    return lo, hi
+
+
+def criteria_table(criteria_sets=CRITERIA_SETS):
+    """1~12월 기준표: (13, 5) 하한/상한 배열 (월 번호로 바로 인덱싱, 0행은 미사용)"""
+    lo = np.full((13, len(FLAG_COLUMNS)), np.nan)
+    hi = np.full((13, len(FLAG_COLUMNS)), np.nan)
+    for month in range(1, 13):
+        lo[month], hi[month] = criteria_bounds(criteria_sets[criteria_name(month)][0])
+    return lo, hi
+
+
+def classify(scores):
+    """적합도점수 → 결과 (4점 이상 적합, 2점 이상 부분적합)"""
+    return np.select([scores >= 4, scores >= 2], ['적합', '부분적합'], '부적합')
+
+
+@trace('score_cube')
+def score_cube(df_weather, df_regions, criteria_sets=CRITERIA_SETS):
+    """모든 연도×월×읍면동 적합도를 한 번의 브로드캐스트 비교로 계산
+
+    - df_weather: 지점명, 연도, 월 + ANALYSIS_COLUMNS (지점별 월 집계)
+    - df_regions: 읍면동, 지점명 (읍면동별 대표 관측소)
+    반환: (연도, 월) 정렬된 긴 형태 DataFrame — 기상값이 없는 읍면동도 포함(부적합)
+    """
+    periods = df_weather[['연도', '월']].drop_duplicates()
+    regions = df_regions[['읍면동', '지점명']].drop_duplicates('읍면동')
+    cube = periods.merge(regions, how='cross')
+    cube = cube.merge(df_weather[['지점명', '연도', '월'] + ANALYSIS_COLUMNS],
+                      on=['지점명', '연도', '월'], how='left')
+
+    cube = score_frame(cube, cube['월'].to_numpy(dtype=int), criteria_sets)
+    return cube.sort_values(['연도', '월', '읍면동'], ignore_index=True)
+
+
+def score_frame(df, months, criteria_sets=CRITERIA_SETS):
+    """ANALYSIS_COLUMNS 값이 있는 DataFrame에 월별 기준 적합 플래그·적합도점수·결과 컬럼 추가"""
+    values = df[ANALYSIS_COLUMNS].to_numpy(dtype=float)
+    lo, hi = criteria_table(criteria_sets)
+    months = np.broadcast_to(np.asarray(months, dtype=int), len(df))
+    flags = (values >= lo[months]) & (values <= hi[months])  # NaN 비교는 False → 0점
+
+    df[FLAG_COLUMNS] = flags.astype(np.int8)
+    df['적합도점수'] = flags.sum(axis=1)
+    df['결과'] = classify(df['적합도점수'].to_numpy())
+    return df
+
+
+def _period_range(cube, year, month):
+    keys = cube['연도'].to_numpy(dtype=np.int64) * 100 + cube['월'].to_numpy(dtype=np.int64)
+    key = int(year) * 100 + int(month)
+    return np.searchsorted(keys, key, 'left'), np.searchsorted(keys, key, 'right')
+
+
+def slice_cube(cube, year, month):
+    """점수 큐브에서 (연도, 월) 단면 추출 (정렬된 키에서 이진 탐색)"""
+    start, end = _period_range(cube, year, month)
+    return cube.iloc[start:end].reset_index(drop=True)
+
+
+class CriteriaScorer:
+    """기준 조정(what-if)용 점수기: 바뀐 기준의 플래그 열만 다시 계산
+
+    기준 이름(default/nov/winter/summer)×지표마다 해당 월 행을 값 순으로 정렬해 두고,
+    기준이 바뀌면 [하한, 상한]을 이진 탐색해 그 지표의 플래그 열만 새로 채운 뒤 점수는 차이만큼 고칩니다.
+    큐브는 score_cube 결과((연도, 월) 정렬)를 그대로 씁니다.
+    """
+
+    def __init__(self, cube, criteria_sets=CRITERIA_SETS):
+        self.cube = cube
+        self.values = cube[ANALYSIS_COLUMNS].to_numpy(dtype=float)
+        self.criteria = {name: dict(criteria) for name, (criteria, _) in criteria_sets.items()}
+        season = np.array([criteria_name(m) for m in range(13)], dtype=object)[cube['월'].to_numpy(dtype=int)]
+        self.flags = np.zeros(self.values.shape, dtype=np.int8)
+        self._rows, self._sorted = {}, {}
+        for name in self.criteria:
+            rows = np.nonzero(season == name)[0]
+            self._rows[name] = rows
+            lo, hi = criteria_bounds(self.criteria[name])
+            for j in range(len(ANALYSIS_COLUMNS)):
+                column = self.values[rows, j]
+                valid = ~np.isnan(column)  # 결측은 항상 부적합 → 정렬 대상에서 제외
+                order = np.argsort(column[valid], kind='stable')
+                self._sorted[name, j] = (rows[valid][order], column[valid][order])
+                self._fill(name, j, lo[j], hi[j])
+        self.scores = self.flags.sum(axis=1, dtype=np.int16)
+
+    def _fill(self, name, j, lo, hi):
+        """name 기준 행의 j번 지표 플래그를 [lo, hi]로 다시 채움 → 행별 플래그 변화량"""
+        rows = self._rows[name]
+        positions, values = self._sorted[name, j]
+        before = self.flags[rows, j].copy()
+        self.flags[rows, j] = 0
+        self.flags[positions[np.searchsorted(values, lo, 'left'):np.searchsorted(values, hi, 'right')], j] = 1
+        return self.flags[rows, j] - before
+
+    @trace('rescore_criteria')
+    def update(self, name, criteria):
+        """기준 이름의 기준값 교체 → 다시 계산한 플래그 컬럼 목록 (바뀐 지표가 없으면 빈 목록)"""
+        old_lo, old_hi = criteria_bounds(self.criteria[name])
+        lo, hi = criteria_bounds(criteria)
+        changed = [j for j in range(len(ANALYSIS_COLUMNS)) if (old_lo[j], old_hi[j]) != (lo[j], hi[j])]
+        rows = self._rows[name]
+        for j in changed:
+            self.scores[rows] += self._fill(name, j, lo[j], hi[j])
+        self.criteria[name] = dict(criteria)
+        return [FLAG_COLUMNS[j] for j in changed]
+
+    def slice(self, year, month):
+        """현재 기준의 (연도, 월) 단면 (slice_cube와 같은 형태)"""
+        start, end = _period_range(self.cube, year, month)
+        out = self.cube.iloc[start:end].reset_index(drop=True)
+        out[FLAG_COLUMNS] = self.flags[start:end]
+        out['적합도점수'] = self.scores[start:end]
+        out['결과'] = classify(out['적합도점수'].to_numpy())
+        return out
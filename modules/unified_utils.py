@@ -1,17 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from modules.downsample import line_figure
+from modules.metrics import trace
+from modules.schema import find_column
 
 def get_column(df, keywords, required=True):
-    """컬럼명에 키워드가 포함된 첫번째 컬럼명을 반환"""
-    candidates = [col for col in df.columns if any(k in col for k in keywords)]
-    if not candidates:
-        if required:
-            st.error(f"❗ '{keywords}' 키워드가 포함된 컬럼이 없습니다.")
-            st.stop()
-        else:
-            return None
-    return candidates[0]
+    """표준 키(schema) 또는 키워드가 포함된 첫번째 컬럼명을 반환 (컬럼 구성별로 캐시)"""
+    col = find_column(tuple(df.columns), tuple(keywords))
+    if col is None and required:
+        st.error(f"❗ '{keywords}' 키워드가 포함된 컬럼이 없습니다.")
+        st.stop()
+    return col
 
 def add_month_column(df, date_keywords):
     """날짜 컬럼에서 '월' 컬럼을 추출해서 추가"""
@@ -23,8 +22,9 @@ def add_month_column(df, date_keywords):
         st.warning("⚠️ 날짜 기반 '월' 컬럼을 만들 수 없습니다.")
     return df
 
-def render_line_chart(df, x_col, y_col, title, y_label):
-    """기본 선+점 그래프 그리기"""
-    fig = px.line(df, x=x_col, y=y_col, markers=True, title=title, labels={y_col: y_label})
+def render_line_chart(df, x_col, y_col, title, y_label, color=None):
+    """기본 선+점 그래프 그리기 (계열마다 화면 폭만큼으로 다운샘플링, 점이 많으면 WebGL)"""
+    fig = line_figure(df, x_col, y_col, color=color, markers=True, title=title, labels={y_col: y_label})
     fig.update_layout(yaxis_range=[0, None], xaxis_title='날짜')
-    st.plotly_chart(fig)
+    with trace('plotly_render'):
+        st.plotly_chart(fig)
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import pandas as pd
+
+DB_PATH = os.path.join('data', 'asos_weather.db')
+WEATHER_TABLE = 'asos_weather'
+
+# 페이지에서 자주 읽는 핵심 관측 컬럼 (커버링 인덱스에 포함)
+CORE_COLUMNS = ['평균기온(°C)', '평균상대습도(%)', '월합강수량(00~24h만)(mm)', '평균풍속(m/s)', '합계 일조시간(hr)']
+
+AGG_FUNCS = {'mean': 'AVG', 'sum': 'SUM', 'min': 'MIN', 'max': 'MAX', 'count': 'COUNT'}
+
+# 집계 주기별 '일시' 절단 길이 ('YYYY', 'YYYY-MM', 'YYYY-MM-DD')
+FREQ_LENGTHS = {'year': 4, 'month': 7, 'day': 10}
+
+
+def quote_ident(name):
+    """SQLite 식별자(컬럼명) 인용"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def connect(db_path=DB_PATH):
+    """기상 DB 연결 (없으면 FileNotFoundError)"""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"DB 파일이 존재하지 않습니다: {db_path}")
+    return sqlite3.connect(db_path)
+
+
+def ensure_indexes(conn):
+    """(지점명, 일시) 커버링 인덱스와 일시 인덱스 생성"""
+    core = [c for c in CORE_COLUMNS if c in get_weather_columns(conn)]
+    cols = ', '.join(quote_ident(c) for c in ['지점명', '일시'] + core)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_asos_weather_station_date ON {WEATHER_TABLE} ({cols})")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_asos_weather_date ON {WEATHER_TABLE} (일시)")
+    conn.commit()
+
+
+def get_weather_columns(conn):
+    """asos_weather 테이블의 컬럼명 목록"""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({WEATHER_TABLE})")]
+
+
+def get_stations(conn):
+    """관측 지점명 목록 (지점명 인덱스로 조회)"""
+    return [row[0] for row in conn.execute(f"SELECT DISTINCT 지점명 FROM {WEATHER_TABLE} ORDER BY 지점명")]
+
+
+def get_latest_date(conn):
+    """가장 최근 관측 '일시' 값"""
+    return conn.execute(f"SELECT MAX(일시) FROM {WEATHER_TABLE}").fetchone()[0]
+
+
+def date_range_clause(column, start=None, end=None):
+    """'일시' 접두어 기준 포함 구간 조건절과 파라미터"""
+    where, params = [], []
+    if start is not None:
+        where.append(f"{column} >= ?")
+        params.append(str(start))
+    if end is not None:
+        # 접두어 포함 상한: '2024' → '2024~' 미만 ('~'는 숫자/'-'보다 큼)
+        where.append(f"{column} < ?")
+        params.append(str(end) + '~')
+    return where, params
+
+
+def build_weather_query(available, stations=None, start=None, end=None, columns=None,
+                        agg=None, freq=None, by_station=True):
+    """조회 조건으로 SQL 문과 파라미터 생성
+
+    - start/end: '일시' 접두어 기준 포함 구간 ('2020', '2020-03', '2020-03-15')
+    - agg: 'mean' 등 전체 컬럼 공통 집계, 또는 {컬럼: 집계} 딕셔너리
+    - freq: 'year'/'month'/'day' 집계 주기 (agg 사용 시)
+    """
+    if isinstance(agg, dict):
+        columns = list(agg)
+    elif columns is None:
+        columns = [c for c in available if c not in ('지점', '지점명', '일시')]
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ValueError(f"존재하지 않는 컬럼입니다: {unknown}")
+
+    where, params = [], []
+    if stations is not None:
+        stations = [stations] if isinstance(stations, str) else list(stations)
+        where.append(f"지점명 IN ({', '.join('?' * len(stations))})")
+        params.extend(stations)
+    range_where, range_params = date_range_clause('일시', start, end)
+    where += range_where
+    params += range_params
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+    if agg is None:
+        keys = ['지점명', '일시']
+        select = [quote_ident(c) for c in keys + [c for c in columns if c not in keys]]
+        sql = f"SELECT {', '.join(select)} FROM {WEATHER_TABLE}{where_sql} ORDER BY 지점명, 일시"
+        return sql, params
+
+    agg_map = agg if isinstance(agg, dict) else {c: agg for c in columns}
+    bad = {f for f in agg_map.values() if f not in AGG_FUNCS}
+    if bad:
+        raise ValueError(f"지원하지 않는 집계 함수입니다: {bad}")
+    if freq is not None and freq not in FREQ_LENGTHS:
+        raise ValueError(f"지원하지 않는 집계 주기입니다: {freq}")
+
+    group = ['지점명'] if by_station else []
+    select = list(group)
+    if freq is not None:
+        select.append(f"substr(일시, 1, {FREQ_LENGTHS[freq]}) AS 일시")
+        group.append(f"substr(일시, 1, {FREQ_LENGTHS[freq]})")
+    select += [f"{AGG_FUNCS[func]}({quote_ident(col)}) AS {quote_ident(col)}" for col, func in agg_map.items()]
+    sql = f"SELECT {', '.join(select)} FROM {WEATHER_TABLE}{where_sql}"
+    if group:
+        sql += f" GROUP BY {', '.join(group)} ORDER BY {', '.join(group)}"
+    return sql, params
+
+
+def query_weather(conn, stations=None, start=None, end=None, columns=None,
+                  agg=None, freq=None, by_station=True):
+    """필터/컬럼 선택/집계를 SQLite로 내려보내 기상 데이터 조회"""
+    sql, params = build_weather_query(get_weather_columns(conn), stations, start, end,
+                                      columns, agg, freq, by_station)
+    return pd.read_sql(sql, conn, params=params)
@@ -1,90 +1,117 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
 import plotly.express as px
+from modules.db_loader import (load_weather, load_weather_columns, load_latest_date, load_climatology,
+                               load_normals, load_alert_events)
+from modules.alert_rules import ALERT_RULES, active_alerts, alert_episodes
+from modules.climatology import PCT_THRESHOLD, Z_THRESHOLD, evaluate_anomalies
+from modules.metrics import page_run
 
 # 페이지 설정
 st.set_page_config(page_title="실시간 기후 모니터링 및 이상기후 알림", layout="wide", page_icon="🌡️")
+with page_run("실시간 기후 모니터링 및 이상 기후 알림"):
+    st.title("🌡️ 실시간 기후 모니터링 및 이상기후 알림")
 
-st.title("🌡️ 실시간 기후 모니터링 및 이상기후 알림")
-
-st.markdown("""
+    st.markdown("""
 제주도 주요 지역의 **기온, 강수량, 풍속, 주간 예보**를 실시간으로 모니터링합니다.  
 이상기후 발생 가능성이 감지될 경우 **⚠️ 경고 알림**을 제공합니다.
 """)
 
-# 데이터 로딩 (DB에서 직접)
-conn = sqlite3.connect('data/asos_weather.db')
-df_weather = pd.read_sql("SELECT * FROM asos_weather", conn)
-conn.close()
-
-df_weather['일시'] = pd.to_datetime(df_weather['일시'])
-df_weather['월'] = df_weather['일시'].dt.month
-df_weather['연도'] = df_weather['일시'].dt.year
-
-# 오늘 데이터
-today = df_weather['일시'].max()
-today_data = df_weather[df_weather['일시'] == today]
-
-# ✅ 일기온 (평균기온 → 일기온 문구만 변경)
-st.subheader("🌡️ 일기온")
-if not today_data.empty:
-    fig_temp = px.bar(today_data, x='지점명', y='평균기온(°C)', title=f"{today.date()} 일기온 (°C)")
-    st.plotly_chart(fig_temp, use_container_width=True)
-else:
-    st.warning("오늘 기온 데이터가 없습니다.")
-
-# ✅ 일강수량 → 월합강수량(00~24h만)(mm)로 변경
-st.subheader("🌧️ 일강수량")
-if not today_data.empty:
-    if '월합강수량(00~24h만)(mm)' in today_data.columns:
-        fig_rain = px.bar(today_data, x='지점명', y='월합강수량(00~24h만)(mm)', title=f"{today.date()} 일강수량 (mm)")
-        st.plotly_chart(fig_rain, use_container_width=True)
+    # 데이터 로딩 (최근 관측일의 필요한 컬럼만 DB에서 조회)
+    today_cols = ['평균기온(°C)', '월합강수량(00~24h만)(mm)', '평균풍속(m/s)']
+    latest = load_latest_date()
+    today_data = load_weather(start=latest, end=latest,
+                              columns=[c for c in today_cols if c in load_weather_columns()])
+    today_data['일시'] = pd.to_datetime(today_data['일시'])
+
+    # 오늘 데이터
+    today = pd.to_datetime(latest)
+
+    # 같은 달 지점별 평년 범위 (p10~p90, 중앙값)
+    month_normals = load_normals()
+    month_normals = month_normals[month_normals['월'] == today.month]
+
+
+    def add_normal_range(fig, item):
+        """막대 그래프에 지점별 평년 중앙값과 10~90% 범위 표시"""
+        ref = month_normals[(month_normals['항목'] == item) & month_normals['지점명'].isin(today_data['지점명'])]
+        if ref.empty:
+            return fig
+        fig.add_scatter(x=ref['지점명'], y=ref['p50'], mode='markers', name='평년 (10~90%)',
+                        marker=dict(symbol='line-ew-open', size=28, color='gray'),
+                        error_y=dict(type='data', symmetric=False, array=ref['p90'] - ref['p50'],
+                                     arrayminus=ref['p50'] - ref['p10'], color='gray'))
+        return fig
+
+
+    # ✅ 일기온 (평균기온 → 일기온 문구만 변경)
+    st.subheader("🌡️ 일기온")
+    if not today_data.empty:
+        fig_temp = px.bar(today_data, x='지점명', y='평균기온(°C)', title=f"{today.date()} 일기온 (°C)")
+        st.plotly_chart(add_normal_range(fig_temp, '평균기온(°C)'), use_container_width=True)
     else:
-        st.warning("📛 '월합강수량(00~24h만)(mm)' 컬럼이 없습니다.")
-else:
-    st.warning("오늘 강수 데이터가 없습니다.")
-
-# ✅ 평균풍속
-st.subheader("💨 평균풍속")
-if not today_data.empty:
-    fig_wind = px.bar(today_data, x='지점명', y='평균풍속(m/s)', title=f"{today.date()} 평균풍속 (m/s)")
-    st.plotly_chart(fig_wind, use_container_width=True)
-else:
-    st.warning("오늘 풍속 데이터가 없습니다.")
-
-# ✅ 주간 강수 예보 (가상 예시)
-st.subheader("📅 주간 강수량 예보")
-dummy = pd.DataFrame({
-    '날짜': pd.date_range(start=today, periods=7),
-    '예상강수량(mm)': [0, 10, 20, 5, 0, 15, 0]
-})
-fig_forecast = px.bar(dummy, x='날짜', y='예상강수량(mm)', title="주간 강수 예보 (mm)")
-st.plotly_chart(fig_forecast, use_container_width=True)
-
-# ✅ 이상기후 경고 (가상 로직 예시)
-# 안전하게 컬럼 확인 → 없으면 오류 없이 넘어감
-def get_col_mean(df, col):
-    if col in df.columns:
-        return df[col].mean()
+        st.warning("오늘 기온 데이터가 없습니다.")
+
+    # ✅ 일강수량 → 월합강수량(00~24h만)(mm)로 변경
+    st.subheader("🌧️ 일강수량")
+    if not today_data.empty:
+        if '월합강수량(00~24h만)(mm)' in today_data.columns:
+            fig_rain = px.bar(today_data, x='지점명', y='월합강수량(00~24h만)(mm)', title=f"{today.date()} 일강수량 (mm)")
+            st.plotly_chart(add_normal_range(fig_rain, '월합강수량(00~24h만)(mm)'), use_container_width=True)
+        else:
+            st.warning("📛 '월합강수량(00~24h만)(mm)' 컬럼이 없습니다.")
     else:
-        st.warning(f"❗ 컬럼 '{col}'이 없습니다.")
-        return None
-
-st.subheader("⚠️ 이상기후 경고")
-warnings = []
-
-if get_col_mean(today_data, '평균기온(°C)') and get_col_mean(today_data, '평균기온(°C)') >= 30:
-    warnings.append("🔥 고온주의보 (평균기온 30도 이상)")
-
-if get_col_mean(today_data, '월합강수량(00~24h만)(mm)') and get_col_mean(today_data, '월합강수량(00~24h만)(mm)') <= 1:
-    warnings.append("💧 무강수 경고 (1mm 이하)")
+        st.warning("오늘 강수 데이터가 없습니다.")
 
-if get_col_mean(today_data, '평균풍속(m/s)') and get_col_mean(today_data, '평균풍속(m/s)') >= 8:
-    warnings.append("🌪️ 강풍주의보 (풍속 8m/s 이상)")
+    # ✅ 평균풍속
+    st.subheader("💨 평균풍속")
+    if not today_data.empty:
+        fig_wind = px.bar(today_data, x='지점명', y='평균풍속(m/s)', title=f"{today.date()} 평균풍속 (m/s)")
+        st.plotly_chart(add_normal_range(fig_wind, '평균풍속(m/s)'), use_container_width=True)
+    else:
+        st.warning("오늘 풍속 데이터가 없습니다.")
+
+    # ✅ 주간 강수 예보 (가상 예시)
+    st.subheader("📅 주간 강수량 예보")
+    dummy = pd.DataFrame({
+        '날짜': pd.date_range(start=today, periods=7),
+        '예상강수량(mm)': [0, 10, 20, 5, 0, 15, 0]
+    })
+    fig_forecast = px.bar(dummy, x='날짜', y='예상강수량(mm)', title="주간 강수 예보 (mm)")
+    st.plotly_chart(fig_forecast, use_container_width=True)
+
+    # ✅ 이상기후 경고 (지점별 평년값 대비 z점수·백분위)
+    st.subheader("⚠️ 이상기후 경고")
+    st.caption(f"각 관측소의 같은 달 평년값과 비교합니다. (z점수 {Z_THRESHOLD} 이상 또는 상·하위 {100 - PCT_THRESHOLD * 100:.0f}% 이내)")
+
+    scored = load_climatology().score(today_data)
+    anomalies = evaluate_anomalies(scored)
+
+    if anomalies.empty:
+        st.success("현재 이상기후 경고 없음.")
+    else:
+        for _, row in anomalies.iterrows():
+            st.error(f"{row['label']} — {row['지점명']}: {row['항목']} {row['값']:.1f} "
+                     f"(평년 {row['평년값']:.1f}, 편차 {row['편차']:+.1f}, z={row['z점수']:.1f}, 백분위 {row['백분위'] * 100:.0f}%)")
+
+    with st.expander("📊 지점별 평년 대비 현황"):
+        st.dataframe(scored[['지점명', '항목', '값', '평년값', '편차', '표준편차', '표본수', 'z점수', '백분위']].round(2),
+                     use_container_width=True)
+
+    # ✅ 기상 경보 규칙 (항목·임계값·연속 기간, 전체 이력에 한 번에 적용)
+    st.subheader("🚨 기상 경보")
+    st.caption("규칙: " + ", ".join(f"{r['label']} {r['항목']} {r['op']} {r['threshold']:g}"
+                                    + (f" ({r['duration']}기간 연속)" if r.get('duration', 1) > 1 else "")
+                                    for r in ALERT_RULES))
+
+    alert_events = load_alert_events()
+    current = active_alerts(alert_events, latest)
+    if current.empty:
+        st.success("현재 발령 중인 기상 경보 없음.")
+    else:
+        for _, row in current.iterrows():
+            st.error(f"{row['label']} — {row['지점명']}: {row['항목']} {row['값']:.1f} ({row['연속']}기간 연속)")
 
-if warnings:
-    for w in warnings:
-        st.error(w)
-else:
-    st.success("현재 이상기후 경고 없음.")
+    with st.expander("📜 경보 이력"):
+        episodes = alert_episodes(alert_events)
+        st.dataframe(episodes.drop(columns='규칙').round({'극값': 1}), use_container_width=True)
@@ -1,5 +1,7 @@
 import streamlit as st
 from modules.pages_common import render_chart
+from modules.metrics import page_run
 
-st.header("🌡 기온 분석")
-render_chart(keyword='기온', y_label='평균 기온 (°C)', title='월별 평균 기온 추이')
+with page_run("기온 분석"):
+    st.header("🌡 기온 분석")
+    render_chart(keyword='기온', y_label='평균 기온 (°C)', title='월별 평균 기온 추이')
@@ -1,81 +1,151 @@
-import streamlit as st
 import pandas as pd
-import plotly.express as px
-import os
+import streamlit as st
+from modules import core
+from modules.db_loader import load_data_version, load_pest_artifact, load_report_bundle
+from modules.db_pool import read_connection
+from modules.pest_index import PesticideIndex
+from modules.pest_risk import risk_by_month, risk_by_pest, risk_lookup
+from modules.pest_store import list_crops, list_months, top_pests, monthly_trend, pesticides_for
+from modules.metrics import page_run, metered_cache
+from modules.registry import shared_cache
 
 st.set_page_config(page_title="병해충 분석", layout="wide", page_icon="🐛")
+with page_run("병해충 발생 알림"):
+    st.title("🐛 병해충 분석")
+
+    # ✅ 데이터 로딩 (세 CSV를 정규화한 pest_bulletin 테이블, CSV가 바뀔 때만 다시 적재 + 위험도 지수 갱신)
+    def load_pest_signature():
+        return core.pest_signature()
+
+    def run_pest_query(query, *args):
+        # 조회는 프로세스 공용 읽기 전용 연결 풀에서 (적재는 load_pest_signature의 쓰기 연결)
+        with read_connection() as conn:
+            return query(conn, *args)
+
+    # signature: 원본 CSV 서명 — CSV가 바뀌면 캐시 키가 바뀜
+    @metered_cache('load_crops', st.cache_data)
+    def load_crops(signature):
+        return run_pest_query(list_crops)
+
+    @metered_cache('load_months', st.cache_data)
+    def load_months(signature):
+        return run_pest_query(list_months)
+
+    @metered_cache('load_top_pests', st.cache_data)
+    def load_top_pests(signature, crop, month):
+        return run_pest_query(top_pests, crop, month)
+
+    @metered_cache('load_trend', st.cache_data)
+    def load_trend(signature, crop):
+        return run_pest_query(monthly_trend, crop)
+
+    @metered_cache('load_pesticides', st.cache_data)
+    def load_pesticides(signature, crop, pests, month):
+        return run_pest_query(pesticides_for, crop, pests, month)
+
+    # 방제약 ↔ 병해충 역색인 — 읽기 전용이라 서명당 프로세스에 하나만 두고 세션들이 같이 씀
+    @metered_cache('load_pesticide_index', shared_cache('signature'))
+    def load_pesticide_index(signature):
+        return run_pest_query(PesticideIndex.from_conn)
+
+    # version: 기상 데이터 버전 — 관측 적재로 위험도 지수가 바뀌면 캐시 키가 바뀜
+    @metered_cache('load_pest_risk', st.cache_data)
+    def load_pest_risk(signature, version, crop, month, station):
+        current = run_pest_query(risk_lookup, crop, station, month)
+        by_month = run_pest_query(risk_by_month, crop, [station])
+        by_pest = run_pest_query(risk_by_pest, crop, month, [station])
+        return current, by_month, by_pest
+
+    try:
+        signature = load_pest_signature()
+    except FileNotFoundError:
+        st.error("❗ 병해충 데이터를 불러올 수 없습니다.")
+        st.stop()
+
+    crop_list = load_crops(signature)
+    if not crop_list:
+        st.error("❗ 병해충 데이터를 불러올 수 없습니다.")
+        st.stop()
+
+    # ✅ 필터링 UI
+    col1, col2, col3 = st.columns(3)
+
+    crop = col1.selectbox("작물 선택", crop_list)
+
+    month_list = load_months(signature)
+    month = col2.selectbox("월 선택", month_list)
+
+    station_list = core.stations()
+    station = col3.selectbox("관측 지점 선택", station_list,
+                             index=station_list.index('제주') if '제주' in station_list else 0)
+
+    # ✅ 사전 계산 번들(python -m modules.cli report)에 있으면 표·그래프를 파일에서 읽음
+    bundle = load_report_bundle()
+    artifact = load_pest_artifact(bundle.key, crop, int(month), bundle) if bundle else None
+    if artifact is not None:
+        top5, trend, chem_df, fig, fig2 = artifact
+    else:
+        top5 = load_top_pests(signature, crop, month)
+        trend = load_trend(signature, crop)
+        # 방제약 정보는 TOP5 병해충 대상
+        chem_df = load_pesticides(signature, crop, tuple(top5['병해충명'].tolist()), month)
+        fig, fig2 = core.pest_top_figure(top5), core.pest_trend_figure(trend)
+
+    # ✅ 병해충 TOP5 (발생건수 기준)
+    st.subheader(f"📊 {month}월 {crop} 병해충 TOP 5")
+    st.plotly_chart(fig)
 
-st.title("🐛 병해충 분석")
-
-# ✅ 데이터 로딩
-data_dir = "data"
-pest_files = ["pest_disease_info_1.csv", "pest_disease_info_2.csv", "pest_disease_info_3.csv"]
-
-dfs = []
-for file in pest_files:
-    path = os.path.join(data_dir, file)
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-        dfs.append(df)
-
-if not dfs:
-    st.error("❗ 병해충 데이터를 불러올 수 없습니다.")
-    st.stop()
-
-df_pest = pd.concat(dfs, ignore_index=True)
-
-# ✅ 컬럼명 확인
-#st.write("✅ 현재 데이터 컬럼명:", df_pest.columns.tolist())
-
-# ✅ 월 컬럼 생성
-if '데이터기준일자' in df_pest.columns:
-    df_pest['데이터기준일자'] = pd.to_datetime(df_pest['데이터기준일자'], errors='coerce')
-    df_pest['월'] = df_pest['데이터기준일자'].dt.month
-
-# ✅ 필터링 UI
-col1, col2 = st.columns(2)
-
-crop_list = df_pest['중점방제대상'].dropna().unique()
-crop = col1.selectbox("작물 선택", crop_list)
-
-month_list = sorted(df_pest['월'].dropna().unique())
-month = col2.selectbox("월 선택", month_list)
-
-# ✅ 필터링 데이터
-filtered = df_pest[(df_pest['중점방제대상'] == crop) & (df_pest['월'] == month)]
-
-# ✅ 병해충 TOP5 (발생건수 기준)
-st.subheader(f"📊 {month}월 {crop} 병해충 TOP 5")
-if '병해충' in df_pest.columns:
-    top5 = filtered['병해충'].value_counts().head(5).reset_index()
-    top5.columns = ['병해충명', '발생건수']
+    # ✅ 병해충 월별 공고 추이
+    st.subheader(f"📈 {crop} 병해충 월별 공고 추이")
+    if fig2 is not None:
+        st.plotly_chart(fig2)
+    else:
+        st.info(f"❗ {crop}의 월별 공고 데이터가 없습니다.")
+
+    # ✅ 기상 기반 위험도 지수 (공고 발표 전 관측 기간의 기온·습도·강수 → 0~100)
+    st.subheader(f"🌦️ {crop} 기상 기반 위험도 지수 ({station})")
+    current, risk_month, risk_pest = load_pest_risk(signature, load_data_version(), crop, int(month), station)
+    if current is not None and current['위험도지수'] is not None:
+        st.metric(f"{month}월 평균 위험도 지수", f"{current['위험도지수']:.1f}",
+                  help=f"최고 {current['최고위험도지수']:.1f} · 공고 {current['공고수']}건 · 최근 발표일 {current['최근발표일']}")
+        st.dataframe(risk_pest, use_container_width=True)
+        st.plotly_chart(core.pest_risk_figure(risk_month))
+    elif not risk_month.empty:
+        st.info(f"❗ {month}월 {crop} 공고의 위험도 지수가 없습니다.")
+        st.plotly_chart(core.pest_risk_figure(risk_month))
+    else:
+        st.info(f"❗ {station} 관측으로 계산한 {crop} 위험도 지수가 없습니다.")
 
-    fig = px.bar(top5, x='병해충명', y='발생건수', color='병해충명',
-                 labels={'발생건수': '발생 건수'}, title="병해충 TOP 5")
-    st.plotly_chart(fig)
-else:
-    st.warning("'병해충' 컬럼이 없습니다.")
-
-# ✅ 병해충 월별 위험도 추이
-st.subheader(f"📈 {crop} 병해충 월별 위험도")
-if '위험도지수' in df_pest.columns:
-    trend = df_pest[df_pest['중점방제대상'] == crop].groupby('월')['위험도지수'].mean().reset_index()
-
-    fig2 = px.line(trend, x='월', y='위험도지수', markers=True,
-                   title="월별 위험도 평균", labels={'위험도지수': '위험도'})
-    st.plotly_chart(fig2)
-else:
-    st.info("❗ '위험도지수' 컬럼이 없습니다.")
-
-# ✅ 방제약 정보 표 (TOP5 병해충 대상)
-st.subheader(f"🧪 {crop} 방제약 정보")
-if '방제약' in df_pest.columns:
-    pest_list = top5['병해충명'].tolist()
-    chem_df = filtered[filtered['병해충'].isin(pest_list)][['병해충', '방제약']].drop_duplicates()
+    # ✅ 방제약 정보 표 (TOP5 병해충 대상)
+    st.subheader(f"🧪 {crop} 방제약 정보")
 
     if not chem_df.empty:
         st.dataframe(chem_df, use_container_width=True)
     else:
         st.info(f"{crop}의 방제약 정보가 없습니다.")
-else:
-    st.warning("❗ '방제약' 컬럼이 존재하지 않습니다.")
+
+    # ✅ 방제약·병해충 검색 (전체 연도 공고, 약제 단위로 나눈 역색인에서 조회)
+    st.subheader("🔎 방제약·병해충 검색")
+    index = load_pesticide_index(signature)
+    query = st.text_input("약제명 또는 병해충명 (앞부분·초성 검색 가능, 예: 카브, ㅋㅂㄹ, 응애)", key="pesticide_query")
+    matches = index.suggest(query) if query else []
+    if query and not matches:
+        st.info(f"❗ '{query}'와 일치하는 방제약·병해충이 없습니다.")
+    elif matches:
+        name, kind = st.selectbox("검색 결과", matches, format_func=lambda m: f"{m[0]} ({m[1]})", key="pesticide_match")
+        if kind == '방제약':
+            entry = index.pesticide(name)
+            c1, c2, c3 = st.columns(3)
+            c1.metric("권고 공고", f"{entry['공고수']}건")
+            c2.metric("대상 병해충", f"{len(entry['병해충'])}종")
+            c3.metric("권고 연도", ", ".join(map(str, entry['연도'])) or "-")
+            if entry['제형']:
+                st.caption(f"제형: {', '.join(entry['제형'])}")
+            left, right = st.columns(2)
+            left.dataframe(pd.DataFrame(entry['병해충'], columns=['병해충', '권고건수']), use_container_width=True)
+            right.dataframe(pd.DataFrame(entry['작물'], columns=['작물', '권고건수']), use_container_width=True)
+            with st.expander(f"{name} 권고 공고 목록"):
+                st.dataframe(index.bulletins(name), use_container_width=True)
+        else:
+            st.dataframe(pd.DataFrame(index.pesticides_for(name), columns=['방제약', '권고건수']),
+                         use_container_width=True)
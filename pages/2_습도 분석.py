@@ -1,5 +1,7 @@
 import streamlit as st
 from modules.pages_common import render_chart
+from modules.metrics import page_run
 
-st.header("🌿 습도 분석")
-render_chart(keyword='습도', y_label='평균 습도 (%)', title='월별 평균 습도 추이')
+with page_run("습도 분석"):
+    st.header("🌿 습도 분석")
+    render_chart(keyword='습도', y_label='평균 습도 (%)', title='월별 평균 습도 추이')